@@ -0,0 +1,91 @@
+"""
+Custo por request da dependency `get_agent`.
+
+Compara montar um MarketAgent a cada request como antes (conectores novos,
+cada um com o próprio httpx.AsyncClient, + DataPipeline + três scorers) com
+reaproveitar o agente do processo. Roda fora do lifespan, como um script
+qualquer:
+
+    python api/scripts/bench_agent.py [iterações]
+
+O caso por request cria `iterações / 10` agentes por rodada (cada um abre
+dois clients); os clients são fechados fora da medição.
+"""
+from __future__ import annotations
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.src.config import settings  # noqa: E402
+from api.src.connectors.base import BaseConnector  # noqa: E402
+from api.src.connectors.magalu import MagaluConnector  # noqa: E402
+from api.src.connectors.mercado_livre import MercadoLivreConnector  # noqa: E402
+from api.src.orchestrator.agent import MarketAgent  # noqa: E402
+from api.src.services.marketplace import get_agent, get_connectors, reset_agent  # noqa: E402
+
+
+def _per_call_us(fn: Callable[[], object], iterations: int, rounds: int = 5) -> float:
+    """Mediana, entre `rounds` rodadas, do tempo por chamada em microssegundos."""
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            fn()
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+    return statistics.median(samples)
+
+
+async def _per_request_us(iterations: int, rounds: int = 5) -> float:
+    """Como o get_agent antigo: conectores (e clients) novos a cada request."""
+    samples = []
+    for _ in range(rounds):
+        built: List[BaseConnector] = []
+        started = time.perf_counter()
+        for _ in range(iterations):
+            connectors = {
+                "mercado_livre": MercadoLivreConnector(settings.ml_seller_access_token),
+                "magalu": MagaluConnector(),
+            }
+            MarketAgent(connectors)
+            built.extend(connectors.values())
+        samples.append((time.perf_counter() - started) / iterations * 1e6)
+        await asyncio.gather(*(connector.close() for connector in built))
+    return statistics.median(samples)
+
+
+async def _bench(iterations: int) -> dict[str, float]:
+    # conectores do registry já criados, como depois do startup
+    get_connectors()
+    reset_agent()
+
+    started = time.perf_counter()
+    get_agent()
+    startup_ms = (time.perf_counter() - started) * 1000.0
+
+    per_request = await _per_request_us(max(iterations // 10, 1))
+    shared = _per_call_us(get_agent, iterations)
+    return {"startup_ms": startup_ms, "per_request_us": per_request, "shared_us": shared}
+
+
+def main() -> int:
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    result = asyncio.run(_bench(iterations))
+    saved = result["per_request_us"] - result["shared_us"]
+    print(f"startup (agente do processo): {result['startup_ms']:.2f} ms")
+    print(f"agente por request:           {result['per_request_us']:.1f} µs/request")
+    print(f"agente compartilhado:         {result['shared_us']:.2f} µs/request")
+    print(f"overhead removido:            {saved:.1f} µs/request "
+          f"({result['per_request_us'] / max(result['shared_us'], 1e-3):.0f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,44 @@
+"""
+Custo do TermMatcher em lote: dezenas de milhares de títulos contra a lista
+de termos de um ruleset, como no scoring de uma pesquisa grande.
+
+    python api/scripts/bench_term_matcher.py [títulos]
+"""
+from __future__ import annotations
+
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from api.src.utils.term_matcher import get_matcher  # noqa: E402
+
+_WORDS = ["sofa", "retratil", "reclinavel", "cinza", "oferta", "suede", "promoção", "linho", "3", "lugares"]
+_TERMS = ("sofa retratil", "cinza", "oferta", "promoção", "frete grátis", "brinde")
+
+
+def main() -> int:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    rng = random.Random(2)
+    titles = [" ".join(rng.sample(_WORDS, 6)) for _ in range(count)]
+    matcher = get_matcher(_TERMS)
+
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        total = sum(matcher.count(t) for t in titles)
+        samples.append(time.perf_counter() - started)
+    elapsed = statistics.median(samples)
+    print(f"títulos:  {count} ({total} ocorrências)")
+    print(f"total:    {elapsed * 1000:.1f} ms")
+    print(f"por item: {elapsed / count * 1e6:.2f} µs/título")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
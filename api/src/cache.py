@@ -1,6 +1,6 @@
 """Compat cache exports for legacy imports."""
 
-from cache import async_cached
+from api.src.caching import async_cached
 
 
 def async_lru_cache(ttl_seconds: int = 300, key_prefix: str = ""):
@@ -0,0 +1,30 @@
+from api.src.caching.memory import ByteLRU, LRUCache
+from api.src.caching.redis_tier import RedisTier
+from api.src.caching.request_memo import (
+    RequestMemo,
+    current_request_memo,
+    memoize,
+    request_memo_scope,
+)
+from api.src.caching.tiered import (
+    CacheNamespace,
+    TieredCache,
+    async_cached,
+    close_cache,
+    get_cache,
+)
+
+__all__ = [
+    "ByteLRU",
+    "CacheNamespace",
+    "LRUCache",
+    "RedisTier",
+    "RequestMemo",
+    "TieredCache",
+    "async_cached",
+    "close_cache",
+    "current_request_memo",
+    "get_cache",
+    "memoize",
+    "request_memo_scope",
+]
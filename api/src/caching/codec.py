@@ -0,0 +1,79 @@
+"""
+Serialização dos valores de cache.
+
+Formato do blob: cabeçalho fixo (expires_at: float64, flags: uint8) + JSON,
+comprimido com zlib quando passa de `compress_min_bytes`. O `expires_at` vai
+junto do valor para que um hit no Redis repovoe a memória com o TTL restante
+em vez de reiniciar o prazo.
+
+JSON e não pickle: o Redis é compartilhado, e um blob lido de lá nunca deve
+executar código. Modelos pydantic viajam como
+{"__model__": "modulo:Classe", "data": model_dump(mode="json")} e voltam por
+`model_validate`; só classes BaseModel de `api.src.` são aceitas na leitura.
+Tuplas voltam como listas; outros tipos não-JSON não são cacheáveis
+(TypeError → contador `unserializable` do namespace).
+"""
+from __future__ import annotations
+
+import importlib
+import json
+import struct
+import zlib
+from functools import lru_cache
+from typing import Any
+
+from pydantic import BaseModel
+
+_HEADER = struct.Struct(">dB")
+_FLAG_ZLIB = 0x01
+_MODEL_TAG = "__model__"
+_MODEL_PACKAGE = "api.src."
+
+
+def _default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        cls = type(obj)
+        return {_MODEL_TAG: f"{cls.__module__}:{cls.__qualname__}", "data": obj.model_dump(mode="json")}
+    raise TypeError(f"{type(obj).__name__} não é serializável no cache")
+
+
+@lru_cache(maxsize=256)
+def _model_class(path: str) -> type[BaseModel]:
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(_MODEL_PACKAGE) or not qualname:
+        raise ValueError(f"modelo fora de {_MODEL_PACKAGE}: {path}")
+    obj: Any = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        obj = getattr(obj, part)
+    if not (isinstance(obj, type) and issubclass(obj, BaseModel)):
+        raise ValueError(f"não é um modelo pydantic: {path}")
+    return obj
+
+
+def _object_hook(data: dict[str, Any]) -> Any:
+    if _MODEL_TAG in data and len(data) == 2 and "data" in data:
+        return _model_class(data[_MODEL_TAG]).model_validate(data["data"])
+    return data
+
+
+def encode(value: Any, expires_at: float, compress_min_bytes: int = 512) -> bytes:
+    payload = json.dumps(value, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    flags = 0
+    if compress_min_bytes >= 0 and len(payload) >= compress_min_bytes:
+        compressed = zlib.compress(payload, 6)
+        if len(compressed) < len(payload):
+            payload = compressed
+            flags |= _FLAG_ZLIB
+    return _HEADER.pack(expires_at, flags) + payload
+
+
+def decode(blob: bytes) -> tuple[Any, float]:
+    expires_at, flags = _HEADER.unpack_from(blob)
+    payload = blob[_HEADER.size:]
+    if flags & _FLAG_ZLIB:
+        payload = zlib.decompress(payload)
+    return json.loads(payload, object_hook=_object_hook), expires_at
+
+
+def expires_at_of(blob: bytes) -> float:
+    return _HEADER.unpack_from(blob)[0]
@@ -0,0 +1,142 @@
+"""
+Tiers em memória do processo.
+
+- `ByteLRU`: LRU O(1) (OrderedDict) de blobs já serializados, limitado pelo
+  total de bytes. É a camada local do TieredCache.
+- `LRUCache`: LRU de objetos por número de entradas, com TTL — mantém a API
+  do antigo `cache.py` (get/put/clear/len) para código legado.
+
+Ambos são protegidos por `threading.Lock`: as operações são curtas e nunca
+fazem `await`, então servem tanto a coroutines quanto a threads
+(`asyncio.to_thread`).
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+
+# custo fixo aproximado de uma entrada (chave, tupla, nó do OrderedDict)
+_ENTRY_OVERHEAD = 96
+
+
+class ByteLRU:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max(int(max_bytes), 1)
+        self._data: OrderedDict[str, tuple[bytes, float, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    @staticmethod
+    def _size(key: str, blob: bytes) -> int:
+        return len(blob) + len(key) + _ENTRY_OVERHEAD
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[bytes]:
+        now = now or time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            blob, expires_at, size = entry
+            if expires_at <= now:
+                del self._data[key]
+                self._bytes -= size
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return blob
+
+    def set(self, key: str, blob: bytes, expires_at: float) -> bool:
+        size = self._size(key, blob)
+        if size > self.max_bytes:
+            return False  # maior que o cache inteiro: não guarda
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+            self._data[key] = (blob, expires_at, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, _, evicted) = self._data.popitem(last=False)
+                self._bytes -= evicted
+                self.evictions += 1
+        return True
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[2]
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        with self._lock:
+            if prefix is None:
+                removed = len(self._data)
+                self._data.clear()
+                self._bytes = 0
+                return removed
+            keys = [k for k in self._data if k.startswith(prefix)]
+            for key in keys:
+                self._bytes -= self._data.pop(key)[2]
+            return len(keys)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+class LRUCache:
+    """Cache LRU simples com TTL por entrada (API do antigo cache.py)."""
+
+    def __init__(self, capacity: int = 200, ttl_seconds: int = 300):
+        self.capacity = max(int(capacity), 1)
+        self.ttl_seconds = ttl_seconds
+        self._cache: OrderedDict[str, tuple[Any, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            value, stored_at = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._cache[key] = (value, time.monotonic())
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.capacity:
+                self._cache.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def __len__(self) -> int:
+        return len(self._cache)
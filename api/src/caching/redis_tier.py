@@ -0,0 +1,123 @@
+"""
+Tier Redis compartilhado entre workers.
+
+Falhas de Redis nunca derrubam o request: são logadas, contadas, e o tier
+fica desligado por `retry_seconds` antes de tentar de novo (o cache segue
+só com a memória local nesse intervalo).
+"""
+from __future__ import annotations
+
+import time
+from typing import Any, Optional
+
+import structlog
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # pragma: no cover - redis está em requirements.txt
+    aioredis = None
+
+log = structlog.get_logger()
+
+
+class RedisTier:
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        client: Any = None,
+        retry_seconds: float = 30.0,
+    ):
+        self._url = url
+        self._client = client
+        self.retry_seconds = retry_seconds
+        self._down_until = 0.0
+
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    @property
+    def available(self) -> bool:
+        return time.monotonic() >= self._down_until
+
+    def _get_client(self) -> Any:
+        if self._client is None:
+            if aioredis is None or not self._url:
+                raise RuntimeError("redis indisponível")
+            self._client = aioredis.from_url(self._url)
+        return self._client
+
+    def _fail(self, op: str, exc: Exception) -> None:
+        self.errors += 1
+        self._down_until = time.monotonic() + self.retry_seconds
+        log.warning("cache_redis_unavailable", op=op, error=str(exc), retry_in=self.retry_seconds)
+
+    async def get_many(self, keys: list[str]) -> list[Optional[bytes]]:
+        if not keys or not self.available:
+            return [None] * len(keys)
+        try:
+            values = await self._get_client().mget(keys)
+        except Exception as exc:
+            self._fail("mget", exc)
+            return [None] * len(keys)
+        for value in values:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return list(values)
+
+    async def set_many(self, items: list[tuple[str, bytes, int]]) -> None:
+        """items: (chave, blob, ttl em segundos)."""
+        if not items or not self.available:
+            return
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            for key, blob, ttl in items:
+                pipe.set(key, blob, ex=max(int(ttl), 1))
+            await pipe.execute()
+            self.writes += len(items)
+        except Exception as exc:
+            self._fail("set", exc)
+
+    async def delete(self, keys: list[str]) -> None:
+        if not keys or not self.available:
+            return
+        try:
+            await self._get_client().delete(*keys)
+        except Exception as exc:
+            self._fail("delete", exc)
+
+    async def clear(self, prefix: str) -> None:
+        if not self.available:
+            return
+        try:
+            client = self._get_client()
+            batch: list = []
+            async for key in client.scan_iter(match=f"{prefix}*", count=500):
+                batch.append(key)
+                if len(batch) >= 500:
+                    await client.delete(*batch)
+                    batch = []
+            if batch:
+                await client.delete(*batch)
+        except Exception as exc:
+            self._fail("clear", exc)
+
+    async def close(self) -> None:
+        if self._client is not None:
+            try:
+                await self._client.aclose()
+            except Exception as exc:
+                log.warning("cache_redis_close_failed", error=str(exc))
+            self._client = None
+
+    def stats(self) -> dict:
+        return {
+            "available": self.available,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+        }
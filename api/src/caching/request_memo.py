@@ -0,0 +1,150 @@
+"""
+Memo por request HTTP.
+
+Endpoints compostos (ex.: /compare chama product_details, market_search e
+seo_analyze_listing) repetem dentro do mesmo request as mesmas chamadas de
+conector, normalizações e pesquisas de mercado. O middleware abre um
+`request_memo_scope()`; dentro dele `memoize(kind, key, fn)` executa `fn`
+uma vez por chave e devolve o mesmo resultado às chamadas seguintes
+(inclusive às que chegam enquanto a primeira ainda está em voo).
+
+- O escopo vive num ContextVar: tasks criadas durante o request herdam o
+  mesmo memo; fora de um request (scheduler, scripts) `memoize` só chama `fn`.
+- Falhas não ficam memorizadas: a próxima chamada tenta de novo.
+- Cancelar um chamador não cancela os demais: o trabalho só é cancelado
+  quando ninguém mais espera por ele (como no SingleFlight dos conectores).
+- Resultados mutáveis são copiados para quem reaproveita (`copy_result`);
+  corpos HTTP (str) são imutáveis e passam direto.
+- `report()` diz quantas chamadas duplicadas foram evitadas, por tipo.
+- `max_entries` limita os resultados guardados (LRU; entradas em voo nunca
+  saem). Sem limite o memo vive só o request; escopos longos (jobs em lote)
+  passam um limite.
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Hashable, Iterator, Optional
+
+
+class _Entry:
+    __slots__ = ("future", "waiters")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.waiters = 0
+
+
+class RequestMemo:
+    def __init__(self, max_entries: Optional[int] = None) -> None:
+        self._entries: dict[tuple[str, Hashable], _Entry] = {}
+        self.max_entries = max_entries
+        self.calls: Counter[str] = Counter()    # executadas de fato
+        self.reused: Counter[str] = Counter()   # atendidas pelo memo
+        self.evicted = 0
+
+    async def do(
+        self,
+        kind: str,
+        key: Hashable,
+        fn: Callable[[], Awaitable[Any]],
+        copy_result: bool = True,
+    ) -> Any:
+        entry_key = (kind, key)
+        entry = self._entries.get(entry_key)
+        reused = entry is not None
+        if reused:
+            self.reused[kind] += 1
+            if self.max_entries is not None:
+                # LRU: o dict guarda a ordem de uso
+                self._entries[entry_key] = self._entries.pop(entry_key)
+        else:
+            entry = _Entry(asyncio.ensure_future(fn()))
+            self._entries[entry_key] = entry
+            entry.future.add_done_callback(lambda _f, k=entry_key, e=entry: self._finish(k, e))
+            self.calls[kind] += 1
+
+        entry.waiters += 1
+        try:
+            result = await asyncio.shield(entry.future)
+        finally:
+            entry.waiters -= 1
+            if entry.waiters == 0 and not entry.future.done():
+                # ninguém mais espera: libera a chave e cancela o trabalho
+                self._forget(entry_key, entry)
+                entry.future.cancel()
+        return copy.deepcopy(result) if reused and copy_result else result
+
+    def _finish(self, entry_key: tuple[str, Hashable], entry: _Entry) -> None:
+        if entry.future.cancelled():
+            self._forget(entry_key, entry)
+        elif entry.future.exception() is not None:   # também marca a exceção como lida
+            self._forget(entry_key, entry)
+        else:
+            self._trim()
+
+    def _trim(self) -> None:
+        if self.max_entries is None or len(self._entries) <= self.max_entries:
+            return
+        excess = len(self._entries) - self.max_entries
+        for entry_key in [k for k, e in self._entries.items() if e.future.done()][:excess]:
+            del self._entries[entry_key]
+            self.evicted += 1
+
+    def _forget(self, entry_key: tuple[str, Hashable], entry: _Entry) -> None:
+        if self._entries.get(entry_key) is entry:
+            del self._entries[entry_key]
+
+    @property
+    def avoided(self) -> int:
+        return sum(self.reused.values())
+
+    def report(self) -> dict:
+        report = {
+            "calls": dict(self.calls),
+            "reused": dict(self.reused),
+            "avoided_calls": self.avoided,
+        }
+        if self.max_entries is not None:
+            report["evicted"] = self.evicted
+        return report
+
+
+_current: ContextVar[Optional[RequestMemo]] = ContextVar("request_memo", default=None)
+
+
+def current_request_memo() -> Optional[RequestMemo]:
+    return _current.get()
+
+
+@contextmanager
+def request_memo_scope(max_entries: Optional[int] = None) -> Iterator[RequestMemo]:
+    memo = RequestMemo(max_entries)
+    token = _current.set(memo)
+    try:
+        yield memo
+    finally:
+        _current.reset(token)
+
+
+async def memoize(
+    kind: str,
+    key: Hashable,
+    fn: Callable[[], Awaitable[Any]],
+    copy_result: bool = True,
+) -> Any:
+    memo = _current.get()
+    if memo is None:
+        return await fn()
+    return await memo.do(kind, key, fn, copy_result=copy_result)
+
+
+def content_key(payload: Any) -> str:
+    """Hash do conteúdo de um payload JSON (ex.: item bruto do marketplace)."""
+    raw = json.dumps(payload, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
@@ -0,0 +1,299 @@
+"""
+TieredCache — memória local (ByteLRU) na frente de um Redis opcional.
+
+Leitura: memória → Redis → miss. Um hit no Redis repovoa a memória com o
+TTL restante do valor. Escrita: memória + Redis (write-through).
+
+Valores são organizados em namespaces, cada um com seu TTL e contadores:
+
+    sellers = get_cache().namespace("ml_sellers", ttl_seconds=3600)
+    found = await sellers.get_many(["123", "456"])
+    await sellers.set_many({"789": payload})
+
+TTLs de namespace podem ser sobrescritos por CACHE_NAMESPACE_TTLS.
+"""
+from __future__ import annotations
+
+import hashlib
+import inspect
+import time
+from functools import wraps
+from typing import Any, Iterable, Optional
+
+import structlog
+
+from api.src.caching import codec
+from api.src.caching.memory import ByteLRU
+from api.src.caching.redis_tier import RedisTier
+from api.src.caching.request_memo import content_key
+from api.src.config import get_settings
+
+log = structlog.get_logger()
+settings = get_settings()
+
+_MAX_KEY_LENGTH = 200
+
+
+def _namespace_stats() -> dict[str, int]:
+    return {"hits_memory": 0, "hits_redis": 0, "misses": 0, "sets": 0, "unserializable": 0}
+
+
+class TieredCache:
+    def __init__(
+        self,
+        memory: Optional[ByteLRU] = None,
+        redis: Optional[RedisTier] = None,
+        default_ttl: int = 300,
+        namespace_ttls: Optional[dict[str, int]] = None,
+        compress_min_bytes: int = 512,
+        key_prefix: str = "ultron:cache",
+    ):
+        self.memory = memory or ByteLRU()
+        self.redis = redis
+        self.default_ttl = default_ttl
+        self.compress_min_bytes = compress_min_bytes
+        self.key_prefix = key_prefix
+        # overrides de configuração vencem o TTL declarado no código
+        self._ttl_overrides = dict(namespace_ttls or {})
+        self._ttls: dict[str, int] = {}
+        self._namespaces: dict[str, CacheNamespace] = {}
+        self._stats: dict[str, dict[str, int]] = {}
+
+    # ── Namespaces ────────────────────────────────────────────
+
+    def namespace(self, name: str, ttl_seconds: Optional[int] = None) -> "CacheNamespace":
+        if ttl_seconds is not None:
+            self._ttls[name] = ttl_seconds
+        ns = self._namespaces.get(name)
+        if ns is None:
+            ns = CacheNamespace(self, name)
+            self._namespaces[name] = ns
+        return ns
+
+    def ttl_for(self, namespace: str) -> int:
+        return int(self._ttl_overrides.get(namespace, self._ttls.get(namespace, self.default_ttl)))
+
+    def _ns_stats(self, namespace: str) -> dict[str, int]:
+        stats = self._stats.get(namespace)
+        if stats is None:
+            stats = self._stats[namespace] = _namespace_stats()
+        return stats
+
+    @staticmethod
+    def _norm_key(key: Any) -> str:
+        key = str(key)
+        if len(key) > _MAX_KEY_LENGTH:
+            key = "h:" + hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return key
+
+    def _local_key(self, namespace: str, key: str) -> str:
+        return f"{namespace}:{key}"
+
+    def _redis_key(self, namespace: str, key: str) -> str:
+        return f"{self.key_prefix}:{namespace}:{key}"
+
+    # ── Leitura ───────────────────────────────────────────────
+
+    async def get_many(self, namespace: str, keys: Iterable[Any]) -> dict[str, Any]:
+        """Valores encontrados → {chave: valor}; ausentes ficam de fora."""
+        stats = self._ns_stats(namespace)
+        now = time.time()
+        found: dict[str, Any] = {}
+        pending: list[str] = []
+        for raw_key in dict.fromkeys(keys):
+            key = self._norm_key(raw_key)
+            blob = self.memory.get(self._local_key(namespace, key), now=now)
+            if blob is not None:
+                found[str(raw_key)] = codec.decode(blob)[0]
+                stats["hits_memory"] += 1
+            else:
+                pending.append(str(raw_key))
+
+        if pending and self.redis is not None:
+            blobs = await self.redis.get_many(
+                [self._redis_key(namespace, self._norm_key(k)) for k in pending]
+            )
+            still_missing = []
+            for raw_key, blob in zip(pending, blobs):
+                if blob is None:
+                    still_missing.append(raw_key)
+                    continue
+                try:
+                    value, expires_at = codec.decode(blob)
+                except Exception as exc:
+                    log.warning("cache_decode_failed", namespace=namespace, error=str(exc))
+                    still_missing.append(raw_key)
+                    continue
+                if expires_at <= now:
+                    still_missing.append(raw_key)
+                    continue
+                self.memory.set(self._local_key(namespace, self._norm_key(raw_key)), blob, expires_at)
+                found[raw_key] = value
+                stats["hits_redis"] += 1
+            pending = still_missing
+
+        stats["misses"] += len(pending)
+        return found
+
+    async def get(self, namespace: str, key: Any, default: Any = None) -> Any:
+        found = await self.get_many(namespace, [key])
+        return found.get(str(key), default)
+
+    # ── Escrita ───────────────────────────────────────────────
+
+    async def set_many(self, namespace: str, mapping: dict[Any, Any], ttl_seconds: Optional[int] = None) -> None:
+        stats = self._ns_stats(namespace)
+        ttl = ttl_seconds if ttl_seconds is not None else self.ttl_for(namespace)
+        if ttl <= 0 or not mapping:
+            return
+        expires_at = time.time() + ttl
+        remote: list[tuple[str, bytes, int]] = []
+        for raw_key, value in mapping.items():
+            try:
+                blob = codec.encode(value, expires_at, self.compress_min_bytes)
+            except (TypeError, ValueError) as exc:
+                stats["unserializable"] += 1
+                log.debug("cache_value_unserializable", namespace=namespace, error=str(exc))
+                continue
+            key = self._norm_key(raw_key)
+            self.memory.set(self._local_key(namespace, key), blob, expires_at)
+            remote.append((self._redis_key(namespace, key), blob, ttl))
+            stats["sets"] += 1
+        if remote and self.redis is not None:
+            await self.redis.set_many(remote)
+
+    async def set(self, namespace: str, key: Any, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        await self.set_many(namespace, {key: value}, ttl_seconds=ttl_seconds)
+
+    async def delete(self, namespace: str, key: Any) -> None:
+        key = self._norm_key(key)
+        self.memory.delete(self._local_key(namespace, key))
+        if self.redis is not None:
+            await self.redis.delete([self._redis_key(namespace, key)])
+
+    def clear_local(self, namespace: Optional[str] = None) -> None:
+        self.memory.clear(None if namespace is None else f"{namespace}:")
+
+    async def clear(self, namespace: str) -> None:
+        self.clear_local(namespace)
+        if self.redis is not None:
+            await self.redis.clear(f"{self.key_prefix}:{namespace}:")
+
+    # ── Operação ──────────────────────────────────────────────
+
+    def stats(self) -> dict:
+        return {
+            "memory": self.memory.stats(),
+            "redis": self.redis.stats() if self.redis is not None else None,
+            "namespaces": {
+                name: {"ttl_seconds": self.ttl_for(name), **counters}
+                for name, counters in self._stats.items()
+            },
+        }
+
+    async def close(self) -> None:
+        if self.redis is not None:
+            await self.redis.close()
+
+
+class CacheNamespace:
+    """Atalho para um namespace do TieredCache."""
+
+    def __init__(self, cache: TieredCache, name: str):
+        self.cache = cache
+        self.name = name
+
+    @property
+    def ttl_seconds(self) -> int:
+        return self.cache.ttl_for(self.name)
+
+    async def get(self, key: Any, default: Any = None) -> Any:
+        return await self.cache.get(self.name, key, default)
+
+    async def get_many(self, keys: Iterable[Any]) -> dict[str, Any]:
+        return await self.cache.get_many(self.name, keys)
+
+    async def set(self, key: Any, value: Any, ttl_seconds: Optional[int] = None) -> None:
+        await self.cache.set(self.name, key, value, ttl_seconds)
+
+    async def set_many(self, mapping: dict[Any, Any], ttl_seconds: Optional[int] = None) -> None:
+        await self.cache.set_many(self.name, mapping, ttl_seconds)
+
+    async def delete(self, key: Any) -> None:
+        await self.cache.delete(self.name, key)
+
+    def clear(self) -> None:
+        """Limpa só a memória local (entradas no Redis expiram pelo TTL)."""
+        self.cache.clear_local(self.name)
+
+
+_cache: Optional[TieredCache] = None
+
+
+def get_cache() -> TieredCache:
+    """Cache do processo, montado a partir das settings no primeiro uso."""
+    global _cache
+    if _cache is None:
+        redis = None
+        if settings.CACHE_REDIS_ENABLED and settings.REDIS_URL:
+            redis = RedisTier(url=settings.REDIS_URL, retry_seconds=settings.CACHE_REDIS_RETRY_SECONDS)
+        _cache = TieredCache(
+            memory=ByteLRU(settings.CACHE_MEMORY_MAX_BYTES),
+            redis=redis,
+            default_ttl=settings.CACHE_DEFAULT_TTL_SECONDS,
+            namespace_ttls=settings.CACHE_NAMESPACE_TTLS,
+            compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES,
+            key_prefix=settings.CACHE_REDIS_KEY_PREFIX,
+        )
+    return _cache
+
+
+async def close_cache() -> None:
+    if _cache is not None:
+        await _cache.close()
+
+
+def async_cached(
+    ttl_seconds: int = 300,
+    key_prefix: str = "",
+    namespace: Optional[str] = None,
+    cache: Optional[TieredCache] = None,
+):
+    """
+    Decorator async que cacheia o resultado de uma função no TieredCache.
+
+    Uso:
+        @async_cached(ttl_seconds=60)
+        async def get_data(query: str) -> dict: ...
+
+    Resultados `None` não são cacheados. `request_id` fica fora da chave, e
+    em métodos também `self`/`cls`: a chave é um hash dos argumentos, estável
+    entre workers e restarts (o tier Redis depende disso).
+    """
+
+    def decorator(func):
+        ns_name = namespace or f"fn:{key_prefix}{func.__module__}.{func.__qualname__}"
+        params = list(inspect.signature(func).parameters)
+        skip_first = bool(params) and params[0] in ("self", "cls")
+
+        def _cache() -> TieredCache:
+            return cache or get_cache()
+
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            key_kwargs = {k: v for k, v in kwargs.items() if k not in ("request_id",)}
+            key = content_key([list(args[1:] if skip_first else args), key_kwargs])
+            ns = _cache().namespace(ns_name, ttl_seconds)
+            cached = await ns.get(key)
+            if cached is not None:
+                return cached
+            result = await func(*args, **kwargs)
+            if result is not None:
+                await ns.set(key, result)
+            return result
+
+        wrapper.cache_clear = lambda: _cache().clear_local(ns_name)  # type: ignore[attr-defined]
+        wrapper.cache_namespace = ns_name  # type: ignore[attr-defined]
+        return wrapper
+
+    return decorator
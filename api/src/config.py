@@ -66,6 +66,74 @@ class Settings(BaseSettings):
     MONITOR_ALERT_DEDUPE_HOURS: int = 6
     MONITOR_MAX_LISTINGS_PER_CYCLE: int = 100
 
+    # ── HTTP / Conectores ──────────────────────────────────────
+    HTTP_TIMEOUT_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 10.0
+    HTTP2_ENABLED: bool = True
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    ML_HTTP_MAX_CONNECTIONS: int = 20
+    ML_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    MAGALU_HTTP_MAX_CONNECTIONS: int = 4
+    MAGALU_HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 2
+    ML_RATE_LIMIT_PER_SECOND: float = 3.0
+    ML_RATE_LIMIT_BURST: int = 5
+    MAGALU_RATE_LIMIT_BURST: int = 1     # taxa vem de MAGALU_SCRAPING_DELAY_MS
+    ML_SELLER_CACHE_TTL_SECONDS: int = 3600
+    NORMALIZE_CONCURRENCY: int = 10
+    SEARCH_PREFETCH_PAGES: int = 3
+    HTTP_RETRY_AFTER_MAX_SECONDS: float = 10.0   # teto de espera por Retry-After antes de repetir
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_SECONDS: float = 30.0
+    CIRCUIT_HALF_OPEN_MAX_CALLS: int = 1
+
+    # Cache HTTP dos conectores (Cache-Control + ETag/Last-Modified)
+    HTTP_CACHE_ENABLED: bool = True
+    HTTP_CACHE_MAX_ENTRIES: int = 2000
+    HTTP_CACHE_PERSIST_PATH: str = ""  # ex.: /var/cache/market/http_cache.sqlite
+    HTTP_CACHE_PERSIST_MAX_ENTRIES: int = 50000
+    HTTP_CACHE_TTL_SEARCH: int = 300
+    HTTP_CACHE_TTL_ITEMS: int = 120
+    HTTP_CACHE_TTL_DESCRIPTIONS: int = 3600
+    HTTP_CACHE_TTL_USERS: int = 3600
+    HTTP_CACHE_TTL_CATEGORIES: int = 86400
+    HTTP_CACHE_STALE_SECONDS: int = 86400
+
+    # ── Cache (api/src/caching) ────────────────────────────────
+    CACHE_MEMORY_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_DEFAULT_TTL_SECONDS: int = 300
+    CACHE_NAMESPACE_TTLS: dict[str, int] = {}   # ex.: {"ml_sellers": 7200}
+    CACHE_COMPRESS_MIN_BYTES: int = 512
+    CACHE_REDIS_ENABLED: bool = False   # tier compartilhado em REDIS_URL
+    CACHE_REDIS_KEY_PREFIX: str = "ultron:cache"
+    CACHE_REDIS_RETRY_SECONDS: float = 30.0
+
+    # ── Pipeline ───────────────────────────────────────────────
+    DEDUP_NEAR_DUPLICATES_ENABLED: bool = True
+    DEDUP_SIMILARITY_THRESHOLD: float = 0.8   # Jaccard dos shingles do título
+    DEDUP_PRICE_TOLERANCE: float = 0.15       # diferença relativa máx.; 0 ignora preço
+
+    # Índice de atributos obrigatórios/recomendados por categoria
+    CATEGORY_ATTRIBUTES_TTL_SECONDS: int = 7 * 24 * 3600
+
+    # ── Rulesets (tabela marketplace_rulesets) ─────────────────
+    RULESETS_DB_ENABLED: bool = True
+    RULESETS_RELOAD_SECONDS: float = 60.0     # intervalo da checagem de versão
+
+    # Cache de pesquisas de mercado (services/research_cache.py)
+    RESEARCH_CACHE_ENABLED: bool = True
+    RESEARCH_CACHE_FRESH_SECONDS: int = 600
+    RESEARCH_CACHE_STALE_SECONDS: int = 3600   # servido vencido enquanto atualiza em background
+
+    # Pesquisa em lote (services/batch_research.py)
+    BATCH_RESEARCH_CONCURRENCY: int = 3       # keywords em voo por job
+    BATCH_RESEARCH_MAX_KEYWORDS: int = 200
+    BATCH_RESEARCH_MAX_JOBS: int = 100        # jobs mantidos em memória
+    BATCH_RESEARCH_MEMO_MAX_ENTRIES: int = 2000   # resultados reaproveitáveis por job (LRU)
+
+    # Memo de scores por hash de conteúdo (scoring/memo.py)
+    SCORE_MEMO_MAX_ENTRIES: int = 5000
+    SCORE_MEMO_TTL_SECONDS: int = 6 * 3600
+
     # â”€â”€ Propriedades derivadas â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€â”€
 
     @property
@@ -1,35 +1,287 @@
+import asyncio
+import json
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional
+from collections import deque
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import AsyncIterator, List, Dict, Any, Optional
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+import structlog
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential, retry_if_exception
+
+from api.src.caching.request_memo import content_key, memoize
+from api.src.config import get_settings
+from api.src.connectors.circuit_breaker import CircuitOpenError, HostCircuitBreakers, get_circuit_breakers
+from api.src.connectors.http_cache import ResponseCache, cache_key, get_response_cache
+from api.src.connectors.rate_limit import HostRateLimiter, get_rate_limiter
+from api.src.connectors.singleflight import SingleFlight
+from api.src.utils.term_matcher import get_matcher
+
+log = structlog.get_logger()
+settings = get_settings()
+
+# status que indicam upstream sobrecarregado/fora: repetimos respeitando Retry-After
+RETRYABLE_STATUS = {429, 503}
+# termos vetados em títulos por padrão (marketplaces podem sobrescrever validate_title)
+BASE_FORBIDDEN_TERMS = ("gratis", "100%", "melhor do brasil")
+
+
+def _retry_after_seconds(response: httpx.Response) -> Optional[float]:
+    """Retry-After em segundos (aceita número ou data HTTP)."""
+    value = response.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_upstream_failure(exc: BaseException) -> bool:
+    """Erro do lado do upstream (rede, timeout, 429, 5xx) — conta para o breaker."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code == 429 or exc.response.status_code >= 500
+    return isinstance(exc, (httpx.RequestError, CircuitOpenError))
+
+
+def _is_retryable(exc: BaseException) -> bool:
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS
+    return isinstance(exc, (httpx.RequestError, httpx.TimeoutException))
+
+
+_wait_backoff = wait_exponential(multiplier=1, min=2, max=10)
+
+
+def _wait_for_retry(retry_state: RetryCallState) -> float:
+    """Retry-After do upstream quando houver (com teto); senão backoff exponencial."""
+    exc = retry_state.outcome.exception() if retry_state.outcome else None
+    if isinstance(exc, httpx.HTTPStatusError):
+        retry_after = _retry_after_seconds(exc.response)
+        if retry_after is not None:
+            return min(retry_after, settings.HTTP_RETRY_AFTER_MAX_SECONDS)
+    return _wait_backoff(retry_state)
+
+
+@dataclass
+class BulkDetails:
+    """
+    Resultado de get_listings_details_bulk, sempre pelo id pedido:
+      - items: id → raw;
+      - missing: ids que o marketplace diz não existir (404/vazio);
+      - errors: id → exceção (rede, timeout, 401, circuito aberto...).
+    """
+    items: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    missing: List[str] = field(default_factory=list)
+    errors: Dict[str, BaseException] = field(default_factory=dict)
+
+    def error_messages(self) -> Dict[str, str]:
+        return {listing_id: f"{type(exc).__name__}: {exc}" for listing_id, exc in self.errors.items()}
+
+
+def _is_not_found(exc: BaseException) -> bool:
+    return isinstance(exc, httpx.HTTPStatusError) and exc.response.status_code == 404
+
 
 class BaseConnector(ABC):
     """Classe base para conectores com retry logic e httpx"""
+
+    marketplace_name: str = ""
+
+    # Intervalo médio entre requests (s) e rajada permitida pelo token bucket.
+    # 0 desativa o rate limit.
+    rate_limit_delay: float = 0.0
+    rate_limit_burst: int = 1
+    # Máximo de requests de detalhe simultâneos no fan-out em lote
+    details_concurrency: int = 5
+    # Itens por página de busca e teto de offset+limit aceito pelo marketplace
+    search_page_size: int = 50
+    search_max_results: Optional[int] = None
     
-    def __init__(self, api_key: str = ""):
+    def __init__(
+        self,
+        api_key: str = "",
+        client: Optional[httpx.AsyncClient] = None,
+        rate_limiter: Optional[HostRateLimiter] = None,
+        response_cache: Optional[ResponseCache] = None,
+        circuit_breakers: Optional[HostCircuitBreakers] = None,
+    ):
         self.api_key = api_key
         self.base_url = ""
-        self._client = httpx.AsyncClient(timeout=30.0)
+        # Clientes compartilhados (ConnectorRegistry) são fechados pelo registry;
+        # só fechamos aqui o cliente criado pelo próprio conector.
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=30.0)
         # Compat alias for legacy modules
         self.client = self._client
+        self._rate_limiter = rate_limiter or get_rate_limiter()
+        self._singleflight = SingleFlight()
+        self._response_cache = response_cache if response_cache is not None else get_response_cache()
+        self._circuit_breakers = circuit_breakers or get_circuit_breakers()
+        self.normalize_concurrency = settings.NORMALIZE_CONCURRENCY
+        # contadores acumulados de normalize_many (expostos em /health/connectors)
+        self.normalize_stats: Dict[str, int] = {"ok": 0, "failed": 0}
+
+    async def _throttle(self, url: str) -> float:
+        """Aguarda token do bucket do host; retorna o tempo esperado (s)."""
+        if self.rate_limit_delay <= 0:
+            return 0.0
+        return await self._rate_limiter.acquire(
+            url,
+            rate=1.0 / self.rate_limit_delay,
+            burst=self.rate_limit_burst,
+        )
+
+    async def _send(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> httpx.Response:
+        breaker = self._circuit_breakers.for_url(url)
+        breaker.before_request()
+        try:
+            await self._throttle(url)
+            started = time.perf_counter()
+            try:
+                response = await self._client.get(url, params=params, headers=headers)
+            finally:
+                self._rate_limiter.record_upstream(url, time.perf_counter() - started)
+        except httpx.RequestError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        status = response.status_code
+        if status == 429 or status >= 500:
+            retry_after = _retry_after_seconds(response)
+            breaker.record_failure(retry_after)
+            if status in RETRYABLE_STATUS:
+                # segura o host inteiro, não só este request
+                pause = min(retry_after or 0.0, settings.HTTP_RETRY_AFTER_MAX_SECONDS)
+                self._rate_limiter.penalize(url, pause)
+        else:
+            breaker.record_success()
+            self._rate_limiter.recover(url)
+        if status != 304:  # 304 só chega em request condicional
+            response.raise_for_status()
+        return response
+
+    async def _fetch_body(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """
+        Corpo da resposta passando pelo cache HTTP: entrada fresca não vai ao
+        upstream; entrada vencida com validador vira GET condicional e um 304
+        reaproveita o corpo guardado.
+        """
+        cache = self._response_cache
+        if cache is None:
+            response = await self._send(url, params=params, headers=headers)
+            return response.text
+
+        key = cache_key(url, params, headers)
+        entry = await cache.lookup(key)
+        if entry is not None and entry.is_fresh():
+            cache.hits += 1
+            return entry.body
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            request_headers.update(entry.conditional_headers())
+        try:
+            response = await self._send(url, params=params, headers=request_headers or None)
+        except Exception as exc:
+            if entry is not None and _is_upstream_failure(exc) and cache.can_serve_stale(entry):
+                cache.stale_served += 1
+                log.warning(
+                    "http_cache_stale_served",
+                    url=url,
+                    age_seconds=round(entry.age_seconds, 1),
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+                return entry.body
+            raise
+        if response.status_code == 304:
+            if entry is None:
+                response.raise_for_status()
+            entry = await cache.revalidate(key, entry, response)
+            return entry.body
+
+        cache.misses += 1
+        await cache.store(key, url, response)
+        return response.text
+
+    async def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> Dict[str, Any]:
+        """GET JSON; chamadas idênticas simultâneas compartilham um único request."""
+        key = SingleFlight.make_key("GET", url, params, headers)
+        return await self._singleflight.do(key, lambda: self._get_json(url, params=params, headers=headers))
 
     @retry(
         stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=2, max=10),
-        retry=retry_if_exception_type((httpx.RequestError, httpx.TimeoutException))
+        wait=_wait_for_retry,
+        retry=retry_if_exception(_is_retryable),
+        reraise=True,
     )
-    async def _get(
+    async def _get_json(
         self,
         url: str,
         params: Optional[Dict[str, Any]] = None,
         headers: Optional[Dict[str, str]] = None,
     ) -> Dict[str, Any]:
-        response = await self._client.get(url, params=params, headers=headers)
-        response.raise_for_status()
-        return response.json()
-    
+        return json.loads(await self._request_body(url, params=params, headers=headers))
+
+    async def _get_text(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """GET texto/HTML (scraping), com a mesma coalescência de _get."""
+
+        key = SingleFlight.make_key("GET:text", url, params, headers)
+        return await self._singleflight.do(key, lambda: self._request_body(url, params=params, headers=headers))
+
+    async def _request_body(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+    ) -> str:
+        """_fetch_body reaproveitado dentro do mesmo request HTTP (caching/request_memo)."""
+        return await memoize(
+            "http",
+            cache_key(url, params, headers),
+            lambda: self._fetch_body(url, params=params, headers=headers),
+            copy_result=False,
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        """Contadores do conector (normalização e coalescência de requests)."""
+        return {
+            "normalize": dict(self.normalize_stats),
+            "singleflight": self._singleflight.metrics(),
+        }
+
     async def close(self):
-        await self._client.aclose()
+        if self._owns_client:
+            await self._client.aclose()
 
     @abstractmethod
     async def search(
@@ -50,6 +302,54 @@ class BaseConnector(ABC):
     async def normalize(self, raw_data: Dict[str, Any]) -> Any:
         pass
 
+    async def normalize_memoized(self, raw_data: Dict[str, Any]) -> Any:
+        """normalize() uma vez por conteúdo bruto dentro do mesmo request."""
+        return await memoize(
+            "normalize",
+            (self.marketplace_name, content_key(raw_data)),
+            lambda: self.normalize(raw_data),
+        )
+
+    async def get_normalized_listing(self, listing_id: str) -> Any:
+        """Detalhes + normalize de um anúncio, reaproveitados dentro do mesmo request."""
+
+        async def _load() -> Any:
+            return await self.normalize_memoized(await self.get_listing_details(listing_id))
+
+        return await memoize("listing", (self.marketplace_name, str(listing_id)), _load)
+
+    async def get_listings_details_bulk(
+        self,
+        listing_ids: List[str],
+        include_descriptions: bool = True,
+    ) -> BulkDetails:
+        """
+        Detalhes de vários anúncios, por id pedido (ver BulkDetails).
+        Padrão: fan-out com concorrência limitada sobre get_listing_details;
+        404 ou resposta vazia é "não encontrado", qualquer outra falha é erro.
+        `include_descriptions` é uma dica para conectores que buscam a
+        descrição em request separado.
+        """
+        ids = [i for i in dict.fromkeys(listing_ids) if i]
+        semaphore = asyncio.Semaphore(max(self.details_concurrency, 1))
+
+        async def _one(listing_id: str) -> Any:
+            async with semaphore:
+                try:
+                    return await self.get_listing_details(listing_id)
+                except Exception as exc:
+                    return exc
+
+        result = BulkDetails()
+        for listing_id, raw in zip(ids, await asyncio.gather(*(_one(i) for i in ids))):
+            if isinstance(raw, Exception) and not _is_not_found(raw):
+                result.errors[listing_id] = raw
+            elif raw and not isinstance(raw, Exception):
+                result.items[listing_id] = raw
+            else:
+                result.missing.append(listing_id)
+        return result
+
     async def search_and_normalize(
         self,
         query: str,
@@ -57,20 +357,175 @@ class BaseConnector(ABC):
         limit: int = 50,
         offset: int = 0,
     ) -> List[Any]:
+        if limit > self.search_page_size:
+            normalized: List[Any] = []
+            async with aclosing(
+                self.iter_search_and_normalize(query, category_id=category_id, limit=limit, offset=offset)
+            ) as stream:
+                async for listing in stream:
+                    normalized.append(listing)
+            return normalized
+
         raw_items = await self.search(
             query=query,
             category_id=category_id,
             limit=limit,
             offset=offset,
         )
+        return await self.normalize_many(raw_items, start_position=offset + 1)
+
+    # ── Busca paginada ────────────────────────────────────────
+
+    async def _iter_search_pages(
+        self,
+        query: str,
+        category_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[tuple[int, List[Dict[str, Any]]]]:
+        """
+        Gera (offset, página) em ordem, mantendo até `prefetch` páginas
+        seguintes em voo. Para ao atingir `limit`, ao receber página
+        incompleta ou quando o consumidor sai do loop (tasks pendentes
+        são canceladas).
+        """
+        page_size = max(self.search_page_size, 1)
+        prefetch = max(prefetch or settings.SEARCH_PREFETCH_PAGES, 1)
+        end = offset + max(limit, 0)
+        if self.search_max_results is not None:
+            end = min(end, self.search_max_results)
+
+        pending: deque[tuple[int, int, asyncio.Task]] = deque()
+        next_offset = offset
+
+        def _schedule() -> None:
+            nonlocal next_offset
+            while len(pending) < prefetch and next_offset < end:
+                size = min(page_size, end - next_offset)
+                task = asyncio.ensure_future(
+                    self.search(query=query, category_id=category_id, limit=size, offset=next_offset)
+                )
+                pending.append((next_offset, size, task))
+                next_offset += size
+
+        try:
+            _schedule()
+            first = True
+            while pending:
+                page_offset, size, task = pending.popleft()
+                try:
+                    page = await task
+                except Exception as exc:
+                    if first:
+                        raise
+                    log.warning("search_page_failed", connector=type(self).__name__, offset=page_offset, error=str(exc))
+                    return
+                first = False
+                if page:
+                    yield page_offset, page[:size]
+                if len(page) < size:
+                    return
+                _schedule()
+        finally:
+            for _, _, task in pending:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()  # marca como consumida
+
+    async def iter_search(
+        self,
+        query: str,
+        category_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Itens brutos da busca, paginando além de uma página com prefetch paralelo."""
+        async with aclosing(
+            self._iter_search_pages(query, category_id=category_id, limit=limit, offset=offset, prefetch=prefetch)
+        ) as pages:
+            async for _, page in pages:
+                for item in page:
+                    yield item
+
+    async def iter_search_and_normalize(
+        self,
+        query: str,
+        category_id: Optional[str] = None,
+        limit: int = 50,
+        offset: int = 0,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """Como iter_search, mas normalizando página a página (em ordem de busca)."""
+        async with aclosing(
+            self._iter_search_pages(query, category_id=category_id, limit=limit, offset=offset, prefetch=prefetch)
+        ) as pages:
+            async for page_offset, page in pages:
+                for listing in await self.normalize_many(page, start_position=page_offset + 1):
+                    yield listing
+
+    async def normalize_many(
+        self,
+        raw_items: List[Dict[str, Any]],
+        start_position: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Normaliza um lote concorrentemente (limitado por normalize_concurrency),
+        preservando a ordem original. Com start_position, preenche
+        position_in_search (itens de busca). Itens que falham são descartados,
+        contados e logados.
+        """
+        await self.prepare_batch(raw_items)
+        semaphore = asyncio.Semaphore(max(self.normalize_concurrency, 1))
+
+        async def _one(raw: Dict[str, Any]) -> Any:
+            async with semaphore:
+                return await self.normalize_memoized(raw)
+
+        results = await asyncio.gather(*(_one(raw) for raw in raw_items), return_exceptions=True)
+
         normalized: List[Any] = []
-        for item in raw_items:
-            try:
-                normalized.append(await self.normalize(item))
-            except Exception:
+        errors: List[str] = []
+        for index, result in enumerate(results):
+            if isinstance(result, Exception):
+                errors.append(f"{type(result).__name__}: {result}")
                 continue
+            if isinstance(result, BaseException):
+                raise result
+            if start_position is not None and hasattr(result, "position_in_search"):
+                result.position_in_search = start_position + index
+            normalized.append(result)
+
+        self.normalize_stats["ok"] += len(normalized)
+        self.normalize_stats["failed"] += len(errors)
+        if errors:
+            log.warning(
+                "normalize_items_failed",
+                connector=type(self).__name__,
+                failed=len(errors),
+                total=len(raw_items),
+                drop_rate=round(len(errors) / len(raw_items), 3),
+                first_error=errors[0],
+            )
         return normalized
 
+    async def prepare_batch(self, raw_items: List[Dict[str, Any]]) -> None:
+        """
+        Hook chamado antes de normalizar um lote de itens brutos.
+        Conectores sobrescrevem para resolver dependências em lote
+        (ex.: sellers do ML) em vez de uma chamada por item.
+        """
+        return None
+
+    async def get_category_attributes(self, category_id: str) -> List[Dict[str, Any]]:
+        """
+        Atributos da categoria no formato do marketplace (best-effort).
+        Sem endpoint conhecido devolve []; quem valida usa o ruleset.
+        """
+        return []
+
     async def get_details(self, listing_id: str) -> Dict[str, Any]:
         """Compat alias for legacy code."""
         return await self.get_listing_details(listing_id)
@@ -83,9 +538,7 @@ class BaseConnector(ABC):
         """
         Validação base de título (marketplaces podem sobrescrever).
         """
-        forbidden_terms = ["gratis", "100%", "melhor do brasil"]
-        lower = title.lower()
-        found_forbidden = [term for term in forbidden_terms if term in lower]
+        found_forbidden = get_matcher(BASE_FORBIDDEN_TERMS).found(title)
         is_valid = len(title) <= max_length and not found_forbidden
         return {
             "is_valid": is_valid,
@@ -0,0 +1,165 @@
+"""
+Circuit breaker por host (closed → open → half-open).
+
+- closed: requests passam; falhas consecutivas (erro de rede, timeout, 429,
+  5xx) são contadas. Ao atingir `failure_threshold` o circuito abre.
+- open: requests falham na hora com `CircuitOpenError` (sem ir ao upstream
+  nem esperar timeout) até passar `recovery_seconds` — ou o Retry-After do
+  upstream, se for maior.
+- half-open: deixa passar até `half_open_max_calls` requests de teste. Um
+  sucesso fecha o circuito; uma falha reabre.
+
+Sucessos que chegam com o circuito aberto (requests enviados antes de abrir)
+são ignorados.
+
+Respostas 4xx que não sejam 429 contam como sucesso: o host respondeu.
+"""
+from __future__ import annotations
+
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+import structlog
+
+from api.src.config import get_settings
+
+log = structlog.get_logger()
+settings = get_settings()
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Circuito aberto: o host está degradado e o request não foi enviado."""
+
+    def __init__(self, host: str, retry_after: float):
+        super().__init__(f"circuit open for {host} (retry in {retry_after:.1f}s)")
+        self.host = host
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        host: str,
+        failure_threshold: int = 5,
+        recovery_seconds: float = 30.0,
+        half_open_max_calls: int = 1,
+    ):
+        self.host = host
+        self.failure_threshold = max(int(failure_threshold), 1)
+        self.recovery_seconds = recovery_seconds
+        self.half_open_max_calls = max(int(half_open_max_calls), 1)
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self._open_until = 0.0
+        self._half_open_in_flight = 0
+
+        # métricas
+        self.opened = 0
+        self.rejected = 0
+
+    def _open(self, now: float, retry_after: Optional[float]) -> None:
+        self.state = OPEN
+        self._open_until = now + max(self.recovery_seconds, retry_after or 0.0)
+        self._half_open_in_flight = 0
+        self.opened += 1
+        log.warning(
+            "circuit_opened",
+            host=self.host,
+            failures=self.consecutive_failures,
+            open_seconds=round(self._open_until - now, 1),
+        )
+
+    def before_request(self) -> None:
+        """Reserva passagem para um request ou levanta CircuitOpenError."""
+        now = time.monotonic()
+        if self.state == OPEN:
+            if now < self._open_until:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, self._open_until - now)
+            self.state = HALF_OPEN
+            self._half_open_in_flight = 0
+            log.info("circuit_half_open", host=self.host)
+        if self.state == HALF_OPEN:
+            if self._half_open_in_flight >= self.half_open_max_calls:
+                self.rejected += 1
+                raise CircuitOpenError(self.host, 1.0)
+            self._half_open_in_flight += 1
+
+    def release(self) -> None:
+        """Request reservado terminou sem veredito (ex.: cancelado)."""
+        if self.state == HALF_OPEN and self._half_open_in_flight > 0:
+            self._half_open_in_flight -= 1
+
+    def record_success(self) -> None:
+        if self.state == OPEN:
+            return   # request que saiu antes de abrir: não desfaz o fail-fast
+        if self.state == HALF_OPEN:
+            log.info("circuit_closed", host=self.host)
+            self.state = CLOSED
+            self._half_open_in_flight = 0
+        self.consecutive_failures = 0
+
+    def record_failure(self, retry_after: Optional[float] = None) -> None:
+        self.consecutive_failures += 1
+        now = time.monotonic()
+        if self.state == HALF_OPEN or (
+            self.state == CLOSED and self.consecutive_failures >= self.failure_threshold
+        ):
+            self._open(now, retry_after)
+        elif self.state == OPEN and retry_after:
+            self._open_until = max(self._open_until, now + retry_after)
+
+    def metrics(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(max(self._open_until - time.monotonic(), 0.0), 1) if self.state == OPEN else 0.0,
+        }
+
+
+class HostCircuitBreakers:
+    """Um CircuitBreaker por host, criado no primeiro uso."""
+
+    def __init__(
+        self,
+        failure_threshold: Optional[int] = None,
+        recovery_seconds: Optional[float] = None,
+        half_open_max_calls: Optional[int] = None,
+    ):
+        self.failure_threshold = failure_threshold or settings.CIRCUIT_FAILURE_THRESHOLD
+        self.recovery_seconds = recovery_seconds if recovery_seconds is not None else settings.CIRCUIT_RECOVERY_SECONDS
+        self.half_open_max_calls = half_open_max_calls or settings.CIRCUIT_HALF_OPEN_MAX_CALLS
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+    def for_url(self, url: str) -> CircuitBreaker:
+        host = urlsplit(url).netloc.lower()
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                host,
+                failure_threshold=self.failure_threshold,
+                recovery_seconds=self.recovery_seconds,
+                half_open_max_calls=self.half_open_max_calls,
+            )
+            self._breakers[host] = breaker
+        return breaker
+
+    def metrics(self) -> dict[str, dict]:
+        return {host: breaker.metrics() for host, breaker in self._breakers.items()}
+
+
+_breakers: Optional[HostCircuitBreakers] = None
+
+
+def get_circuit_breakers() -> HostCircuitBreakers:
+    global _breakers
+    if _breakers is None:
+        _breakers = HostCircuitBreakers()
+    return _breakers
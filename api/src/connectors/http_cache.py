@@ -0,0 +1,332 @@
+"""
+Cache HTTP dos conectores — respeita Cache-Control e revalida com ETag.
+
+Para cada GET 200 guardamos corpo + validadores (ETag / Last-Modified):
+  - dentro da janela de frescor → resposta servida sem ir ao upstream;
+  - fora dela → request condicional (If-None-Match / If-Modified-Since);
+    um 304 renova a entrada e devolve o corpo guardado.
+
+Frescor: `max-age` do servidor limitado pelo TTL da política do endpoint
+(search, items, descriptions, users); sem `max-age`, vale o TTL da política.
+`no-store` não é guardado; `no-cache` é guardado mas sempre revalidado.
+
+Com o upstream degradado (circuito aberto, 429/5xx, erro de rede), uma entrada
+vencida há menos de HTTP_CACHE_STALE_SECONDS é servida no lugar do erro.
+
+Camadas:
+  - memória (LRU por número de entradas);
+  - disco opcional (SQLite em HTTP_CACHE_PERSIST_PATH), para um worker
+    reiniciado já começar aquecido. Linhas vencidas são apagadas ao abrir e
+    a cada _DISK_PRUNE_EVERY gravações; acima de
+    HTTP_CACHE_PERSIST_MAX_ENTRIES saem as que vencem primeiro.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+
+from api.src.config import get_settings
+
+log = structlog.get_logger()
+settings = get_settings()
+
+# (regex no path, política) — primeira que casar vence
+_ENDPOINT_POLICIES: list[tuple[re.Pattern, str]] = [
+    (re.compile(r"/users/me(/|$)"), "default"),
+    (re.compile(r"/categories/[^/]+/attributes$"), "categories"),
+    (re.compile(r"/items/[^/]+/descriptions?$"), "descriptions"),
+    (re.compile(r"/items(/|$)"), "items"),
+    (re.compile(r"/users(/|$)"), "users"),
+    (re.compile(r"/search$|/busca/"), "search"),
+    (re.compile(r"/p/[^/]+/?$|/produto/"), "items"),
+]
+
+
+def endpoint_policy(url: str) -> str:
+    path = urlsplit(url).path
+    for pattern, policy in _ENDPOINT_POLICIES:
+        if pattern.search(path):
+            return policy
+    return "default"
+
+
+def cache_key(url: str, params: Optional[dict[str, Any]], headers: Optional[dict[str, str]]) -> str:
+    """Chave estável entre processos (o tier em disco depende disso)."""
+    auth = (headers or {}).get("Authorization", "")
+    payload = json.dumps(
+        [url, sorted((str(k), str(v)) for k, v in (params or {}).items()), hashlib.sha256(auth.encode()).hexdigest()],
+        ensure_ascii=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _parse_cache_control(value: str) -> dict[str, Optional[str]]:
+    directives: dict[str, Optional[str]] = {}
+    for part in (value or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        name, _, arg = part.partition("=")
+        directives[name.strip().lower()] = arg.strip().strip('"') or None
+    return directives
+
+
+@dataclass
+class CachedResponse:
+    body: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+    fresh_until: float
+    policy: str
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) < self.fresh_until
+
+    @property
+    def age_seconds(self) -> float:
+        return max(time.time() - self.stored_at, 0.0)
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+# gravações entre duas limpezas do tier em disco
+_DISK_PRUNE_EVERY = 200
+
+
+class _DiskTier:
+    """SQLite simples (key → JSON da entrada). Acesso serializado por lock."""
+
+    def __init__(self, path: str, max_rows: int = 50000):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.max_rows = max(max_rows, 1)
+        self._writes = 0
+        self.pruned = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "create table if not exists http_cache (key text primary key, entry text not null, expires_at real not null)"
+        )
+        self._conn.execute("create index if not exists http_cache_expires_at on http_cache (expires_at)")
+        self._conn.commit()
+        self.prune()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._conn.execute(
+                "select entry from http_cache where key = ? and expires_at > ?", (key, time.time())
+            ).fetchone()
+        if not row:
+            return None
+        try:
+            return CachedResponse(**json.loads(row[0]))
+        except (TypeError, ValueError):
+            return None
+
+    def put(self, key: str, entry: CachedResponse, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "insert or replace into http_cache (key, entry, expires_at) values (?, ?, ?)",
+                (key, json.dumps(asdict(entry), ensure_ascii=False), expires_at),
+            )
+            self._conn.commit()
+            self._writes += 1
+            if self._writes % _DISK_PRUNE_EVERY == 0:
+                self._prune_locked()
+
+    def prune(self) -> int:
+        """Apaga linhas vencidas e o excesso acima de max_rows. Retorna quantas saíram."""
+        with self._lock:
+            return self._prune_locked()
+
+    def _prune_locked(self) -> int:
+        removed = self._conn.execute("delete from http_cache where expires_at <= ?", (time.time(),)).rowcount
+        excess = self._conn.execute("select count(*) from http_cache").fetchone()[0] - self.max_rows
+        if excess > 0:
+            removed += self._conn.execute(
+                "delete from http_cache where key in "
+                "(select key from http_cache order by expires_at limit ?)",
+                (excess,),
+            ).rowcount
+        self._conn.commit()
+        self.pruned += removed
+        return removed
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("select count(*) from http_cache").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        max_entries: int = 2000,
+        ttl_policies: Optional[dict[str, float]] = None,
+        stale_seconds: float = 86400,
+        persist_path: Optional[str] = None,
+        persist_max_entries: int = 50000,
+    ):
+        self.max_entries = max(max_entries, 1)
+        self.ttl_policies = ttl_policies or {}
+        # por quanto tempo entradas vencidas ficam guardadas para revalidação
+        self.stale_seconds = stale_seconds
+        self._memory: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._disk = _DiskTier(persist_path, max_rows=persist_max_entries) if persist_path else None
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.stores = 0
+        self.stale_served = 0
+
+    # ── Leitura ───────────────────────────────────────────────
+
+    async def lookup(self, key: str) -> Optional[CachedResponse]:
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            return entry
+        if self._disk is not None:
+            entry = await asyncio.to_thread(self._disk.get, key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._remember(key, entry)
+                return entry
+        return None
+
+    def can_serve_stale(self, entry: CachedResponse) -> bool:
+        return time.time() < entry.fresh_until + self.stale_seconds
+
+    # ── Escrita ───────────────────────────────────────────────
+
+    def _freshness(self, policy: str, response: httpx.Response) -> Optional[float]:
+        """Segundos de frescor, ou None se a resposta não pode ser guardada."""
+        directives = _parse_cache_control(response.headers.get("cache-control", ""))
+        if "no-store" in directives:
+            return None
+        policy_ttl = float(self.ttl_policies.get(policy, 0))
+        if "no-cache" in directives:
+            return 0.0
+        max_age = directives.get("max-age")
+        if max_age is not None:
+            try:
+                return max(min(float(max_age), policy_ttl), 0.0)
+            except ValueError:
+                pass
+        return policy_ttl
+
+    async def store(self, key: str, url: str, response: httpx.Response) -> Optional[CachedResponse]:
+        if response.status_code != 200:
+            return None
+        policy = endpoint_policy(url)
+        freshness = self._freshness(policy, response)
+        if freshness is None:
+            return None
+        etag = response.headers.get("etag")
+        last_modified = response.headers.get("last-modified")
+        if freshness <= 0 and not (etag or last_modified):
+            return None  # nem fresco nem revalidável: não vale guardar
+        now = time.time()
+        entry = CachedResponse(
+            body=response.text,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=now,
+            fresh_until=now + freshness,
+            policy=policy,
+        )
+        await self._save(key, entry)
+        return entry
+
+    async def revalidate(self, key: str, entry: CachedResponse, response: httpx.Response) -> CachedResponse:
+        """304 recebido: renova frescor (e validadores, se vieram) da entrada."""
+        self.revalidated += 1
+        freshness = self._freshness(entry.policy, response)
+        now = time.time()
+        entry.stored_at = now
+        entry.fresh_until = now + (freshness or 0.0)
+        entry.etag = response.headers.get("etag") or entry.etag
+        entry.last_modified = response.headers.get("last-modified") or entry.last_modified
+        await self._save(key, entry)
+        return entry
+
+    async def _save(self, key: str, entry: CachedResponse) -> None:
+        self.stores += 1
+        self._remember(key, entry)
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.put, key, entry, entry.fresh_until + self.stale_seconds)
+            except Exception as exc:
+                log.warning("http_cache_disk_write_failed", error=str(exc))
+
+    def _remember(self, key: str, entry: CachedResponse) -> None:
+        self._memory[key] = entry
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self) -> None:
+        self._memory.clear()
+
+    def metrics(self) -> dict:
+        return {
+            "entries": len(self._memory),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "revalidated_304": self.revalidated,
+            "misses": self.misses,
+            "stores": self.stores,
+            "stale_served": self.stale_served,
+            "persistent": self._disk is not None,
+            "disk_pruned": self._disk.pruned if self._disk is not None else 0,
+        }
+
+
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Cache HTTP do processo (None quando HTTP_CACHE_ENABLED=false)."""
+    global _response_cache
+    if not settings.HTTP_CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.HTTP_CACHE_MAX_ENTRIES,
+            ttl_policies={
+                "search": settings.HTTP_CACHE_TTL_SEARCH,
+                "items": settings.HTTP_CACHE_TTL_ITEMS,
+                "descriptions": settings.HTTP_CACHE_TTL_DESCRIPTIONS,
+                "users": settings.HTTP_CACHE_TTL_USERS,
+                "categories": settings.HTTP_CACHE_TTL_CATEGORIES,
+                "default": 0,
+            },
+            stale_seconds=settings.HTTP_CACHE_STALE_SECONDS,
+            persist_path=settings.HTTP_CACHE_PERSIST_PATH or None,
+            persist_max_entries=settings.HTTP_CACHE_PERSIST_MAX_ENTRIES,
+        )
+    return _response_cache
@@ -13,6 +13,7 @@ import asyncio
 import re
 from datetime import datetime
 from typing import Any, Optional
+import httpx
 import structlog
 
 from api.src.config import get_settings
@@ -30,16 +31,19 @@ settings = get_settings()
 
 class MagaluConnector(BaseConnector):
     marketplace_name = "magalu"
+    details_concurrency = 2   # scraping: o token bucket ainda dita o ritmo
+    search_page_size = 48
 
     # Endpoints internos do site — suficientemente estáveis
     SEARCH_URL = "https://www.magazineluiza.com.br/busca/{query}/"
     SEARCH_API = "https://www.magazineluiza.com.br/busca/{query}/?page={page}&go=0"
     PRODUCT_API = "https://www.magazineluiza.com.br/{slug}/p/{sku}/"
 
-    def __init__(self):
+    def __init__(self, client: Optional[httpx.AsyncClient] = None):
         delay_ms = settings.magalu_scraping_delay_ms
-        super().__init__()
+        super().__init__(client=client)
         self.rate_limit_delay = delay_ms / 1000
+        self.rate_limit_burst = settings.MAGALU_RATE_LIMIT_BURST
 
     def _default_headers(self) -> dict:
         return {
@@ -67,6 +71,8 @@ class MagaluConnector(BaseConnector):
         """
         Usa o endpoint de busca do Magalu.
         Retorna lista de produtos em formato normalizado internamente.
+        Falhas (rede, circuito aberto, bloqueio) sobem para o chamador, como
+        no ML: busca sem resultado e busca que falhou não se confundem.
         """
         slug = query.lower().replace(" ", "%20")
         page = (offset // 48) + 1
@@ -74,10 +80,10 @@ class MagaluConnector(BaseConnector):
 
         try:
             html = await self._get_html(url)
-            return self._parse_search_html(html, limit)
         except Exception as exc:
             log.error("magalu_search_error", error=str(exc), query=query)
-            return []
+            raise
+        return self._parse_search_html(html, limit)
 
     async def get_listing_details(self, listing_id: str) -> dict[str, Any]:
         """
@@ -147,9 +153,7 @@ class MagaluConnector(BaseConnector):
     # ── Parsers HTML internos ──────────────────────────────────
 
     async def _get_html(self, url: str) -> str:
-        resp = await self._client.get(url)
-        resp.raise_for_status()
-        return resp.text
+        return await self._get_text(url)
 
     def _parse_search_html(self, html: str, limit: int) -> list[dict]:
         """
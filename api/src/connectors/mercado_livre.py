@@ -16,8 +16,9 @@ from typing import Any, Optional
 import httpx
 import structlog
 
+from api.src.caching import get_cache
 from api.src.config import get_settings
-from api.src.connectors.base import BaseConnector
+from api.src.connectors.base import BaseConnector, BulkDetails
 from api.src.utils.measurements import parse_length_to_cm
 from api.src.types.listing import (
     Badges, ListingAttributes, ListingNormalized, Marketplace,
@@ -36,16 +37,46 @@ _REPUTATION_MAP = {
     "1_red": SellerReputation.NEW,
 }
 
+# GET /users?ids= e /items?ids= aceitam até 20 ids por chamada
+_USERS_MULTIGET_CHUNK = 20
+_ITEMS_MULTIGET_CHUNK = 20
+
+# id de atributo do ML → campo de ListingAttributes (o resto vai para extras)
+ML_ATTRIBUTE_FIELDS = {
+    "COR": "cor",
+    "MATERIAL": "material",
+    "WIDTH": "largura_cm",
+    "DEPTH": "profundidade_cm",
+    "HEIGHT": "altura_cm",
+    "WEIGHT": "peso_kg",
+    "PRODUCT_TYPE": "tipo_produto",
+    "NUMBER_OF_SEATS": "numero_lugares",
+    "FILLING_MATERIAL": "densidade",
+}
+
+# Cache de sellers compartilhado pelo processo (seller_id → payload de /users)
+_seller_cache = get_cache().namespace("ml_sellers", ttl_seconds=settings.ML_SELLER_CACHE_TTL_SECONDS)
+
+
+def _multiget_body(entry: Any) -> dict[str, Any]:
+    body = entry.get("body") if isinstance(entry, dict) and "body" in entry else entry
+    return body if isinstance(body, dict) else {}
+
 
 class MercadoLivreConnector(BaseConnector):
     marketplace_name = "mercado_livre"
-    rate_limit_delay = 0.3   # ML permite ~90 req/min
+    rate_limit_delay = 0.3   # ML permite ~90 req/min (sobrescrito por ML_RATE_LIMIT_PER_SECOND)
 
     BASE = "https://api.mercadolibre.com"
+    search_page_size = 50
+    search_max_results = 1000   # busca pública não pagina além de offset+limit=1000
 
-    def __init__(self, access_token: str = ""):
-        super().__init__(api_key=access_token)
+    def __init__(self, access_token: str = "", client: Optional[httpx.AsyncClient] = None):
+        super().__init__(api_key=access_token, client=client)
         self._token = access_token or settings.ml_seller_access_token
+        if settings.ML_RATE_LIMIT_PER_SECOND > 0:
+            self.rate_limit_delay = 1.0 / settings.ML_RATE_LIMIT_PER_SECOND
+        self.rate_limit_burst = settings.ML_RATE_LIMIT_BURST
 
     def _auth_headers(self) -> dict:
         h = {}
@@ -90,9 +121,168 @@ class MercadoLivreConnector(BaseConnector):
         item["_descriptions"] = desc if isinstance(desc, list) else []
         return item
 
+    async def get_listings_details_bulk(
+        self,
+        listing_ids: list[str],
+        include_descriptions: bool = True,
+    ) -> BulkDetails:
+        """
+        GET /items?ids=A,B,... em blocos de 20 (+ /descriptions por item
+        somente quando include_descriptions=True).
+
+        O multiget devolve uma entrada por id, na ordem pedida: o resultado é
+        indexado pelo id pedido (não pelo `body.id`). Entrada 404 é "não
+        encontrado"; outro código, ou o bloco inteiro falhando, vira erro
+        daqueles ids.
+        """
+        ids = [i for i in dict.fromkeys(listing_ids) if i]
+        chunks = [
+            ids[i:i + _ITEMS_MULTIGET_CHUNK]
+            for i in range(0, len(ids), _ITEMS_MULTIGET_CHUNK)
+        ]
+        responses = await asyncio.gather(
+            *(
+                self._get(
+                    f"{self.BASE}/items",
+                    params={"ids": ",".join(chunk)},
+                    headers=self._auth_headers(),
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        items: dict[str, dict[str, Any]] = {}
+        errors: dict[str, BaseException] = {}
+        for chunk, resp in zip(chunks, responses):
+            if isinstance(resp, Exception):
+                log.warning("ml_items_multiget_failed", error=str(resp), ids=len(chunk))
+                errors.update((listing_id, resp) for listing_id in chunk)
+                continue
+            entries = resp if isinstance(resp, list) else []
+            if len(entries) == len(chunk):
+                pairs = zip(chunk, entries)
+            else:
+                # resposta fora do formato: casa pelo id do corpo, sem diferenciar caixa
+                by_upper = {listing_id.upper(): listing_id for listing_id in chunk}
+                pairs = (
+                    (by_upper.get(str(_multiget_body(entry).get("id", "")).upper()), entry)
+                    for entry in entries
+                )
+            for listing_id, entry in pairs:
+                if listing_id is None or not isinstance(entry, dict):
+                    continue
+                code = entry.get("code", 200)
+                body = _multiget_body(entry)
+                if code == 200 and body.get("id"):
+                    items[listing_id] = body
+                elif code != 404:
+                    errors[listing_id] = RuntimeError(
+                        f"/items respondeu {code} para {listing_id}: {body.get('message') or body.get('error') or ''}".strip()
+                    )
+
+        if include_descriptions and items:
+            semaphore = asyncio.Semaphore(max(self.details_concurrency, 1))
+
+            async def _descriptions(item_id: str) -> list:
+                async with semaphore:
+                    try:
+                        desc = await self._get(
+                            f"{self.BASE}/items/{item_id}/descriptions",
+                            headers=self._auth_headers(),
+                        )
+                    except Exception:
+                        return []
+                return desc if isinstance(desc, list) else []
+
+            descs = await asyncio.gather(*(_descriptions(i) for i in items))
+            for item, desc in zip(items.values(), descs):
+                item["_descriptions"] = desc
+
+        # mantém a ordem pedida
+        return BulkDetails(
+            items={i: items[i] for i in ids if i in items},
+            missing=[i for i in ids if i not in items and i not in errors],
+            errors=errors,
+        )
+
+    async def search_my_item_ids(self, limit: int = 20, offset: int = 0) -> list[str]:
+        """GET /users/me/items/search (requer token do seller)"""
+        data = await self._get(
+            f"{self.BASE}/users/me/items/search",
+            params={"limit": limit, "offset": offset},
+            headers=self._auth_headers(),
+        )
+        return [str(i) for i in data.get("results", [])]
+
+    async def get_category_attributes(self, category_id: str) -> list[dict[str, Any]]:
+        """GET /categories/{category_id}/attributes (cache HTTP de longa duração)."""
+        data = await self._get(f"{self.BASE}/categories/{category_id}/attributes", headers=self._auth_headers())
+        return data if isinstance(data, list) else []
+
     async def get_seller_details(self, seller_id: str) -> dict[str, Any]:
         """GET /users/{seller_id}"""
-        return await self._get(f"{self.BASE}/users/{seller_id}", headers=self._auth_headers())
+        cached = await _seller_cache.get(seller_id)
+        if cached is not None:
+            return cached
+        detail = await self._get(f"{self.BASE}/users/{seller_id}", headers=self._auth_headers())
+        await _seller_cache.set(seller_id, detail)
+        return detail
+
+    async def get_sellers_details(self, seller_ids: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        GET /users?ids=A,B,C em blocos de 20.
+        Ids já presentes no cache não são buscados de novo.
+        """
+        wanted = [seller_id for seller_id in dict.fromkeys(seller_ids) if seller_id]
+        found: dict[str, dict[str, Any]] = await _seller_cache.get_many(wanted)
+        missing = [seller_id for seller_id in wanted if seller_id not in found]
+
+        chunks = [
+            missing[i:i + _USERS_MULTIGET_CHUNK]
+            for i in range(0, len(missing), _USERS_MULTIGET_CHUNK)
+        ]
+        responses = await asyncio.gather(
+            *(
+                self._get(
+                    f"{self.BASE}/users",
+                    params={"ids": ",".join(chunk)},
+                    headers=self._auth_headers(),
+                )
+                for chunk in chunks
+            ),
+            return_exceptions=True,
+        )
+        fetched: dict[str, dict[str, Any]] = {}
+        for chunk, resp in zip(chunks, responses):
+            if isinstance(resp, Exception):
+                log.warning("ml_users_multiget_failed", error=str(resp), ids=len(chunk))
+                continue
+            for entry in resp if isinstance(resp, list) else []:
+                if not isinstance(entry, dict):
+                    continue
+                # multiget responde [{"code": 200, "body": {...}}, ...]
+                if "body" in entry:
+                    if entry.get("code", 200) != 200:
+                        continue
+                    entry = entry["body"]
+                seller_id = str(entry.get("id", ""))
+                if seller_id:
+                    fetched[seller_id] = entry
+        await _seller_cache.set_many(fetched)
+        found.update(fetched)
+        return found
+
+    async def prepare_batch(self, raw_items: list[dict[str, Any]]) -> None:
+        """Resolve os sellers do lote inteiro em poucas chamadas multiget."""
+        if not self._token:
+            return
+        seller_ids = [
+            str(item["seller"].get("id", "")) if isinstance(item.get("seller"), dict)
+            else str(item.get("seller_id") or "")
+            for item in raw_items
+        ]
+        if seller_ids:
+            await self.get_sellers_details(seller_ids)
 
     # ── Normalização ──────────────────────────────────────────
 
@@ -102,7 +292,8 @@ class MercadoLivreConnector(BaseConnector):
         original_price = float(raw.get("original_price") or 0) or None
         shipping = self._extract_shipping(raw)
 
-        seller_raw = raw.get("seller", {})
+        # busca traz "seller": {...}; /items traz só "seller_id"
+        seller_raw = raw.get("seller") or {"id": raw.get("seller_id", "")}
         seller = await self._build_seller(seller_raw)
 
         attributes = self._extract_attributes(raw.get("attributes", []))
@@ -152,7 +343,7 @@ class MercadoLivreConnector(BaseConnector):
         reputation_level = seller_raw.get("seller_reputation", {}).get("level_id", "")
         reputation = _REPUTATION_MAP.get(reputation_level, SellerReputation.UNKNOWN)
 
-        # Tenta buscar detalhes se tiver ID
+        # Tenta buscar detalhes se tiver ID (normalmente já no cache via prepare_batch)
         metrics = None
         if seller_id and self._token:
             try:
@@ -177,17 +368,7 @@ class MercadoLivreConnector(BaseConnector):
         )
 
     def _extract_attributes(self, attrs: list) -> ListingAttributes:
-        mapping = {
-            "COR": "cor",
-            "MATERIAL": "material",
-            "WIDTH": "largura_cm",
-            "DEPTH": "profundidade_cm",
-            "HEIGHT": "altura_cm",
-            "WEIGHT": "peso_kg",
-            "PRODUCT_TYPE": "tipo_produto",
-            "NUMBER_OF_SEATS": "numero_lugares",
-            "FILLING_MATERIAL": "densidade",
-        }
+        mapping = ML_ATTRIBUTE_FIELDS
         data: dict[str, Any] = {}
         extras: dict[str, str] = {}
         for attr in attrs:
@@ -0,0 +1,171 @@
+"""
+Rate limiting por host — token bucket assíncrono.
+
+Cada host (api.mercadolibre.com, www.magazineluiza.com.br, ...) tem um bucket
+com taxa (tokens/s) e burst próprios. Todo request dos conectores passa por
+`HostRateLimiter.acquire()` antes de sair, e o tempo gasto esperando token é
+contabilizado separado do tempo de resposta do upstream.
+
+O bucket trabalha por reserva: quem chega sem token disponível reserva o
+próximo (tokens ficam negativos) e dorme o tempo proporcional ao déficit.
+Como não há `await` entre ler e reservar, não é preciso lock no asyncio e a
+ordem de chegada é respeitada.
+
+Adaptação (AIMD): um 429/503 do upstream pausa o bucket pelo Retry-After e
+corta a taxa (`penalize`); cada resposta boa devolve uma fração da taxa base
+(`recover`), então o host volta ao ritmo normal aos poucos.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import Optional
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        penalty_factor: float = 0.5,
+        recovery_step: float = 0.1,
+        min_rate_factor: float = 0.1,
+    ):
+        self.rate = float(rate)
+        self.base_rate = self.rate
+        self.burst = max(int(burst), 1)
+        self.penalty_factor = penalty_factor
+        self.recovery_step = recovery_step
+        self.min_rate = self.base_rate * min_rate_factor
+        self._tokens = float(self.burst)
+        # pode ficar no futuro: durante uma pausa não há reposição de tokens
+        self._updated = time.monotonic()
+
+        # métricas
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.upstream_requests = 0
+        self.upstream_seconds_total = 0.0
+        self.penalties = 0
+        self.paused_seconds_total = 0.0
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._updated
+        if elapsed > 0:
+            self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+            self._updated = now
+
+    def reserve(self) -> float:
+        """Reserva um token e retorna quantos segundos esperar por ele."""
+        now = time.monotonic()
+        self._refill(now)
+        self._tokens -= 1.0
+        wait = max(self._updated - now, 0.0)
+        if self._tokens < 0:
+            wait += -self._tokens / self.rate
+        self.acquired += 1
+        if wait > 0:
+            self.throttled += 1
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+        return wait
+
+    async def acquire(self) -> float:
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+    def record_upstream(self, seconds: float) -> None:
+        self.upstream_requests += 1
+        self.upstream_seconds_total += seconds
+
+    def penalize(self, pause_seconds: float = 0.0) -> None:
+        """Upstream pediu para diminuir o ritmo: pausa e reduz a taxa."""
+        now = time.monotonic()
+        self._refill(now)
+        self.penalties += 1
+        self.rate = max(self.rate * self.penalty_factor, self.min_rate)
+        if pause_seconds > 0:
+            resume_at = now + pause_seconds
+            if resume_at > self._updated:
+                self.paused_seconds_total += resume_at - max(self._updated, now)
+                self._updated = resume_at
+            self._tokens = min(self._tokens, 0.0)
+
+    def recover(self) -> None:
+        if self.rate < self.base_rate:
+            self.rate = min(self.rate + self.base_rate * self.recovery_step, self.base_rate)
+
+    def metrics(self) -> dict:
+        return {
+            "rate_per_second": round(self.rate, 3),
+            "base_rate_per_second": round(self.base_rate, 3),
+            "burst": self.burst,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_seconds_total": round(self.wait_seconds_total, 3),
+            "wait_seconds_max": round(self.wait_seconds_max, 3),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.acquired, 4) if self.acquired else 0.0,
+            "upstream_requests": self.upstream_requests,
+            "upstream_seconds_total": round(self.upstream_seconds_total, 3),
+            "upstream_seconds_avg": (
+                round(self.upstream_seconds_total / self.upstream_requests, 4) if self.upstream_requests else 0.0
+            ),
+            "penalties": self.penalties,
+            "paused_seconds_total": round(self.paused_seconds_total, 3),
+        }
+
+
+class HostRateLimiter:
+    """Um TokenBucket por host, criado no primeiro uso com a taxa do conector."""
+
+    def __init__(self) -> None:
+        self._buckets: dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def host_of(url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def bucket_for(self, host: str, rate: float, burst: int = 1) -> TokenBucket:
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = TokenBucket(rate=rate, burst=burst)
+            self._buckets[host] = bucket
+        return bucket
+
+    def get_bucket(self, url: str) -> Optional[TokenBucket]:
+        return self._buckets.get(self.host_of(url))
+
+    async def acquire(self, url: str, rate: float, burst: int = 1) -> float:
+        if rate <= 0:
+            return 0.0
+        return await self.bucket_for(self.host_of(url), rate, burst).acquire()
+
+    def record_upstream(self, url: str, seconds: float) -> None:
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            bucket.record_upstream(seconds)
+
+    def penalize(self, url: str, pause_seconds: float = 0.0) -> None:
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            bucket.penalize(pause_seconds)
+
+    def recover(self, url: str) -> None:
+        bucket = self.get_bucket(url)
+        if bucket is not None:
+            bucket.recover()
+
+    def metrics(self) -> dict[str, dict]:
+        return {host: bucket.metrics() for host, bucket in self._buckets.items()}
+
+
+_limiter = HostRateLimiter()
+
+
+def get_rate_limiter() -> HostRateLimiter:
+    return _limiter
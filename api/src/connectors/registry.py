@@ -0,0 +1,203 @@
+"""
+Registry de conectores — uma instância por processo.
+
+Cada marketplace recebe um único httpx.AsyncClient com pool de conexões,
+keep-alive e HTTP/2 (quando o pacote `h2` está instalado). Os conectores são
+criados uma vez e reaproveitados por todos os requests e pelo monitor.
+
+Ciclo de vida:
+  - `lifespan` em api/src/main.py chama `get_registry().start()` no startup
+    e `close_registry()` no shutdown.
+  - Fora do lifespan (scripts, testes) o registry é criado sob demanda.
+"""
+from __future__ import annotations
+
+import asyncio
+from typing import Optional
+
+import httpx
+import structlog
+
+from api.src.config import get_settings
+from api.src.connectors.base import BaseConnector
+from api.src.connectors.circuit_breaker import get_circuit_breakers
+from api.src.connectors.http_cache import get_response_cache
+from api.src.connectors.magalu import MagaluConnector
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+from api.src.connectors.rate_limit import get_rate_limiter
+
+log = structlog.get_logger()
+settings = get_settings()
+
+try:
+    import h2  # noqa: F401
+
+    _HTTP2_AVAILABLE = True
+except ImportError:
+    _HTTP2_AVAILABLE = False
+
+
+def _current_loop() -> Optional[asyncio.AbstractEventLoop]:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+class ConnectorRegistry:
+    """Conectores e clientes HTTP compartilhados pelo processo inteiro."""
+
+    def __init__(self) -> None:
+        self._clients: dict[str, httpx.AsyncClient] = {}
+        self._connectors: dict[str, BaseConnector] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # clientes trocados por mudança de loop, ainda sendo fechados
+        self._retired: list[httpx.AsyncClient] = []
+        self._closing: set[asyncio.Task] = set()
+
+    # ── Construção ────────────────────────────────────────────
+
+    @staticmethod
+    def _build_client(max_connections: int, max_keepalive: int) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT_SECONDS,
+                connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        )
+
+    def start(self) -> dict[str, BaseConnector]:
+        """Cria clientes e conectores (idempotente)."""
+        if self._connectors:
+            return self._connectors
+
+        # Cada conector fala com um único host, então os limites do pool
+        # funcionam como limite de conexões por host.
+        self._clients = {
+            "mercado_livre": self._build_client(
+                settings.ML_HTTP_MAX_CONNECTIONS,
+                settings.ML_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+            "magalu": self._build_client(
+                settings.MAGALU_HTTP_MAX_CONNECTIONS,
+                settings.MAGALU_HTTP_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        }
+        self._connectors = {
+            "mercado_livre": MercadoLivreConnector(
+                settings.ml_seller_access_token,
+                client=self._clients["mercado_livre"],
+            ),
+            "magalu": MagaluConnector(client=self._clients["magalu"]),
+        }
+        self._loop = _current_loop()
+        log.info(
+            "connector_registry_started",
+            marketplaces=list(self._connectors.keys()),
+            http2=settings.HTTP2_ENABLED and _HTTP2_AVAILABLE,
+        )
+        return self._connectors
+
+    # ── Acesso ────────────────────────────────────────────────
+
+    @property
+    def connectors(self) -> dict[str, BaseConnector]:
+        loop = _current_loop()
+        if self._connectors and loop is not None and self._loop is not None and loop is not self._loop:
+            # Conexões do pool ficam presas ao event loop que as abriu
+            # (ex.: TestClient sem lifespan, asyncio.run em tasks). Recria.
+            log.warning("connector_registry_loop_changed")
+            self._retire_clients(loop)
+        if not self._connectors:
+            self.start()
+        elif self._loop is None:
+            self._loop = loop
+        return self._connectors
+
+    def _retire_clients(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Tira os clientes do loop antigo de uso e agenda o fechamento deles."""
+        old_loop = self._loop
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._connectors = {}
+        if old_loop is not None and old_loop.is_running() and not old_loop.is_closed():
+            # loop antigo ainda vivo (outra thread): fecha lá, onde as conexões nasceram
+            for client in clients:
+                asyncio.run_coroutine_threadsafe(_close_client(client), old_loop)
+            return
+        self._retired.extend(clients)
+        task = loop.create_task(self._close_retired())
+        self._closing.add(task)
+        task.add_done_callback(self._closing.discard)
+
+    async def _close_retired(self) -> None:
+        while self._retired:
+            await _close_client(self._retired.pop())
+
+    def get(self, marketplace: str) -> BaseConnector:
+        connector = self.connectors.get(marketplace)
+        if connector is None:
+            raise KeyError(f"Connector '{marketplace}' não registrado")
+        return connector
+
+    # ── Shutdown ──────────────────────────────────────────────
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients = {}
+        self._connectors = {}
+        self._loop = None
+        for client in clients:
+            await _close_client(client)
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+        await self._close_retired()
+        log.info("connector_registry_closed")
+
+    def metrics(self) -> dict[str, dict]:
+        """Métricas dos conectores já criados (não cria conectores)."""
+        return {name: connector.metrics() for name, connector in self._connectors.items()}
+
+
+async def _close_client(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as exc:   # ex.: conexões presas a um loop já fechado
+        log.warning("connector_client_close_failed", error=str(exc))
+
+
+_registry: Optional[ConnectorRegistry] = None
+
+
+def get_registry() -> ConnectorRegistry:
+    global _registry
+    if _registry is None:
+        _registry = ConnectorRegistry()
+    return _registry
+
+
+def get_shared_connectors() -> dict[str, BaseConnector]:
+    return get_registry().connectors
+
+
+async def close_registry() -> None:
+    if _registry is not None:
+        await _registry.aclose()
+
+
+def connector_metrics() -> dict:
+    """Métricas operacionais dos conectores (throttling vs. upstream por host)."""
+    connectors = _registry.metrics() if _registry is not None else {}
+    return {
+        "rate_limit": get_rate_limiter().metrics(),
+        "circuit_breakers": get_circuit_breakers().metrics(),
+        "normalize": {name: m["normalize"] for name, m in connectors.items()},
+        "singleflight": {name: m["singleflight"] for name, m in connectors.items()},
+        "http_cache": cache.metrics() if (cache := get_response_cache()) is not None else None,
+    }
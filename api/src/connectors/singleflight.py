@@ -0,0 +1,82 @@
+"""
+Singleflight — coalescência de chamadas idênticas em voo.
+
+Enquanto uma chamada para a mesma chave (método + URL + params) está em
+andamento, novas chamadas não vão ao upstream: aguardam o mesmo future.
+
+- O trabalho roda numa task própria, protegida com `asyncio.shield`, então
+  cancelar um dos chamadores não cancela os demais.
+- Se todos os chamadores forem cancelados, a task compartilhada é cancelada.
+- Quando o resultado foi compartilhado, cada chamador recebe uma cópia
+  (os conectores mutam o JSON retornado, ex.: `_descriptions`).
+"""
+from __future__ import annotations
+
+import asyncio
+import copy
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Flight:
+    __slots__ = ("task", "waiters", "shared")
+
+    def __init__(self, task: asyncio.Task):
+        self.task = task
+        self.waiters = 0
+        self.shared = False
+
+
+class SingleFlight:
+    def __init__(self) -> None:
+        self._flights: dict[Hashable, _Flight] = {}
+        self.calls = 0        # chamadas que foram de fato ao upstream
+        self.coalesced = 0    # chamadas atendidas por uma chamada já em voo
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _t, k=key, f=flight: self._finish(k, f))
+            self.calls += 1
+        else:
+            flight.shared = True
+            self.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            result = await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # ninguém mais espera: libera a chave já e cancela o trabalho
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+        return copy.deepcopy(result) if flight.shared else result
+
+    def _finish(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        if not flight.task.cancelled():
+            flight.task.exception()  # evita "exception was never retrieved"
+
+    @staticmethod
+    def make_key(
+        method: str,
+        url: str,
+        params: Optional[dict[str, Any]] = None,
+        headers: Optional[dict[str, str]] = None,
+    ) -> Hashable:
+        auth = (headers or {}).get("Authorization", "")
+        items = tuple(sorted((str(k), repr(v)) for k, v in (params or {}).items()))
+        return (method.upper(), url, items, hash(auth))
+
+    def metrics(self) -> dict:
+        total = self.calls + self.coalesced
+        return {
+            "upstream_calls": self.calls,
+            "coalesced_calls": self.coalesced,
+            "in_flight": len(self._flights),
+            "coalesced_pct": round(self.coalesced / total * 100, 1) if total else 0.0,
+        }
@@ -1,11 +1,16 @@
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+from api.src.services.category_attributes import get_category_attribute_store
+from api.src.services.rulesets import get_ruleset_service
+from api.src.types.listing import Marketplace
 from .base import MarketplaceRules
 
+
 class MercadoLivreRules(MarketplaceRules):
     """Validation rules for Mercado Livre."""
 
-    def validate_title(self, title: str) -> Dict[str, Any]:
-        max_length = 60
+    def validate_title(self, title: str, category_id: Optional[str] = None) -> Dict[str, Any]:
+        ruleset = get_ruleset_service().get(Marketplace.MERCADO_LIVRE, category_id)
+        max_length = ruleset.title_max
         issues = []
         
         if not title:
@@ -15,10 +20,8 @@ class MercadoLivreRules(MarketplaceRules):
             issues.append(f"Title exceeds {max_length} characters (current: {len(title)})")
         
         # Termos promocionais proibidos no título pelo ML
-        prohibited_terms = ["promoção", "oferta", "envio grátis", "frete grátis", "compra garantida", "brinde"]
-        for term in prohibited_terms:
-            if term.lower() in title.lower():
-                issues.append(f"Title contains prohibited promotional term: '{term}'")
+        for term in ruleset.prohibited_matcher.found(title):
+            issues.append(f"Title contains prohibited promotional term: '{term}'")
 
         return {
             "valid": len(issues) == 0,
@@ -28,16 +31,19 @@ class MercadoLivreRules(MarketplaceRules):
         }
 
     def get_mandatory_attributes(self, category_id: str) -> List[str]:
-        # Em produção, isso consultaria a API do ML: /categories/{id}/attributes
-        # Para o MVP, retornamos atributos comuns obrigatórios na maioria das categorias
-        return ["BRAND", "MODEL", "ITEM_CONDITION"]
+        # índice de /categories/{id}/attributes já carregado; senão marketplace_rulesets
+        index = get_category_attribute_store().lookup(Marketplace.MERCADO_LIVRE.value, category_id)
+        if index is not None and index.required:
+            return sorted(index.required)
+        return list(get_ruleset_service().get(Marketplace.MERCADO_LIVRE, category_id).mandatory_attributes)
 
     def validate_listing(self, listing_data: Dict[str, Any]) -> Dict[str, Any]:
         issues = []
         
         # 1. Validação de Título
         title = listing_data.get("title", "")
-        title_res = self.validate_title(title)
+        category_id = listing_data.get("category_id", "")
+        title_res = self.validate_title(title, category_id)
         if not title_res["valid"]:
             issues.extend(title_res["issues"])
 
@@ -53,7 +59,6 @@ class MercadoLivreRules(MarketplaceRules):
         elif isinstance(attributes, dict):
             existing_attr_ids = set(attributes.keys())
 
-        category_id = listing_data.get("category_id", "")
         mandatory_attrs = self.get_mandatory_attributes(category_id)
         
         for req_id in mandatory_attrs:
@@ -286,6 +286,45 @@ def get_job(workspace_id: str, job_id: str, supabase_jwt: Optional[str] = None)
         return None
 
 
+def list_marketplace_rulesets(platform: Optional[str] = None) -> Optional[List[Dict[str, Any]]]:
+    """
+    Rulesets (todas as versões) — o chamador escolhe a maior por (platform, category_id).
+    None quando o banco está fora ou a consulta falha (≠ tabela vazia).
+    """
+    client = _make_client()
+    if not client:
+        return None
+    try:
+        query = client.table("marketplace_rulesets").select("platform, category_id, rules, version, updated_at")
+        if platform:
+            query = query.eq("platform", _platform_to_db(platform))
+        resp = query.order("version", desc=True).execute()
+        return resp.data or []
+    except Exception as exc:
+        logger.error("repository_list_marketplace_rulesets_failed: %s", exc)
+        return None
+
+
+def get_marketplace_rulesets_version() -> Optional[str]:
+    """Token barato que muda quando alguma linha de marketplace_rulesets muda (total + último updated_at)."""
+    client = _make_client()
+    if not client:
+        return None
+    try:
+        resp = (
+            client.table("marketplace_rulesets")
+            .select("updated_at", count="exact")
+            .order("updated_at", desc=True)
+            .limit(1)
+            .execute()
+        )
+        latest = (resp.data or [{}])[0].get("updated_at")
+        return f"{resp.count or 0}:{latest}"
+    except Exception as exc:
+        logger.error("repository_get_marketplace_rulesets_version_failed: %s", exc)
+        return None
+
+
 def create_alert_rule(
     workspace_id: str,
     name: str,
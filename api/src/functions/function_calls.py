@@ -2,12 +2,12 @@ from __future__ import annotations
 
 from typing import Any, Literal, Optional
 
-from api.src.connectors.magalu import MagaluConnector
-from api.src.connectors.mercado_livre import MercadoLivreConnector
+from api.src.connectors.registry import get_registry
 from api.src.reports.ab_test_plan import generate_ab_test_plan as _generate_ab_test_plan
 from api.src.reports.action_plan import generate_action_plan as _generate_action_plan
 from api.src.reports.audit_report import generate_audit_report as _generate_audit_report
 from api.src.reports.market_dashboard import generate_market_dashboard as _generate_market_dashboard
+from api.src.services.category_attributes import get_category_attribute_store
 from api.src.types.listing import ListingNormalized
 
 
@@ -17,8 +17,8 @@ def _not_implemented(reason: str, todo: list[str]) -> dict[str, Any]:
 
 def _get_connector(marketplace: str):
     if marketplace in {"mercadolivre", "mercado_livre", "meli"}:
-        return MercadoLivreConnector()
-    return MagaluConnector()
+        return get_registry().get("mercado_livre")
+    return get_registry().get("magalu")
 
 
 async def search_listings(
@@ -37,9 +37,8 @@ async def search_listings(
 
 async def get_listing_detail(marketplace: str, listing_id: str) -> dict[str, Any]:
     connector = _get_connector(marketplace)
-    raw = await connector.get_listing_details(listing_id)
-    normalized = await connector.normalize(raw)
-    return normalized.to_contract_payload() if isinstance(normalized, ListingNormalized) else raw
+    normalized = await connector.get_normalized_listing(listing_id)
+    return normalized.to_contract_payload() if isinstance(normalized, ListingNormalized) else normalized
 
 
 async def get_seller_profile(marketplace: str, seller_id: str) -> dict[str, Any]:
@@ -50,7 +49,14 @@ async def get_seller_profile(marketplace: str, seller_id: str) -> dict[str, Any]
 
 
 async def get_category_attributes(marketplace: str, category_id: str) -> dict[str, Any]:
-    return _not_implemented("category_attributes_not_connected", ["Integrate marketplace category attributes endpoint."])
+    connector = _get_connector(marketplace)
+    index = await get_category_attribute_store().get(connector, category_id)
+    if index is None:
+        return _not_implemented(
+            "category_attributes_unavailable",
+            ["Marketplace has no category attributes endpoint or the category is unknown."],
+        )
+    return index.to_dict()
 
 
 async def get_top_sellers(category_or_query: str, marketplace: str, limit: int = 10) -> dict[str, Any]:
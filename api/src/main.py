@@ -15,14 +15,22 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
 from api.src.auth import RequestContext, require_auth_context
+from api.src.caching import close_cache, get_cache, request_memo_scope
 from api.src.config import get_settings, settings
+from api.src.connectors.circuit_breaker import CircuitOpenError
+from api.src.connectors.registry import close_registry, connector_metrics, get_registry
 from api.src.db.mercado_livre import MercadoLivreRules
 from api.src.functions.generator import generate_bullets, generate_description
 from api.src.routers import ads, alerts, documents, images_v2, market_research, reports, seo
 from api.src.routers.common import error_payload
 from api.src.routers.schemas import AnalyzeRequest, AuditListingRequest, OptimizeTitleRequest
+from api.src.scoring.memo import get_score_memo
 from api.src.services.monitoring_scheduler import get_scheduler_health, scheduler_loop
-from api.src.services.marketplace import get_agent, get_connector, marketplace_alias
+from api.src.services.marketplace import get_agent, get_connector, marketplace_alias, reset_agent
+from api.src.services.batch_research import get_batch_research_service
+from api.src.services.category_attributes import get_category_attribute_store
+from api.src.services.research_cache import get_research_cache
+from api.src.services.rulesets import get_ruleset_service
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +38,19 @@ logger = logging.getLogger(__name__)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("ultron_startup", extra={"environment": settings.ENVIRONMENT})
+    connector_registry = get_registry()
+    connector_registry.start()
+    app.state.connector_registry = connector_registry
+    agent_started = time.perf_counter()
+    app.state.market_agent = get_agent()
+    logger.info(
+        "market_agent_ready",
+        extra={"build_ms": round((time.perf_counter() - agent_started) * 1000.0, 2)},
+    )
+    rulesets_stop_event = asyncio.Event()
+    rulesets_task: asyncio.Task | None = None
+    if settings.RULESETS_DB_ENABLED:
+        rulesets_task = asyncio.create_task(get_ruleset_service().run_reloader(rulesets_stop_event))
     scheduler_stop_event: asyncio.Event | None = None
     scheduler_task: asyncio.Task | None = None
     if settings.monitor_scheduler_should_run:
@@ -52,6 +73,17 @@ async def lifespan(app: FastAPI):
             await asyncio.wait_for(scheduler_task, timeout=5)
         except Exception:
             scheduler_task.cancel()
+    if rulesets_task:
+        rulesets_stop_event.set()
+        try:
+            await asyncio.wait_for(rulesets_task, timeout=5)
+        except Exception:
+            rulesets_task.cancel()
+    await get_batch_research_service().close()
+    await get_research_cache().close()
+    reset_agent()
+    await close_registry()
+    await close_cache()
     logger.info("ultron_shutdown")
 
 
@@ -108,6 +140,23 @@ async def trace_id_middleware(request: Request, call_next):
         )
 
 
+@app.middleware("http")
+async def request_memo_middleware(request: Request, call_next):
+    # chamadas de conector, normalizações e pesquisas repetidas no mesmo request
+    # são reaproveitadas (caching/request_memo)
+    with request_memo_scope() as memo:
+        response = await call_next(request)
+        if memo.avoided:
+            response.headers["X-Request-Memo-Avoided"] = str(memo.avoided)
+            logger.info(
+                "request_memo trace_id=%s path=%s report=%s",
+                _trace_id_from_request(request),
+                request.url.path,
+                memo.report(),
+            )
+        return response
+
+
 @app.exception_handler(RequestValidationError)
 async def request_validation_error_handler(request: Request, exc: RequestValidationError):
     return JSONResponse(
@@ -140,6 +189,21 @@ async def http_exception_handler(request: Request, exc: HTTPException):
     return JSONResponse(status_code=exc.status_code, content=payload)
 
 
+@app.exception_handler(CircuitOpenError)
+async def circuit_open_handler(request: Request, exc: CircuitOpenError):
+    retry_after = max(int(exc.retry_after + 0.999), 1)
+    return JSONResponse(
+        status_code=503,
+        headers={"Retry-After": str(retry_after)},
+        content=error_payload(
+            error_code="upstream_unavailable",
+            message="Marketplace temporarily unavailable.",
+            detail={"host": exc.host, "retry_after_seconds": retry_after},
+            trace_id=_trace_id_from_request(request),
+        ),
+    )
+
+
 @app.exception_handler(Exception)
 async def unhandled_exception_handler(request: Request, exc: Exception):
     logger.exception("unhandled_exception", extra={"error": str(exc)})
@@ -171,6 +235,34 @@ async def health(cfg=Depends(get_settings)):
     }
 
 
+@app.get("/health/connectors")
+async def health_connectors():
+    return connector_metrics()
+
+
+@app.get("/health/cache")
+async def health_cache():
+    return get_cache().stats()
+
+
+@app.get("/health/rulesets")
+async def health_rulesets():
+    return get_ruleset_service().metrics()
+
+
+@app.get("/health/research-cache")
+async def health_research_cache():
+    return get_research_cache().metrics()
+
+
+@app.get("/health/scoring")
+async def health_scoring():
+    return {
+        "score_memo": get_score_memo().metrics(),
+        "category_attributes": get_category_attribute_store().metrics(),
+    }
+
+
 # Legacy routes compatibility
 @app.post("/search")
 async def legacy_search(req: AnalyzeRequest, ctx: RequestContext = Depends(require_auth_context)):
@@ -268,6 +360,9 @@ async def legacy_create_listing(req: Dict[str, Any], ctx: RequestContext = Depen
 
     connector = get_connector(marketplace)
     title_validation = connector.validate_title(title)
+    category_id = str(product_data.get("category_id") or "")
+    # aquece o índice de atributos da categoria (rede só na primeira vez)
+    category_index = await get_category_attribute_store().get(connector, category_id)
 
     mandatory_validation: dict[str, Any]
     if marketplace_key == "mercado_livre":
@@ -276,7 +371,7 @@ async def legacy_create_listing(req: Dict[str, Any], ctx: RequestContext = Depen
             {
                 "title": title,
                 "attributes": attributes,
-                "category_id": product_data.get("category_id", ""),
+                "category_id": category_id,
             }
         )
         missing = [issue for issue in listing_validation.get("issues", []) if "Missing mandatory attribute" in issue]
@@ -286,7 +381,10 @@ async def legacy_create_listing(req: Dict[str, Any], ctx: RequestContext = Depen
             "issues": listing_validation.get("issues", []),
         }
     else:
-        required = ["cor", "material", "largura_cm", "altura_cm"]
+        if category_index is not None and category_index.required:
+            required = sorted(category_index.required)
+        else:
+            required = list(get_ruleset_service().get(marketplace_key, category_id).attributes_required)
         missing = [attr for attr in required if not attributes.get(attr)]
         mandatory_validation = {"valid": len(missing) == 0, "missing": missing}
 
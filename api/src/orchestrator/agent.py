@@ -6,6 +6,7 @@ Coordena todo o fluxo:
 
 Fluxos disponíveis:
   1. research_market()    → Pesquisa de mercado completa
+     research_markets()   → Mesma pesquisa em vários marketplaces, com visão combinada
   2. audit_listing()      → Auditoria de anúncio existente
   3. create_listing()     → Gerar anúncio do zero
   4. compare_listings()   → Comparar dois anúncios
@@ -13,17 +14,22 @@ Fluxos disponíveis:
 from __future__ import annotations
 
 import asyncio
+import time
+from contextlib import aclosing
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Optional, TypeVar
 import structlog
 
+from api.src.caching.request_memo import memoize
 from api.src.config import get_settings
 from api.src.connectors.base import BaseConnector
-from api.src.connectors.mercado_livre import MercadoLivreConnector
-from api.src.connectors.magalu import MagaluConnector
+from api.src.connectors.registry import get_shared_connectors
 from api.src.pipeline.pipeline import DataPipeline
+from api.src.scoring.memo import get_score_memo, listing_fingerprint, score_key
 from api.src.scoring.seo import SEOScorer
 from api.src.scoring.conversion import ConversionScorer, CompetitivenessScorer
+from api.src.services.category_attributes import get_category_attribute_store
+from api.src.services.research_cache import get_research_cache
 from api.src.functions.generator import (
     generate_titles,
     generate_bullets,
@@ -36,31 +42,64 @@ from api.src.types.listing import (
     ListingNormalized,
     Marketplace,
     MarketResearchResult,
+    MultiMarketResearchResult,
 )
 
 log = structlog.get_logger()
 settings = get_settings()
 
+T = TypeVar("T")
+
 
 def _get_connectors() -> dict[str, BaseConnector]:
-    connectors: dict[str, BaseConnector] = {
-        "mercado_livre": MercadoLivreConnector(),
-        "magalu": MagaluConnector(),
-    }
-    return connectors
+    return get_shared_connectors()
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 2)
+
+
+async def _timed(timings: dict[str, float], stage: str, awaitable: Awaitable[T]) -> T:
+    """Aguarda uma etapa e registra a duração em `timings[stage]` (ms)."""
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = _elapsed_ms(started)
+
+
+def _score_cache_status(*hits: bool) -> str:
+    if all(hits):
+        return "hit"
+    return "partial" if any(hits) else "miss"
 
 
 class MarketAgent:
     """
-    Agente principal. Instância única por request (stateless por design).
+    Agente principal. Uma instância por processo (services.marketplace.get_agent).
+
+    Pode atender requests e tasks concorrentes: nenhum método grava estado
+    em `self`. O que é do request chega pelos argumentos ou pelo memo do
+    request (ContextVar). Os colaboradores compartilhados são imutáveis
+    depois de construídos (pipeline, scorers) ou se protegem sozinhos
+    (score memo com lock, cache de pesquisas e conectores no event loop).
     """
 
     def __init__(self, connectors: Optional[dict[str, BaseConnector]] = None):
-        self.connectors = connectors or _get_connectors()
+        self._connectors = connectors
         self.pipeline = DataPipeline()
         self.seo_scorer = SEOScorer()
         self.conv_scorer = ConversionScorer()
         self.comp_scorer = CompetitivenessScorer()
+        self.score_memo = get_score_memo()
+        self.research_cache = get_research_cache()
+        self.category_attributes = get_category_attribute_store()
+
+    @property
+    def connectors(self) -> dict[str, BaseConnector]:
+        # sem conectores injetados, lê do registry a cada uso: o registry
+        # recria os conectores quando o event loop muda
+        return self._connectors or _get_connectors()
 
     # ── 1. Pesquisa de Mercado ────────────────────────────────
 
@@ -69,41 +108,61 @@ class MarketAgent:
         keyword: str,
         marketplace: str = "mercado_livre",
         limit: int = 50,
+        category_id: Optional[str] = None,
     ) -> MarketResearchResult:
         """
         Coleta top anúncios → normaliza → agrega métricas → retorna resultado.
+        Repetida no mesmo request HTTP (mesma keyword e limite), reaproveita a
+        primeira; entre requests passa pelo cache de pesquisas.
         """
+        return await memoize(
+            "research",
+            (marketplace, keyword, limit, category_id),
+            lambda: self._cached_research(keyword, marketplace, limit, category_id),
+        )
+
+    async def _cached_research(
+        self,
+        keyword: str,
+        marketplace: str,
+        limit: int,
+        category_id: Optional[str],
+    ) -> MarketResearchResult:
+        if not settings.RESEARCH_CACHE_ENABLED:
+            return await self._collect_market(keyword, marketplace, limit, category_id)
+        return await self.research_cache.get_or_fetch(
+            keyword,
+            marketplace,
+            limit,
+            lambda n: self._collect_market(keyword, marketplace, n, category_id),
+            category_id=category_id,
+        )
+
+    async def _collect_market(
+        self,
+        keyword: str,
+        marketplace: str,
+        limit: int,
+        category_id: Optional[str] = None,
+    ) -> MarketResearchResult:
         connector = self._get_connector(marketplace)
         mp_enum = Marketplace(marketplace)
 
         log.info("research_start", keyword=keyword, marketplace=marketplace)
 
-        # Coleta e normalização via conector
-        listings: list[ListingNormalized] = await connector.search_and_normalize(
-            query=keyword,
-            limit=limit,
-        )
-
-        if not listings:
-            log.warning("no_listings_found", keyword=keyword)
-            return MarketResearchResult(
+        # Coleta (páginas pré-buscadas em paralelo) → dedup + enrich + aggregate
+        # item a item, enquanto as próximas páginas ainda estão chegando
+        async with aclosing(connector.iter_search_and_normalize(query=keyword, category_id=category_id, limit=limit)) as stream:
+            result = await self.pipeline.run_stream(
+                stream,
                 keyword=keyword,
                 marketplace=mp_enum,
-                total_collected=0,
-                listings=[],
-                price_range={"min": 0, "max": 0, "avg": 0, "median": 0},
-                top_seo_terms=[],
-                competitor_summary={},
-                gaps=[],
+                save=False,  # sem Supabase por enquanto
             )
 
-        # Pipeline: dedup + enrich + aggregate
-        result = await self.pipeline.run(
-            raw_listings=listings,
-            keyword=keyword,
-            marketplace=mp_enum,
-            save=False,  # sem Supabase por enquanto
-        )
+        if not result.total_collected:
+            log.warning("no_listings_found", keyword=keyword)
+            return result
 
         log.info(
             "research_done",
@@ -113,6 +172,32 @@ class MarketAgent:
         )
         return result
 
+    async def research_markets(
+        self,
+        keyword: str,
+        marketplaces: Optional[list[str]] = None,
+        limit: int = 50,
+    ) -> MultiMarketResearchResult:
+        """
+        Mesma keyword em vários marketplaces (padrão: todos os conectores).
+        As coletas correm em paralelo e alimentam um único pipeline, então a
+        latência é a do marketplace mais lento, não a soma.
+        """
+        names = list(dict.fromkeys(marketplaces or self.connectors))
+        streams = {
+            Marketplace(name): self._get_connector(name).iter_search_and_normalize(query=keyword, limit=limit)
+            for name in names
+        }
+        log.info("multi_research_start", keyword=keyword, marketplaces=names)
+        result = await self.pipeline.run_merged_stream(streams, keyword)
+        log.info(
+            "multi_research_done",
+            keyword=keyword,
+            totals={name: r.total_collected for name, r in result.marketplaces.items()},
+            errors=list(result.errors),
+        )
+        return result
+
     # ── 2. Auditoria de Anúncio ───────────────────────────────
 
     async def audit_listing(
@@ -125,64 +210,113 @@ class MarketAgent:
         """
         Audita um anúncio vs top concorrentes.
         Pode receber o objeto pronto (my_listing) ou buscar pelo listing_id.
+
+        Etapas como grafo de dependências — o que não depende de nada roda junto:
+          anúncio (detalhes + normalize → atributos da categoria) ─┐
+          pesquisa de mercado ─────────────────────────────────────┴→ scores ─┬→ títulos (IA)
+                                                                              └→ recomendações (IA)
+        Com `keyword` a pesquisa não espera o anúncio; sem ela, a keyword sai
+        do título. Os tempos de cada etapa vão em `metadata["stages_ms"]`.
         """
         connector = self._get_connector(marketplace)
         mp_enum = Marketplace(marketplace)
-
-        # Busca anúncio se não fornecido
-        if my_listing is None:
-            raw = await connector.get_listing_details(listing_id)
-            my_listing = await connector.normalize(raw)
-
-        kw = keyword or my_listing.title.split()[:4]
-        kw_str = keyword or " ".join(my_listing.title.split()[:4])
-
-        # Busca concorrentes
-        research = await self.research_market(kw_str, marketplace, limit=30)
-        competitors = research.listings[:20]
-        top_terms = [item["term"] for item in research.top_seo_terms[:15]]
-
-        # Scores
-        seo = self.seo_scorer.score(my_listing, competitors)
-        conv = self.conv_scorer.score(my_listing, competitors)
-        comp = self.comp_scorer.score(my_listing, competitors)
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+
+        async def load_listing() -> ListingNormalized:
+            listing = my_listing
+            if listing is None:
+                listing = await _timed(timings, "listing", connector.get_normalized_listing(listing_id))
+            if listing.category_id:
+                # índice de obrigatórios/recomendados usado pelo SEOScorer (lookup só em memória)
+                await _timed(
+                    timings,
+                    "category_attributes",
+                    self.category_attributes.get(connector, listing.category_id),
+                )
+            return listing
+
+        def research(kw: str):
+            return _timed(timings, "research", self.research_market(kw, marketplace, limit=30))
+
+        if keyword:
+            my_listing, research_result = await asyncio.gather(load_listing(), research(keyword))
+            kw_str = keyword
+        else:
+            my_listing = await load_listing()
+            kw_str = " ".join(my_listing.title.split()[:4])
+            research_result = await research(kw_str)
+
+        competitors = research_result.listings[:20]
+        top_terms = [item["term"] for item in research_result.top_seo_terms[:15]]
+
+        # Scores — estatísticas dos concorrentes calculadas uma vez para os três scorers.
+        # Anúncio e mercado inalterados → mesma chave → resultado do memo. Só os
+        # scores são memorizados: títulos e recomendações da IA são gerados a cada
+        # auditoria (uma resposta ruim do modelo não fica presa por horas).
+        scoring_started = time.perf_counter()
+        context = self.pipeline.aggregator.market_context(competitors)
+        fingerprint = listing_fingerprint(my_listing)
+        key = score_key(fingerprint, context, self.seo_scorer.rules_token(my_listing))
+
+        seo, seo_hit = self.score_memo.get_or_compute(
+            "seo", key, lambda: self.seo_scorer.score(my_listing, context=context)
+        )
+        conv, conv_hit = self.score_memo.get_or_compute(
+            "conversion", key, lambda: self.conv_scorer.score(my_listing, context=context)
+        )
+        comp, comp_hit = self.score_memo.get_or_compute(
+            "competitiveness", key, lambda: self.comp_scorer.score(my_listing, context=context)
+        )
+        timings["scoring"] = _elapsed_ms(scoring_started)
 
         overall = round(seo.score * 0.35 + conv.score * 0.40 + comp.score * 0.25, 1)
 
-        # Geração de texto com IA
-        titles = await generate_titles(
-            keyword=kw_str,
-            marketplace=marketplace,
-            attributes=my_listing.attributes.model_dump(exclude_none=True),
-            top_terms=top_terms,
-        )
-
-        ai_recs = {}
-        if settings.check_ai_configured():
-            ai_recs = await generate_audit_recommendations(
+        # Geração de texto com IA — as duas chamadas só dependem dos scores
+        async def recommendations() -> dict:
+            if not settings.check_ai_configured():
+                return {}
+            return await _timed(timings, "recommendations", generate_audit_recommendations(
                 listing=my_listing,
                 competitors=competitors,
                 seo_score=seo.score,
                 conversion_score=conv.score,
                 top_seo_terms=top_terms,
-            )
+            ))
+
+        titles, ai_recs = await asyncio.gather(
+            _timed(timings, "titles", generate_titles(
+                keyword=kw_str,
+                marketplace=marketplace,
+                attributes=my_listing.attributes.model_dump(exclude_none=True),
+                top_terms=top_terms,
+            )),
+            recommendations(),
+        )
 
         top_actions = (
             [a["acao"] for a in ai_recs.get("acoes", [])[:10]]
             if ai_recs
             else seo.suggestions[:5] + conv.suggestions[:3] + comp.suggestions[:2]
         )
+        timings["total"] = _elapsed_ms(started)
 
-        return ListingAuditResult(
+        result = ListingAuditResult(
             listing_id=listing_id,
             marketplace=mp_enum,
-            seo_score=seo,
+            seo_score=seo.to_schema(),
             conversion_score=conv,
             competitiveness_score=comp,
             overall_score=overall,
             top_actions=top_actions,
             generated_titles=titles,
+            metadata={
+                "score_cache": _score_cache_status(seo_hit, conv_hit, comp_hit),
+                "fingerprint": fingerprint,
+                "stages_ms": timings,
+            },
         )
+        return result
 
     # ── 3. Criar Anúncio do Zero ──────────────────────────────
 
@@ -233,12 +367,10 @@ class MarketAgent:
     ) -> dict:
         connector = self._get_connector(marketplace)
 
-        raw_a, raw_b = await asyncio.gather(
-            connector.get_listing_details(listing_id_a),
-            connector.get_listing_details(listing_id_b),
+        listing_a, listing_b = await asyncio.gather(
+            connector.get_normalized_listing(listing_id_a),
+            connector.get_normalized_listing(listing_id_b),
         )
-        listing_a = await connector.normalize(raw_a)
-        listing_b = await connector.normalize(raw_b)
 
         seo_a = self.seo_scorer.score(listing_a)
         seo_b = self.seo_scorer.score(listing_b)
@@ -0,0 +1,184 @@
+"""
+pipeline/near_duplicates.py — anúncios quase duplicados (MinHash + LSH).
+
+Sellers clonam anúncios mudando pouco o título ("Sofá Retrátil 3 Lugares
+Cinza" / "Sofa Retratil 3 Lugares - Cinza!"). Para pegá-los sem comparar
+todos contra todos:
+
+  1. título → texto sem acento → shingles de 3 caracteres;
+  2. assinatura MinHash de uma permutação só (one-permutation hashing): cada
+     shingle é hasheado uma vez e cai num dos `num_perm` bins, que guardam o
+     mínimo; bins vazios copiam um bin cheio sorteado por uma sequência fixa
+     de sondagem própria de cada bin ("optimal densification"). Custa
+     O(shingles) por título em vez de O(shingles × num_perm);
+  3. índice LSH: a assinatura é cortada em `bands` faixas de `rows` valores;
+     só anúncios que coincidem em pelo menos uma faixa viram candidatos;
+  4. candidato confirmado por Jaccard exato dos shingles ≥ threshold, com os
+     mesmos tokens numéricos (3 vs 2 lugares, 110v vs 220v são produtos
+     diferentes) e, opcionalmente, preços próximos.
+
+O detector é incremental: `match_or_add` compara o anúncio com os
+representantes já vistos; se casar, devolve o cluster deles, senão o anúncio
+vira representante de um cluster novo.
+"""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass, field
+from typing import Optional
+
+from api.src.types.listing import ListingNormalized
+from api.src.utils.text import normalize_text
+
+_HASH_MASK = (1 << 64) - 1
+_EMPTY = -1
+
+
+def _shingles(text: str, size: int) -> frozenset[str]:
+    normalized = normalize_text(text)
+    if not normalized:
+        return frozenset()
+    padded = f" {normalized} "
+    if len(padded) <= size:
+        return frozenset([padded])
+    return frozenset(padded[i:i + size] for i in range(len(padded) - size + 1))
+
+
+def _numeric_tokens(text: str) -> frozenset[str]:
+    return frozenset(tok for tok in normalize_text(text).split() if any(ch.isdigit() for ch in tok))
+
+
+def _lsh_params(threshold: float, num_perm: int) -> tuple[int, int]:
+    """
+    (bands, rows) cujo ponto de corte (1/b)^(1/r) fica um pouco abaixo do
+    threshold: preferimos candidatos a mais (a confirmação é exata) a perder
+    duplicatas.
+    """
+    target = threshold * 0.85
+    best = (1, num_perm)
+    best_err = float("inf")
+    for rows in range(1, num_perm + 1):
+        bands = num_perm // rows
+        err = abs((1 / bands) ** (1 / rows) - target)
+        if err < best_err:
+            best, best_err = (bands, rows), err
+    return best
+
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class MinHasher:
+    """
+    MinHash por one-permutation hashing com densificação.
+    `hash()` de str é estável dentro do processo, que é o escopo do índice.
+    """
+
+    def __init__(self, num_perm: int = 64, seed: int = 1):
+        self.num_perm = num_perm
+        self.seed = seed
+        rng = random.Random(seed)
+        # sequência de sondagem de cada bin: mesma para todos os títulos, então
+        # dois títulos com o mesmo bin vazio copiam do mesmo lugar
+        self._probes = [rng.sample([j for j in range(num_perm) if j != i], num_perm - 1) for i in range(num_perm)]
+
+    def signature(self, shingles: frozenset[str]) -> tuple[int, ...]:
+        k = self.num_perm
+        bins = [_EMPTY] * k
+        for shingle in shingles:
+            h = hash((self.seed, shingle)) & _HASH_MASK
+            index, value = h % k, h // k
+            current = bins[index]
+            if current == _EMPTY or value < current:
+                bins[index] = value
+        if not shingles:
+            return tuple(bins)
+        dense = list(bins)
+        for i in range(k):
+            if bins[i] == _EMPTY:
+                for j in self._probes[i]:
+                    if bins[j] != _EMPTY:
+                        dense[i] = bins[j]
+                        break
+        return tuple(dense)
+
+
+@dataclass
+class _Representative:
+    cluster_id: int
+    shingles: frozenset[str]
+    numbers: frozenset[str]
+    price: float
+
+
+class NearDuplicateDetector:
+    def __init__(
+        self,
+        threshold: float = 0.8,
+        price_tolerance: Optional[float] = None,
+        num_perm: int = 64,
+        shingle_size: int = 3,
+        seed: int = 1,
+    ):
+        if not 0 < threshold <= 1:
+            raise ValueError("threshold deve estar em (0, 1]")
+        self.threshold = threshold
+        self.price_tolerance = price_tolerance
+        self.shingle_size = shingle_size
+        self._hasher = MinHasher(num_perm=num_perm, seed=seed)
+        self.bands, self.rows = _lsh_params(threshold, num_perm)
+        self._buckets: list[dict[tuple[int, ...], list[int]]] = [{} for _ in range(self.bands)]
+        self._reps: list[_Representative] = []
+        # métricas
+        self.candidates_checked = 0
+
+    def _prices_close(self, a: float, b: float) -> bool:
+        if self.price_tolerance is None or a <= 0 or b <= 0:
+            return True
+        return abs(a - b) / max(a, b) <= self.price_tolerance
+
+    def match_or_add(self, title: str, price: float, cluster_id: int) -> Optional[int]:
+        """
+        Cluster do representante quase igual a `title`, ou None — nesse caso
+        o título passa a representar `cluster_id`.
+        """
+        shingles = _shingles(title, self.shingle_size)
+        numbers = _numeric_tokens(title)
+        signature = self._hasher.signature(shingles)
+        band_keys = [
+            signature[i * self.rows:(i + 1) * self.rows] for i in range(self.bands)
+        ]
+
+        checked: set[int] = set()
+        for band, key in zip(self._buckets, band_keys):
+            for rep_index in band.get(key, ()):
+                if rep_index in checked:
+                    continue
+                checked.add(rep_index)
+                rep = self._reps[rep_index]
+                if rep.numbers != numbers or not self._prices_close(rep.price, price):
+                    continue
+                if jaccard(rep.shingles, shingles) >= self.threshold:
+                    self.candidates_checked += len(checked)
+                    return rep.cluster_id
+        self.candidates_checked += len(checked)
+
+        rep_index = len(self._reps)
+        self._reps.append(_Representative(cluster_id, shingles, numbers, price))
+        for band, key in zip(self._buckets, band_keys):
+            band.setdefault(key, []).append(rep_index)
+        return None
+
+
+@dataclass
+class DedupResult:
+    representatives: list[ListingNormalized]
+    cluster_ids: list[int]                      # alinhado com a entrada
+    clusters: dict[int, list[str]] = field(default_factory=dict)   # cluster → listing_ids
+
+    @property
+    def removed(self) -> int:
+        return len(self.cluster_ids) - len(self.representatives)
@@ -5,55 +5,135 @@ Crie também: api/src/pipeline/__init__.py (arquivo vazio)
 
 Fluxo:
   list[ListingNormalized]
-    → Deduplicator   (remove duplicatas por marketplace+id)
+    → Deduplicator   (remove duplicatas por marketplace+id, título e quase-duplicatas)
     → Enricher       (expande seo_terms, corrige final_price)
-    → MarketAggregator (métricas: price_range, top_terms, gaps)
+    → MarketAggregator (métricas: price_range, top_terms, gaps — sobre ListingBatch)
     → (SupabaseStorage — opcional, ativado via save=True)
+
+`DataPipeline.run_stream` faz o mesmo sobre um async iterator: cada anúncio
+é deduplicado e enriquecido ao chegar, e as métricas são mantidas por um
+MarketAccumulator (api/src/pipeline/streaming.py). `run_merged_stream`
+consome vários marketplaces de uma vez e monta também a visão combinada.
 """
 from __future__ import annotations
 
 from collections import Counter
+from contextlib import aclosing
 from datetime import datetime
-from typing import Optional
+from typing import AsyncIterable, AsyncIterator, Optional, Union
 
+import numpy as np
 import structlog
 
+from api.src.config import get_settings
+from api.src.pipeline.near_duplicates import DedupResult, NearDuplicateDetector
+from api.src.pipeline.streaming import MarketAccumulator, merge_streams
+from api.src.scoring.context import MarketContext
+from api.src.types.batch import BADGE_FRETE_GRATIS, BADGE_FULL, BADGE_PATROCINADO, ListingBatch
 from api.src.types.listing import (
     ListingNormalized,
     Marketplace,
     MarketResearchResult,
+    MergedMarketView,
+    MultiMarketResearchResult,
 )
 
 log = structlog.get_logger()
+settings = get_settings()
+
+# gaps entre marketplaces: "pouca oferta" = menos de 5 onde outro tem 20+
+_CROSS_FEW_LISTINGS = 5
+_CROSS_MANY_LISTINGS = 20
 
 
 # ── 1. Deduplicador ───────────────────────────────────────────
 
 class Deduplicator:
+    """
+    `run` deduplica uma lista inteira; `accept` decide item a item (stream),
+    lembrando o que já passou nesta instância.
+
+    Três níveis: mesmo marketplace+id, mesmo título normalizado e — com
+    DEDUP_NEAR_DUPLICATES_ENABLED — título quase igual (MinHash/LSH, ver
+    near_duplicates.py). Cada item recebe um cluster; o primeiro de cada
+    cluster é o representante que sobrevive.
+    """
+
+    def __init__(
+        self,
+        near_duplicates: Optional[bool] = None,
+        similarity_threshold: Optional[float] = None,
+        price_tolerance: Optional[float] = None,
+    ) -> None:
+        self._seen: dict[str, int] = {}
+        self._seen_title_keys: dict[str, int] = {}
+        self._clusters: dict[int, list[str]] = {}
+        self.last_cluster_id: Optional[int] = None
+
+        if near_duplicates is None:
+            near_duplicates = settings.DEDUP_NEAR_DUPLICATES_ENABLED
+        if price_tolerance is None:
+            price_tolerance = settings.DEDUP_PRICE_TOLERANCE
+        self._near: Optional[NearDuplicateDetector] = (
+            NearDuplicateDetector(
+                threshold=similarity_threshold or settings.DEDUP_SIMILARITY_THRESHOLD,
+                price_tolerance=price_tolerance or None,
+            )
+            if near_duplicates
+            else None
+        )
+
     @staticmethod
     def _title_key(title: str) -> str:
         return " ".join((title or "").lower().replace("-", " ").split())
 
+    def _cluster_of(self, key: str, title_key: str, item: ListingNormalized) -> Optional[int]:
+        if key in self._seen:
+            return self._seen[key]
+        if title_key and title_key in self._seen_title_keys:
+            return self._seen_title_keys[title_key]
+        if self._near is not None and title_key:
+            return self._near.match_or_add(item.title, item.price, cluster_id=len(self._clusters))
+        return None
+
+    def accept(self, item: ListingNormalized) -> bool:
+        key = f"{item.marketplace.value}:{item.listing_id}"
+        title_key = self._title_key(item.title)
+        cluster_id = self._cluster_of(key, title_key, item)
+        is_new = cluster_id is None
+        if is_new:
+            cluster_id = len(self._clusters)
+            self._clusters[cluster_id] = []
+        self._clusters[cluster_id].append(item.listing_id)
+        self._seen.setdefault(key, cluster_id)
+        if title_key:
+            self._seen_title_keys.setdefault(title_key, cluster_id)
+        self.last_cluster_id = cluster_id
+        return is_new
+
+    @property
+    def clusters(self) -> dict[int, list[str]]:
+        """cluster_id → listing_ids (representante primeiro)."""
+        return self._clusters
+
     @staticmethod
-    def run(listings: list[ListingNormalized]) -> list[ListingNormalized]:
-        seen: set[str] = set()
-        seen_title_keys: set[str] = set()
-        unique: list[ListingNormalized] = []
+    def cluster(listings: list[ListingNormalized], **options) -> DedupResult:
+        """Como `run`, mas devolvendo também o cluster de cada item de entrada."""
+        state = Deduplicator(**options)
+        representatives: list[ListingNormalized] = []
+        cluster_ids: list[int] = []
         for item in listings:
-            key = f"{item.marketplace.value}:{item.listing_id}"
-            title_key = Deduplicator._title_key(item.title)
-            if key in seen:
-                continue
-            if title_key and title_key in seen_title_keys:
-                continue
-            seen.add(key)
-            if title_key:
-                seen_title_keys.add(title_key)
-            unique.append(item)
-        removed = len(listings) - len(unique)
-        if removed:
-            log.info("dedup_removed", count=removed)
-        return unique
+            if state.accept(item):
+                representatives.append(item)
+            cluster_ids.append(state.last_cluster_id)
+        result = DedupResult(representatives, cluster_ids, state.clusters)
+        if result.removed:
+            log.info("dedup_removed", count=result.removed, clusters=len(result.clusters))
+        return result
+
+    @staticmethod
+    def run(listings: list[ListingNormalized], **options) -> list[ListingNormalized]:
+        return Deduplicator.cluster(listings, **options).representatives
 
 
 # ── 2. Enricher ───────────────────────────────────────────────
@@ -66,9 +146,9 @@ class Enricher:
     }
 
     def run(self, listings: list[ListingNormalized]) -> list[ListingNormalized]:
-        return [self._enrich(l) for l in listings]
+        return [self.enrich(l) for l in listings]
 
-    def _enrich(self, listing: ListingNormalized) -> ListingNormalized:
+    def enrich(self, listing: ListingNormalized) -> ListingNormalized:
         if len(listing.seo_terms) < 3:
             listing.seo_terms = self._extract_terms(listing)
         if listing.final_price_estimate == 0:
@@ -99,6 +179,10 @@ class Enricher:
 # ── 3. Aggregator ─────────────────────────────────────────────
 
 class MarketAggregator:
+    """
+    Métricas de mercado sobre um ListingBatch (colunar): preços, badges e
+    médias são reduções NumPy; só a contagem de seo_terms fica em Python.
+    """
 
     def aggregate(
         self,
@@ -106,79 +190,74 @@ class MarketAggregator:
         keyword: str,
         marketplace: Marketplace,
     ) -> MarketResearchResult:
-        prices = [l.price for l in listings if l.price > 0]
+        return self.aggregate_batch(ListingBatch.from_listings(listings), keyword, marketplace)
+
+    def aggregate_batch(
+        self,
+        batch: ListingBatch,
+        keyword: str,
+        marketplace: Marketplace,
+    ) -> MarketResearchResult:
+        prices = batch.positive_prices()
         price_range = {
-            "min": round(min(prices), 2) if prices else 0,
-            "max": round(max(prices), 2) if prices else 0,
-            "avg": round(sum(prices) / len(prices), 2) if prices else 0,
-            "median": self._median(prices),
+            "min": round(float(prices.min()), 2) if prices.size else 0,
+            "max": round(float(prices.max()), 2) if prices.size else 0,
+            "avg": round(float(prices.mean()), 2) if prices.size else 0,
+            "median": round(float(np.median(prices)), 2) if prices.size else 0,
         }
 
-        all_terms: list[str] = []
-        for l in listings:
-            all_terms.extend(l.seo_terms)
         top_seo_terms = [
             {"term": t, "freq": f}
-            for t, f in Counter(all_terms).most_common(30)
+            for t, f in batch.term_counter().most_common(30)
         ]
 
         return MarketResearchResult(
             keyword=keyword,
             marketplace=marketplace,
-            total_collected=len(listings),
-            listings=listings,
+            total_collected=len(batch),
+            listings=batch.listings,
             price_range=price_range,
             top_seo_terms=top_seo_terms,
-            competitor_summary=self._competitor_summary(listings),
-            gaps=self._detect_gaps(listings, prices),
+            competitor_summary=self._competitor_summary(batch),
+            gaps=self._detect_gaps(batch, prices),
         )
 
     @staticmethod
-    def _median(values: list[float]) -> float:
-        if not values:
-            return 0
-        s = sorted(values)
-        n = len(s)
-        mid = n // 2
-        return round((s[mid - 1] + s[mid]) / 2 if n % 2 == 0 else s[mid], 2)
+    def market_context(
+        listings: Union[ListingBatch, list[ListingNormalized]],
+        top_n: Optional[int] = None,
+    ) -> MarketContext:
+        """Contexto dos scorers para os `top_n` primeiros anúncios do mercado."""
+        batch = ListingBatch.from_listings(listings)
+        if top_n is not None:
+            batch = batch.head(top_n)
+        return MarketContext.from_listings(batch)
 
     @staticmethod
-    def _competitor_summary(listings: list[ListingNormalized]) -> dict:
-        total = len(listings)
+    def _competitor_summary(batch: ListingBatch) -> dict:
+        total = len(batch)
         if total == 0:
             return {}
         return {
             "total_analyzed": total,
-            "frete_gratis_pct": round(
-                sum(1 for l in listings if l.badges.frete_gratis) / total * 100, 1
-            ),
-            "full_pct": round(
-                sum(1 for l in listings if l.badges.full) / total * 100, 1
-            ),
-            "ads_pct": round(
-                sum(1 for l in listings if l.badges.anuncio_patrocinado) / total * 100, 1
-            ),
-            "avg_media_count": round(
-                sum(l.media_count for l in listings) / total, 1
-            ),
-            "avg_reviews": round(
-                sum(l.social_proof.avaliacoes_total for l in listings) / total, 1
-            ),
-            "avg_rating": round(
-                sum(l.social_proof.nota_media for l in listings) / total, 2
-            ),
+            "frete_gratis_pct": round(batch.badge_count(BADGE_FRETE_GRATIS) / total * 100, 1),
+            "full_pct": round(batch.badge_count(BADGE_FULL) / total * 100, 1),
+            "ads_pct": round(batch.badge_count(BADGE_PATROCINADO) / total * 100, 1),
+            "avg_media_count": round(float(batch.media_count.mean()), 1),
+            "avg_reviews": round(float(batch.reviews.mean()), 1),
+            "avg_rating": round(float(batch.rating.mean()), 2),
         }
 
     @staticmethod
-    def _detect_gaps(listings: list[ListingNormalized], prices: list[float]) -> list[dict]:
-        if not prices:
+    def _detect_gaps(batch: ListingBatch, prices: np.ndarray) -> list[dict]:
+        if not prices.size:
             return []
         gaps = []
-        avg = sum(prices) / len(prices)
-        total = len(listings)
+        avg = float(prices.mean())
+        total = len(batch)
 
-        cheap = [l for l in listings if l.price < avg * 0.7]
-        if len(cheap) < 3:
+        cheap = int(np.count_nonzero(batch.price < avg * 0.7))
+        if cheap < 3:
             gaps.append({
                 "type": "price_gap",
                 "label": "Segmento econômico pouco explorado",
@@ -186,7 +265,7 @@ class MarketAggregator:
                 "opportunity": "Versão econômica pode capturar demanda reprimida.",
             })
 
-        if sum(1 for l in listings if not l.badges.frete_gratis) > total * 0.6:
+        if total - batch.badge_count(BADGE_FRETE_GRATIS) > total * 0.6:
             gaps.append({
                 "type": "shipping_gap",
                 "label": "Maioria cobra frete",
@@ -194,7 +273,7 @@ class MarketAggregator:
                 "opportunity": "Frete grátis pode ser diferencial decisivo de conversão.",
             })
 
-        if sum(1 for l in listings if l.media_count < 5) > total * 0.5:
+        if int(np.count_nonzero(batch.media_count < 5)) > total * 0.5:
             gaps.append({
                 "type": "content_gap",
                 "label": "Anúncios com poucas fotos",
@@ -204,6 +283,95 @@ class MarketAggregator:
 
         return gaps
 
+    @classmethod
+    def merged_view(
+        cls,
+        merged: MarketAccumulator,
+        results: dict[str, MarketResearchResult],
+        failed: Optional[set[str]] = None,
+    ) -> MergedMarketView:
+        """Agregados combinados + termos comuns + gaps entre marketplaces."""
+        snapshot = merged.snapshot()
+        active = {name: r for name, r in results.items() if r.total_collected}
+        shared: list[str] = []
+        if len(active) > 1:
+            common = set.intersection(*({t["term"] for t in r.top_seo_terms} for r in active.values()))
+            shared = [t["term"] for t in snapshot["top_seo_terms"] if t["term"] in common]
+        return MergedMarketView(
+            total_collected=snapshot["total_collected"],
+            price_range=snapshot["price_range"],
+            top_seo_terms=snapshot["top_seo_terms"],
+            shared_terms=shared,
+            competitor_summary=snapshot["competitor_summary"],
+            gaps=cls._cross_market_gaps(
+                {name: r for name, r in results.items() if name not in (failed or set())}
+            ),
+        )
+
+    @staticmethod
+    def _cross_market_gaps(results: dict[str, MarketResearchResult]) -> list[dict]:
+        gaps = []
+        if len(results) < 2:
+            return gaps
+
+        top_name, top = max(results.items(), key=lambda item: item[1].total_collected)
+        for name, r in results.items():
+            if r.total_collected < _CROSS_FEW_LISTINGS and top.total_collected >= _CROSS_MANY_LISTINGS:
+                gaps.append({
+                    "type": "cross_supply_gap",
+                    "label": f"Pouca oferta no {name}",
+                    "description": f"{r.total_collected} anúncios no {name} contra {top.total_collected} no {top_name}",
+                    "opportunity": f"Entrar no {name} enfrentando pouca concorrência direta.",
+                    "marketplace": name,
+                })
+
+        active = {name: r for name, r in results.items() if r.total_collected}
+        medians = {name: r.price_range.get("median") or 0 for name, r in active.items()}
+        medians = {name: m for name, m in medians.items() if m > 0}
+        if len(medians) > 1:
+            low_name = min(medians, key=medians.get)
+            high_name = max(medians, key=medians.get)
+            low, high = medians[low_name], medians[high_name]
+            if low <= high * 0.85:
+                gaps.append({
+                    "type": "cross_price_gap",
+                    "label": "Preço diferente entre marketplaces",
+                    "description": (
+                        f"Mediana R$ {low:.0f} no {low_name} vs R$ {high:.0f} no {high_name} "
+                        f"({(high / low - 1) * 100:.0f}% acima)"
+                    ),
+                    "opportunity": f"Margem maior no {high_name}; preço agressivo para disputar o {low_name}.",
+                    "marketplaces": [low_name, high_name],
+                })
+
+        shipping = {name: r.competitor_summary.get("frete_gratis_pct", 0.0) for name, r in active.items()}
+        if len(shipping) > 1:
+            most = max(shipping, key=shipping.get)
+            least = min(shipping, key=shipping.get)
+            if shipping[most] - shipping[least] >= 30:
+                gaps.append({
+                    "type": "cross_shipping_gap",
+                    "label": f"Frete grátis raro no {least}",
+                    "description": f"{shipping[least]:.0f}% com frete grátis no {least} vs {shipping[most]:.0f}% no {most}",
+                    "opportunity": f"Frete grátis no {least} destaca o anúncio como já é padrão no {most}.",
+                    "marketplace": least,
+                })
+
+        top_terms = {name: [t["term"] for t in r.top_seo_terms] for name, r in active.items()}
+        for name, terms in top_terms.items():
+            elsewhere = set().union(*(set(t) for other, t in top_terms.items() if other != name))
+            exclusive = [term for term in terms[:10] if term not in elsewhere]
+            if exclusive:
+                gaps.append({
+                    "type": "cross_terms_gap",
+                    "label": f"Termos fortes só no {name}",
+                    "description": f"Frequentes no {name} e ausentes do top dos outros: {', '.join(exclusive[:5])}",
+                    "opportunity": "Testar esses termos nos títulos dos outros marketplaces.",
+                    "marketplace": name,
+                    "terms": exclusive[:5],
+                })
+        return gaps
+
 
 # ── 4. Storage Supabase ───────────────────────────────────────
 
@@ -265,7 +433,6 @@ class DataPipeline:
     """
 
     def __init__(self, storage: Optional[SupabaseStorage] = None):
-        self.dedup = Deduplicator()
         self.enricher = Enricher()
         self.aggregator = MarketAggregator()
         self.storage = storage
@@ -277,9 +444,76 @@ class DataPipeline:
         marketplace: Marketplace,
         save: bool = False,
     ) -> MarketResearchResult:
-        unique = self.dedup.run(raw_listings)
+        unique = Deduplicator.run(raw_listings)   # estado de dedup é por execução
         enriched = self.enricher.run(unique)
         result = self.aggregator.aggregate(enriched, keyword, marketplace)
         if save and self.storage:
             await self.storage.upsert_listings(enriched)
         return result
+
+    async def run_stream(
+        self,
+        listings: AsyncIterable[ListingNormalized],
+        keyword: str,
+        marketplace: Marketplace,
+        save: bool = False,
+        accumulator: Optional[MarketAccumulator] = None,
+    ) -> MarketResearchResult:
+        """
+        Versão streaming de `run`. Passe um `accumulator` próprio para ler
+        agregados parciais (`accumulator.snapshot()`) enquanto o stream corre.
+        """
+        acc = accumulator if accumulator is not None else MarketAccumulator()
+        dedup = Deduplicator()
+        received = 0
+        async for item in listings:
+            received += 1
+            if dedup.accept(item):
+                acc.add(self.enricher.enrich(item))
+        if received > acc.total:
+            log.info("dedup_removed", count=received - acc.total)
+        result = acc.result(keyword, marketplace)
+        if save and self.storage:
+            await self.storage.upsert_listings(result.listings)
+        return result
+
+    async def run_merged_stream(
+        self,
+        streams: dict[Marketplace, AsyncIterator[ListingNormalized]],
+        keyword: str,
+    ) -> MultiMarketResearchResult:
+        """
+        Vários marketplaces num único consumidor: cada anúncio é deduplicado
+        dentro do seu marketplace, enriquecido e somado ao acumulador dele e
+        ao combinado, na ordem em que chega. Um marketplace que falha vira
+        entrada em `errors`; os demais seguem.
+        """
+        accumulators = {mp: MarketAccumulator() for mp in streams}
+        dedups = {mp: Deduplicator() for mp in streams}
+        merged = MarketAccumulator()
+        errors: dict[str, str] = {}
+
+        async def guarded(mp: Marketplace, stream: AsyncIterator[ListingNormalized]):
+            try:
+                async with aclosing(stream) as items:
+                    async for item in items:
+                        yield item
+            except Exception as exc:
+                errors[mp.value] = f"{type(exc).__name__}: {exc}"
+                log.warning("market_stream_failed", marketplace=mp.value, error=str(exc))
+
+        tagged = merge_streams({mp: guarded(mp, stream) for mp, stream in streams.items()})
+        async with aclosing(tagged) as items:
+            async for mp, item in items:
+                if dedups[mp].accept(item):
+                    item = self.enricher.enrich(item)
+                    accumulators[mp].add(item)
+                    merged.add(item)
+
+        results = {mp.value: acc.result(keyword, mp) for mp, acc in accumulators.items()}
+        return MultiMarketResearchResult(
+            keyword=keyword,
+            marketplaces=results,
+            merged=self.aggregator.merged_view(merged, results, failed=set(errors)),
+            errors=errors,
+        )
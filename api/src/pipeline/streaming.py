@@ -0,0 +1,239 @@
+"""
+pipeline/streaming.py — agregação incremental do mercado.
+
+`MarketAccumulator` recebe um anúncio por vez (já deduplicado/enriquecido)
+e mantém as métricas do `MarketAggregator` atualizadas a cada item:
+
+  - preço: min / max / média corrente;
+  - mediana exata com dois heaps (O(log n) por item);
+  - contadores de badges, mídia e prova social;
+  - Counter de seo_terms;
+  - os 3 menores preços, que bastam para o gap "segmento econômico".
+
+`snapshot()` lê os agregados parciais a qualquer momento; `result()` monta o
+MarketResearchResult final sem nenhuma passada extra sobre os anúncios.
+
+`merge_streams` intercala vários streams (ex.: um por marketplace) na ordem
+de chegada, para que um único consumidor alimente vários acumuladores.
+"""
+from __future__ import annotations
+
+import asyncio
+import heapq
+from collections import Counter
+from typing import AsyncIterable, AsyncIterator, Hashable, Optional, TypeVar
+
+from api.src.types.listing import (
+    ListingNormalized,
+    Marketplace,
+    MarketResearchResult,
+)
+
+_TOP_TERMS = 30
+_CHEAP_GAP_MIN_LISTINGS = 3
+
+K = TypeVar("K", bound=Hashable)
+T = TypeVar("T")
+_DONE = object()
+
+
+class _Failed:
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class StreamingMedian:
+    """Mediana exata por dois heaps: `_low` (max-heap, negado) e `_high`."""
+
+    def __init__(self) -> None:
+        self._low: list[float] = []
+        self._high: list[float] = []
+
+    def __len__(self) -> int:
+        return len(self._low) + len(self._high)
+
+    def add(self, value: float) -> None:
+        if self._low and value > -self._low[0]:
+            heapq.heappush(self._high, value)
+        else:
+            heapq.heappush(self._low, -value)
+        if len(self._low) > len(self._high) + 1:
+            heapq.heappush(self._high, -heapq.heappop(self._low))
+        elif len(self._high) > len(self._low):
+            heapq.heappush(self._low, -heapq.heappop(self._high))
+
+    def median(self) -> float:
+        if not self._low:
+            return 0
+        if len(self._low) > len(self._high):
+            return -self._low[0]
+        return (-self._low[0] + self._high[0]) / 2
+
+
+class MarketAccumulator:
+    def __init__(self) -> None:
+        self.listings: list[ListingNormalized] = []
+
+        # preços > 0
+        self._price_count = 0
+        self._price_sum = 0.0
+        self._price_min: Optional[float] = None
+        self._price_max: Optional[float] = None
+        self._median = StreamingMedian()
+        # 3 menores preços de todos os anúncios (max-heap negado)
+        self._cheapest: list[float] = []
+
+        self._frete_gratis = 0
+        self._full = 0
+        self._ads = 0
+        self._few_media = 0
+        self._media_sum = 0
+        self._reviews_sum = 0
+        self._rating_sum = 0.0
+        self._terms: Counter[str] = Counter()
+
+    @property
+    def total(self) -> int:
+        return len(self.listings)
+
+    def add(self, listing: ListingNormalized) -> None:
+        self.listings.append(listing)
+
+        price = listing.price
+        if price > 0:
+            self._price_count += 1
+            self._price_sum += price
+            self._price_min = price if self._price_min is None else min(self._price_min, price)
+            self._price_max = price if self._price_max is None else max(self._price_max, price)
+            self._median.add(price)
+        if len(self._cheapest) < _CHEAP_GAP_MIN_LISTINGS:
+            heapq.heappush(self._cheapest, -price)
+        elif price < -self._cheapest[0]:
+            heapq.heapreplace(self._cheapest, -price)
+
+        badges = listing.badges
+        self._frete_gratis += badges.frete_gratis
+        self._full += badges.full
+        self._ads += badges.anuncio_patrocinado
+        self._few_media += listing.media_count < 5
+        self._media_sum += listing.media_count
+        self._reviews_sum += listing.social_proof.avaliacoes_total
+        self._rating_sum += listing.social_proof.nota_media
+        self._terms.update(listing.seo_terms)
+
+    # ── Leitura ───────────────────────────────────────────────
+
+    def price_range(self) -> dict:
+        if not self._price_count:
+            return {"min": 0, "max": 0, "avg": 0, "median": 0}
+        return {
+            "min": round(self._price_min, 2),
+            "max": round(self._price_max, 2),
+            "avg": round(self._price_sum / self._price_count, 2),
+            "median": round(self._median.median(), 2),
+        }
+
+    def top_seo_terms(self) -> list[dict]:
+        return [{"term": t, "freq": f} for t, f in self._terms.most_common(_TOP_TERMS)]
+
+    def competitor_summary(self) -> dict:
+        total = self.total
+        if total == 0:
+            return {}
+        return {
+            "total_analyzed": total,
+            "frete_gratis_pct": round(self._frete_gratis / total * 100, 1),
+            "full_pct": round(self._full / total * 100, 1),
+            "ads_pct": round(self._ads / total * 100, 1),
+            "avg_media_count": round(self._media_sum / total, 1),
+            "avg_reviews": round(self._reviews_sum / total, 1),
+            "avg_rating": round(self._rating_sum / total, 2),
+        }
+
+    def gaps(self) -> list[dict]:
+        if not self._price_count:
+            return []
+        gaps = []
+        avg = self._price_sum / self._price_count
+        total = self.total
+
+        # "menos de 3 abaixo de avg*0.7" ⇔ o 3º menor preço não está abaixo
+        if len(self._cheapest) < _CHEAP_GAP_MIN_LISTINGS or -self._cheapest[0] >= avg * 0.7:
+            gaps.append({
+                "type": "price_gap",
+                "label": "Segmento econômico pouco explorado",
+                "description": f"Menos de 3 anúncios abaixo de R$ {avg*0.7:.0f}",
+                "opportunity": "Versão econômica pode capturar demanda reprimida.",
+            })
+
+        if total - self._frete_gratis > total * 0.6:
+            gaps.append({
+                "type": "shipping_gap",
+                "label": "Maioria cobra frete",
+                "description": f"Mais de 60% dos anúncios cobram frete",
+                "opportunity": "Frete grátis pode ser diferencial decisivo de conversão.",
+            })
+
+        if self._few_media > total * 0.5:
+            gaps.append({
+                "type": "content_gap",
+                "label": "Anúncios com poucas fotos",
+                "description": "Maioria tem < 5 imagens",
+                "opportunity": "Galeria completa (8+ fotos) se destaca visualmente.",
+            })
+
+        return gaps
+
+    def snapshot(self) -> dict:
+        """Agregados parciais (seguro de chamar no meio do stream)."""
+        return {
+            "total_collected": self.total,
+            "price_range": self.price_range(),
+            "top_seo_terms": self.top_seo_terms(),
+            "competitor_summary": self.competitor_summary(),
+            "gaps": self.gaps(),
+        }
+
+    def result(self, keyword: str, marketplace: Marketplace) -> MarketResearchResult:
+        return MarketResearchResult(
+            keyword=keyword,
+            marketplace=marketplace,
+            listings=list(self.listings),
+            **self.snapshot(),
+        )
+
+
+async def merge_streams(streams: dict[K, AsyncIterable[T]]) -> AsyncIterator[tuple[K, T]]:
+    """
+    (chave, item) de todos os streams, na ordem em que chegam. Cada stream é
+    consumido numa task própria; o primeiro erro cancela os demais e é
+    relançado. Fechar o gerador cedo cancela o que ainda estiver rodando.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def _pump(key: K, stream: AsyncIterable[T]) -> None:
+        try:
+            async for item in stream:
+                await queue.put((key, item))
+        except Exception as exc:
+            await queue.put((key, _Failed(exc)))
+            return
+        await queue.put((key, _DONE))
+
+    tasks = [asyncio.ensure_future(_pump(key, stream)) for key, stream in streams.items()]
+    pending = len(tasks)
+    try:
+        while pending:
+            key, item = await queue.get()
+            if item is _DONE:
+                pending -= 1
+            elif isinstance(item, _Failed):
+                raise item.error
+            else:
+                yield key, item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import httpx
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, Depends, HTTPException, Query
@@ -13,8 +12,14 @@ from api.src.functions import function_calls
 from api.src.orchestrator.agent import MarketAgent
 from api.src.reports.market_dashboard import generate_market_dashboard
 from api.src.routers.common import not_implemented
-from api.src.routers.schemas import AnalyzeRequest, CompetitorPricingRequest
+from api.src.routers.schemas import (
+    AnalyzeRequest,
+    BatchResearchRequest,
+    CompetitorPricingRequest,
+    MultiMarketAnalyzeRequest,
+)
 from api.src.services.alert_checker import check_and_fire_alerts
+from api.src.services.batch_research import get_batch_research_service
 from api.src.services.marketplace import get_agent, get_connector, marketplace_alias
 
 router = APIRouter(prefix="/api/market-research", tags=["market-research"])
@@ -68,19 +73,27 @@ async def competitor_pricing(
     ctx: RequestContext = Depends(require_auth_context),
 ):
     connector = get_connector(req.marketplace)
+    details = await connector.get_listings_details_bulk(req.product_ids, include_descriptions=False)
     items: List[Dict[str, Any]] = []
     prices: List[float] = []
-    for product_id in req.product_ids:
-        raw = await connector.get_listing_details(product_id)
-        normalized = await connector.normalize(raw)
+    normalized_ids = set()
+    for normalized in await connector.normalize_many(list(details.items.values())):
         data = normalized.model_dump() if hasattr(normalized, "model_dump") else normalized
         items.append(data)
+        normalized_ids.add(str(data.get("listing_id", "")).upper())
         if data.get("final_price_estimate"):
             prices.append(float(data["final_price_estimate"]))
     return {
         "workspace_id": ctx.workspace_id,
         "marketplace": marketplace_alias(req.marketplace),
         "items": items,
+        "not_found": details.missing,
+        # encontrados, mas a normalização falhou (normalize_many os descarta)
+        "failed": [
+            pid for pid, raw in details.items.items()
+            if pid.upper() not in normalized_ids and str(raw.get("id", "")).upper() not in normalized_ids
+        ],
+        "errors": details.error_messages(),
         "stats": {
             "min": min(prices) if prices else 0,
             "max": max(prices) if prices else 0,
@@ -113,24 +126,11 @@ async def my_listings(
     if not settings.ML_ACCESS_TOKEN:
         raise HTTPException(status_code=422, detail="ML_ACCESS_TOKEN not configured.")
 
-    headers = {"Authorization": f"Bearer {settings.ML_ACCESS_TOKEN}"}
-    async with httpx.AsyncClient(timeout=30.0) as client:
-        me_items = await client.get(
-            "https://api.mercadolibre.com/users/me/items/search",
-            params={"limit": limit, "offset": offset},
-            headers=headers,
-        )
-        me_items.raise_for_status()
-        data = me_items.json()
-        item_ids = data.get("results", [])
-
-    listings: list[dict] = []
-    for listing_id in item_ids:
-        try:
-            normalized = await function_calls.get_listing_detail("mercadolivre", listing_id)
-            listings.append(normalized)
-        except Exception:
-            continue
+    connector = get_connector(mp)
+    item_ids = await connector.search_my_item_ids(limit=limit, offset=offset)
+    details = await connector.get_listings_details_bulk(item_ids)
+    normalized = await connector.normalize_many(list(details.items.values()))
+    listings = [item.to_contract_payload() for item in normalized]
     return {"workspace_id": ctx.workspace_id, "items": listings, "count": len(listings)}
 
 
@@ -144,6 +144,7 @@ async def market_analyze(
         keyword=req.keyword,
         marketplace=marketplace_alias(req.marketplace),
         limit=req.limit,
+        category_id=req.category,
     )
     normalized = [item.to_contract_payload() for item in result.listings]
     dashboard = generate_market_dashboard(
@@ -166,6 +167,68 @@ async def market_analyze(
     }
 
 
+@router.post("/analyze-multi")
+async def market_analyze_multi(
+    req: MultiMarketAnalyzeRequest,
+    ctx: RequestContext = Depends(require_auth_context),
+    agent: MarketAgent = Depends(get_agent),
+):
+    result = await agent.research_markets(
+        keyword=req.keyword,
+        marketplaces=[marketplace_alias(m) for m in req.marketplaces],
+        limit=req.limit,
+    )
+    return {"workspace_id": ctx.workspace_id, "research": result.model_dump()}
+
+
+@router.post("/batch", status_code=202)
+async def market_research_batch(
+    req: BatchResearchRequest,
+    ctx: RequestContext = Depends(require_auth_context),
+    agent: MarketAgent = Depends(get_agent),
+):
+    if len(req.keywords) > settings.BATCH_RESEARCH_MAX_KEYWORDS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"At most {settings.BATCH_RESEARCH_MAX_KEYWORDS} keywords per batch.",
+        )
+    job = await get_batch_research_service().submit(
+        agent,
+        workspace_id=ctx.workspace_id,
+        keywords=req.keywords,
+        marketplace=marketplace_alias(req.marketplace),
+        limit=req.limit,
+        supabase_jwt=ctx.token,
+    )
+    return {
+        "workspace_id": ctx.workspace_id,
+        "job_id": job.id,
+        "status": job.status,
+        "progress": job.progress,
+    }
+
+
+@router.get("/batch/{job_id}")
+async def market_research_batch_status(
+    job_id: str,
+    include_results: bool = False,
+    ctx: RequestContext = Depends(require_auth_context),
+):
+    job = get_batch_research_service().get(job_id)
+    if job is not None and job.workspace_id == ctx.workspace_id:
+        return {"workspace_id": ctx.workspace_id, **job.to_dict(include_results=include_results)}
+    # outro worker/reinício: só o resumo persistido
+    stored = repository.get_job(workspace_id=ctx.workspace_id, job_id=job_id, supabase_jwt=ctx.token)
+    if not stored or stored.get("type") != "market_research_batch":
+        raise HTTPException(status_code=404, detail="Batch research job not found.")
+    return {
+        "workspace_id": ctx.workspace_id,
+        "job_id": job_id,
+        "status": stored.get("status"),
+        **(stored.get("result_summary") or {}),
+    }
+
+
 async def operations_sync_impl(
     skus: List[str],
     marketplace: str,
@@ -173,9 +236,15 @@ async def operations_sync_impl(
 ):
     connector = get_connector(marketplace)
     results = {"synced": 0, "failed": 0, "errors": []}
+    details = await connector.get_listings_details_bulk(skus)
+    await connector.prepare_batch(list(details.items.values()))
     for sku in skus:
         try:
-            raw = await connector.get_listing_details(sku)
+            if sku in details.errors:
+                raise details.errors[sku]
+            raw = details.items.get(sku)
+            if raw is None:
+                raise LookupError(f"Listing {sku} not found on {marketplace}")
             normalized = await connector.normalize(raw)
             normalized_data = normalized.model_dump() if hasattr(normalized, "model_dump") else normalized
             listing_uuid = repository.upsert_listings_current(
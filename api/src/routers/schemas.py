@@ -9,6 +9,19 @@ class AnalyzeRequest(BaseModel):
     keyword: str = Field(..., min_length=2)
     marketplace: str = "mercadolivre"
     limit: int = Field(default=30, ge=1, le=100)
+    category: Optional[str] = None
+
+
+class MultiMarketAnalyzeRequest(BaseModel):
+    keyword: str = Field(..., min_length=2)
+    marketplaces: List[str] = Field(default_factory=lambda: ["mercadolivre", "magalu"], min_length=1)
+    limit: int = Field(default=30, ge=1, le=100)
+
+
+class BatchResearchRequest(BaseModel):
+    keywords: List[str] = Field(..., min_length=1, max_length=200)
+    marketplace: str = "mercadolivre"
+    limit: int = Field(default=30, ge=1, le=100)
 
 
 class AuditListingRequest(BaseModel):
@@ -53,7 +53,11 @@ async def seo_analyze_listing(
         repository.insert_audit(
             workspace_id=ctx.workspace_id,
             listing_id=listing_id,
-            scores=result.model_dump().get("seo_score", {}),
+            # content_hash: mesmo hash do memo de scores (scoring/memo.py)
+            scores={
+                **result.model_dump().get("seo_score", {}),
+                "content_hash": result.metadata.get("fingerprint"),
+            },
             recommendations=result.model_dump().get("top_actions", []),
             supabase_jwt=ctx.token,
         )
@@ -94,5 +98,12 @@ async def seo_competitor_keywords(
     ctx: RequestContext = Depends(require_auth_context),
     agent: MarketAgent = Depends(get_agent),
 ):
-    research = await agent.research_market(req.keyword, marketplace_alias(req.marketplace), limit=req.limit)
-    return {"workspace_id": ctx.workspace_id, "keywords": research.top_seo_terms}
+    research = await agent.research_market(
+        req.keyword, marketplace_alias(req.marketplace), limit=req.limit, category_id=req.category
+    )
+    return {
+        "workspace_id": ctx.workspace_id,
+        "keywords": research.top_seo_terms,
+        "served_from_cache": research.served_from_cache,
+        "data_age_seconds": research.data_age_seconds,
+    }
@@ -0,0 +1,74 @@
+"""
+MarketContext — estatísticas dos concorrentes usadas pelos scorers.
+
+SEOScorer, ConversionScorer e CompetitivenessScorer comparam o anúncio com
+as mesmas médias do mercado (preço final, vendas, mídia, bullets, badges,
+termos frequentes). O contexto é calculado uma vez por conjunto de
+concorrentes e passado aos três; pontuar N anúncios contra o mesmo mercado
+custa O(N), não O(N × concorrentes).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterable, Optional, Union
+
+from api.src.types.batch import BADGE_FRETE_GRATIS, BADGE_FULL, ListingBatch
+from api.src.types.listing import ListingNormalized, SellerReputation
+
+# SEOScorer compara o título com os termos dos primeiros concorrentes
+KEYWORD_COMPETITORS = 20
+KEYWORD_TOP_TERMS = 15
+
+
+@dataclass(frozen=True)
+class MarketContext:
+    total: int = 0
+    avg_final_price: Optional[float] = None   # só preços > 0; None se nenhum
+    avg_sales: float = 0.0
+    avg_media: float = 0.0
+    avg_bullets: float = 0.0
+    free_shipping_count: int = 0
+    full_count: int = 0
+    platinum_count: int = 0
+    top_terms: tuple[str, ...] = ()          # mais frequentes primeiro
+
+    @classmethod
+    def from_listings(
+        cls,
+        competitors: Union[ListingBatch, Iterable[ListingNormalized], None],
+    ) -> "MarketContext":
+        batch = ListingBatch.from_listings(competitors)
+        if not len(batch):
+            return cls()
+        final_prices = batch.positive_final_prices()
+        return cls(
+            total=len(batch),
+            avg_final_price=float(final_prices.mean()) if final_prices.size else None,
+            avg_sales=batch.mean(batch.sales),
+            avg_media=batch.mean(batch.media_count),
+            avg_bullets=batch.mean(batch.bullets_count),
+            free_shipping_count=batch.badge_count(BADGE_FRETE_GRATIS),
+            full_count=batch.badge_count(BADGE_FULL),
+            platinum_count=batch.reputation_count(SellerReputation.PLATINUM),
+            top_terms=tuple(
+                t for t, _ in batch.head(KEYWORD_COMPETITORS).term_counter().most_common(KEYWORD_TOP_TERMS)
+            ),
+        )
+
+    @property
+    def empty(self) -> bool:
+        return self.total == 0
+
+    @property
+    def free_shipping_share(self) -> float:
+        return self.free_shipping_count / self.total if self.total else 0.0
+
+
+def resolve_context(
+    competitors: Union[ListingBatch, Iterable[ListingNormalized], None] = None,
+    context: Optional[MarketContext] = None,
+) -> MarketContext:
+    """Contexto pronto tem prioridade; senão é calculado dos concorrentes."""
+    if context is not None:
+        return context
+    return MarketContext.from_listings(competitors)
@@ -12,11 +12,41 @@ CompetitivenessScorer: avalia posição relativa vs mercado.
   - Seller reputation
   - FULL vs concorrentes
   - Diferencial de conteúdo
+
+Os dois aceitam `competitors` (lista ou ListingBatch) ou um MarketContext
+já calculado — as estatísticas dos concorrentes saem sempre do contexto.
 """
 from __future__ import annotations
 
-from typing import Optional
-from api.src.types.listing import ListingNormalized, ScoreBreakdown
+from typing import Optional, Union
+
+import numpy as np
+
+from api.src.scoring.context import MarketContext, resolve_context
+from api.src.scoring.vectorized import BatchScores, labels_for, round_array, tiers_at_least, tiers_below
+from api.src.types.batch import (
+    BADGE_FRETE_GRATIS,
+    BADGE_FULL,
+    BADGE_PARCELAMENTO,
+    REPUTATION_ORDER,
+    ListingBatch,
+)
+from api.src.types.listing import ListingNormalized, ScoreBreakdown, SellerReputation
+
+Competitors = Union[list[ListingNormalized], ListingBatch]
+
+_REPUTATION_SCORES = {
+    SellerReputation.PLATINUM: 100,
+    SellerReputation.GOLD: 80,
+    SellerReputation.SILVER: 55,
+    SellerReputation.BRONZE: 35,
+    SellerReputation.NEW: 15,
+    SellerReputation.UNKNOWN: 30,
+}
+# mesmos pontos indexados pelo código de reputação do ListingBatch
+_REPUTATION_POINTS = np.array(
+    [_REPUTATION_SCORES.get(rep, 30) for rep in REPUTATION_ORDER], dtype=np.float64
+)
 
 
 # ── Conversão ─────────────────────────────────────────────────
@@ -26,14 +56,15 @@ class ConversionScorer:
     def score(
         self,
         listing: ListingNormalized,
-        competitors: Optional[list[ListingNormalized]] = None,
+        competitors: Optional[Competitors] = None,
+        context: Optional[MarketContext] = None,
     ) -> ScoreBreakdown:
-        competitors = competitors or []
+        context = resolve_context(competitors, context)
 
-        s_social, sug_social = self._score_social(listing, competitors)
+        s_social, sug_social = self._score_social(listing, context)
         s_media, sug_media = self._score_media(listing)
-        s_badges, sug_badges = self._score_badges(listing, competitors)
-        s_price, sug_price = self._score_price(listing, competitors)
+        s_badges, sug_badges = self._score_badges(listing, context)
+        s_price, sug_price = self._score_price(listing, context)
 
         # Pesos: mídia (30%) + social (30%) + badges (25%) + preço (15%)
         total = round(
@@ -63,7 +94,7 @@ class ConversionScorer:
     def _score_social(
         self,
         listing: ListingNormalized,
-        competitors: list[ListingNormalized],
+        context: MarketContext,
     ) -> tuple[float, list[str]]:
         sp = listing.social_proof
         suggestions: list[str] = []
@@ -103,11 +134,8 @@ class ConversionScorer:
 
         # Vendas estimadas vs concorrentes: 0→30 pontos
         my_sales = sp.vendas_estimadas or 0
-        if competitors:
-            avg_sales = sum(
-                (c.social_proof.vendas_estimadas or 0) for c in competitors
-            ) / max(len(competitors), 1)
-            ratio = my_sales / max(avg_sales, 1)
+        if not context.empty:
+            ratio = my_sales / max(context.avg_sales, 1)
             score += min(30, ratio * 30)
         else:
             score += 15  # neutro sem benchmark
@@ -151,7 +179,7 @@ class ConversionScorer:
     def _score_badges(
         self,
         listing: ListingNormalized,
-        competitors: list[ListingNormalized],
+        context: MarketContext,
     ) -> tuple[float, list[str]]:
         suggestions: list[str] = []
         score = 0.0
@@ -160,10 +188,8 @@ class ConversionScorer:
             score += 40
         else:
             # Verifica se maioria dos concorrentes tem frete grátis
-            if competitors:
-                free_pct = sum(
-                    1 for c in competitors if c.badges.frete_gratis
-                ) / len(competitors)
+            if not context.empty:
+                free_pct = context.free_shipping_share
                 if free_pct > 0.5:
                     suggestions.append(
                         f"{int(free_pct*100)}% dos concorrentes oferecem frete grátis. "
@@ -175,7 +201,7 @@ class ConversionScorer:
         elif listing.badges.frete_gratis:
             pass  # já pontuou acima
         else:
-            if competitors and any(c.badges.full for c in competitors):
+            if context.full_count:
                 suggestions.append(
                     "Concorrentes com FULL/entrega rápida. Considere enviar estoque "
                     "para o fulfillment do marketplace."
@@ -198,17 +224,13 @@ class ConversionScorer:
     def _score_price(
         self,
         listing: ListingNormalized,
-        competitors: list[ListingNormalized],
+        context: MarketContext,
     ) -> tuple[float, list[str]]:
         suggestions: list[str] = []
-        if not competitors:
-            return 70.0, []
-
-        prices = [c.final_price_estimate for c in competitors if c.final_price_estimate > 0]
-        if not prices:
+        avg = context.avg_final_price
+        if avg is None:
             return 70.0, []
 
-        avg = sum(prices) / len(prices)
         my = listing.final_price_estimate or listing.price
         ratio = my / avg if avg else 1.0
 
@@ -237,6 +259,63 @@ class ConversionScorer:
 
         return score, suggestions
 
+    # ── Lote ──────────────────────────────────────────────────
+
+    def score_many(
+        self,
+        listings: Competitors,
+        competitors: Optional[Competitors] = None,
+        context: Optional[MarketContext] = None,
+    ) -> BatchScores:
+        """Mesmos scores do `score()`, vetorizados sobre um catálogo inteiro."""
+        batch = ListingBatch.from_listings(listings)
+        context = resolve_context(competitors, context)
+
+        # Social: avaliações + nota + vendas vs concorrentes
+        rating = batch.rating
+        s_social = (
+            tiers_at_least(batch.reviews, [(100, 30), (50, 22), (20, 15), (5, 8)], 0)
+            + np.select([rating >= 4.7, rating >= 4.3, rating >= 3.8, rating > 0], [40, 30, 18, 8], 0)
+        ).astype(np.float64)
+        if context.empty:
+            s_social = s_social + 15
+        else:
+            s_social = s_social + np.minimum(30, batch.sales / max(context.avg_sales, 1) * 30)
+        s_social = np.minimum(100.0, s_social)
+
+        s_media = tiers_at_least(batch.media_count, [(10, 100), (7, 80), (5, 60), (3, 35)], 10).astype(np.float64)
+
+        s_badges = np.minimum(
+            100.0,
+            np.where(batch.has_badge(BADGE_FRETE_GRATIS), 40, 0)
+            + np.where(batch.has_badge(BADGE_FULL), 30, 0)
+            + np.where(batch.has_badge(BADGE_PARCELAMENTO), 20, 0)
+            + 10,
+        ).astype(np.float64)
+
+        if context.avg_final_price is None:
+            s_price = np.full(len(batch), 70.0)
+        else:
+            my = np.where(batch.final_price != 0, batch.final_price, batch.price)
+            ratio = my / context.avg_final_price
+            s_price = np.select(
+                [ratio <= 0.9, ratio <= 1.0, ratio <= 1.15, ratio <= 1.30],
+                [100.0, 85.0, 65.0, 45.0],
+                20.0,
+            )
+
+        total = round_array(s_media * 0.30 + s_social * 0.30 + s_badges * 0.25 + s_price * 0.15)
+        return BatchScores(
+            score=total,
+            label=labels_for(total, [(80, "Excelente"), (65, "Bom"), (40, "Regular")], "Ruim"),
+            details={
+                "prova_social": round_array(s_social),
+                "midia": round_array(s_media),
+                "badges": round_array(s_badges),
+                "preco": round_array(s_price),
+            },
+        )
+
     @staticmethod
     def _label(score: float) -> str:
         if score >= 80:
@@ -255,9 +334,11 @@ class CompetitivenessScorer:
     def score(
         self,
         listing: ListingNormalized,
-        competitors: list[ListingNormalized],
+        competitors: Optional[Competitors] = None,
+        context: Optional[MarketContext] = None,
     ) -> ScoreBreakdown:
-        if not competitors:
+        context = resolve_context(competitors, context)
+        if context.empty:
             return ScoreBreakdown(
                 score=50.0,
                 label="Regular",
@@ -265,10 +346,10 @@ class CompetitivenessScorer:
                 suggestions=["Adicione concorrentes para score de competitividade."],
             )
 
-        s_price = self._relative_price_score(listing, competitors)
+        s_price = self._relative_price_score(listing, context)
         s_rep = self._reputation_score(listing)
-        s_content = self._content_advantage(listing, competitors)
-        s_velocity = self._sales_velocity(listing, competitors)
+        s_content = self._content_advantage(listing, context)
+        s_velocity = self._sales_velocity(listing, context)
 
         total = round(
             s_price * 0.35
@@ -287,16 +368,15 @@ class CompetitivenessScorer:
                 "vantagem_conteudo": round(s_content, 1),
                 "velocidade_vendas": round(s_velocity, 1),
             },
-            suggestions=self._gen_suggestions(listing, competitors),
+            suggestions=self._gen_suggestions(listing, context),
         )
 
     def _relative_price_score(
-        self, listing: ListingNormalized, competitors: list[ListingNormalized]
+        self, listing: ListingNormalized, context: MarketContext
     ) -> float:
-        prices = [c.final_price_estimate for c in competitors if c.final_price_estimate > 0]
-        if not prices:
+        avg = context.avg_final_price
+        if avg is None:
             return 50.0
-        avg = sum(prices) / len(prices)
         my = listing.final_price_estimate or listing.price
         ratio = my / avg
         if ratio < 0.85:
@@ -309,55 +389,91 @@ class CompetitivenessScorer:
             return 40.0
         return 20.0
 
+    # ── Lote ──────────────────────────────────────────────────
+
+    def score_many(
+        self,
+        listings: Competitors,
+        competitors: Optional[Competitors] = None,
+        context: Optional[MarketContext] = None,
+    ) -> BatchScores:
+        """Mesmos scores do `score()`, vetorizados sobre um catálogo inteiro."""
+        batch = ListingBatch.from_listings(listings)
+        context = resolve_context(competitors, context)
+        n = len(batch)
+
+        if context.empty:
+            return BatchScores(
+                score=np.full(n, 50.0),
+                label=np.full(n, "Regular"),
+                details={},
+            )
+
+        if context.avg_final_price is None:
+            s_price = np.full(n, 50.0)
+        else:
+            my = np.where(batch.final_price != 0, batch.final_price, batch.price)
+            s_price = tiers_below(
+                my / context.avg_final_price, [(0.85, 100.0), (1.0, 80.0), (1.15, 60.0), (1.3, 40.0)], 20.0
+            )
+
+        s_rep = _REPUTATION_POINTS[batch.reputation]
+
+        s_content = (
+            np.minimum(100, batch.media_count / max(context.avg_media, 1) * 100)
+            + np.minimum(100, batch.bullets_count / max(context.avg_bullets, 1) * 100)
+        ) / 2
+
+        if context.avg_sales == 0:
+            s_velocity = np.full(n, 50.0)
+        else:
+            s_velocity = np.minimum(100, batch.sales / context.avg_sales * 100)
+
+        total = round_array(s_price * 0.35 + s_rep * 0.25 + s_content * 0.25 + s_velocity * 0.15)
+        return BatchScores(
+            score=total,
+            label=labels_for(total, [(80, "Líder"), (65, "Competitivo"), (40, "Regular")], "Fraco"),
+            details={
+                "preco_relativo": round_array(s_price),
+                "reputacao_seller": round_array(s_rep),
+                "vantagem_conteudo": round_array(s_content),
+                "velocidade_vendas": round_array(s_velocity),
+            },
+        )
+
     @staticmethod
     def _reputation_score(listing: ListingNormalized) -> float:
-        from api.src.types.listing import SellerReputation
-        rep_scores = {
-            SellerReputation.PLATINUM: 100,
-            SellerReputation.GOLD: 80,
-            SellerReputation.SILVER: 55,
-            SellerReputation.BRONZE: 35,
-            SellerReputation.NEW: 15,
-            SellerReputation.UNKNOWN: 30,
-        }
-        return rep_scores.get(listing.seller.reputacao, 30)
+        return _REPUTATION_SCORES.get(listing.seller.reputacao, 30)
 
     def _content_advantage(
-        self, listing: ListingNormalized, competitors: list[ListingNormalized]
+        self, listing: ListingNormalized, context: MarketContext
     ) -> float:
-        avg_media = sum(c.media_count for c in competitors) / len(competitors)
-        avg_bullets = sum(len(c.text_blocks.bullets) for c in competitors) / len(competitors)
-        my_media_score = min(100, listing.media_count / max(avg_media, 1) * 100)
-        my_bullet_score = min(100, len(listing.text_blocks.bullets) / max(avg_bullets, 1) * 100)
+        my_media_score = min(100, listing.media_count / max(context.avg_media, 1) * 100)
+        my_bullet_score = min(100, len(listing.text_blocks.bullets) / max(context.avg_bullets, 1) * 100)
         return (my_media_score + my_bullet_score) / 2
 
     def _sales_velocity(
-        self, listing: ListingNormalized, competitors: list[ListingNormalized]
+        self, listing: ListingNormalized, context: MarketContext
     ) -> float:
         my = listing.social_proof.vendas_estimadas or 0
-        avg = sum(
-            (c.social_proof.vendas_estimadas or 0) for c in competitors
-        ) / max(len(competitors), 1)
+        avg = context.avg_sales
         if avg == 0:
             return 50.0
         return min(100, my / avg * 100)
 
     @staticmethod
     def _gen_suggestions(
-        listing: ListingNormalized, competitors: list[ListingNormalized]
+        listing: ListingNormalized, context: MarketContext
     ) -> list[str]:
         sug = []
-        full_competitors = sum(1 for c in competitors if c.badges.full)
-        if full_competitors > len(competitors) * 0.4 and not listing.badges.full:
+        full_competitors = context.full_count
+        if full_competitors > context.total * 0.4 and not listing.badges.full:
             sug.append(
                 f"{full_competitors} concorrentes usam FULL/fulfillment. "
                 "Considere enviar estoque para o CD do marketplace."
             )
-        platinum_count = sum(
-            1 for c in competitors
-            if c.seller.reputacao.value == "platinum"
-        )
-        if platinum_count > len(competitors) * 0.3:
+        platinum_count = context.platinum_count
+        if platinum_count > context.total * 0.3:
             sug.append(
                 f"{platinum_count} concorrentes são vendedores Platinum/Top. "
                 "Foque em conteúdo e preço para compensar reputação."
@@ -0,0 +1,102 @@
+"""
+Memo de scores por conteúdo.
+
+Re-auditar um anúncio que não mudou contra o mesmo mercado dá o mesmo
+resultado. A chave junta:
+  - o hash dos campos do anúncio que os scorers leem (sem id/url/coleta);
+  - o hash do MarketContext dos concorrentes;
+  - o token das regras (ruleset compilado + índice de atributos da categoria).
+
+Qualquer mudança em título, preço, atributos, mídia, regras... gera outra
+chave; não há invalidação explícita, entradas antigas saem por LRU/TTL.
+"""
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+from typing import Any, Callable, Optional
+
+from api.src.caching.memory import LRUCache
+from api.src.config import get_settings
+from api.src.scoring.context import MarketContext
+from api.src.types.listing import ListingNormalized
+
+settings = get_settings()
+
+# identificação e metadados de coleta não mudam o score
+_IDENTITY_FIELDS = {"schema_version", "listing_id", "url", "scraped_at", "position_in_search"}
+
+
+def digest(*parts: Any) -> str:
+    raw = json.dumps(parts, sort_keys=True, default=str, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def listing_fingerprint(listing: ListingNormalized) -> str:
+    """Hash estável do conteúdo pontuável do anúncio."""
+    return digest(listing.model_dump(mode="json", exclude=_IDENTITY_FIELDS))
+
+
+def context_fingerprint(context: MarketContext) -> str:
+    return digest(dataclasses.astuple(context))
+
+
+def score_key(listing_fp: str, context: MarketContext, rules_token: str) -> str:
+    return f"{listing_fp}:{context_fingerprint(context)}:{rules_token}"
+
+
+class ScoreMemo:
+    """LRU limitado de resultados de scoring, por tipo (seo, conversion, ...)."""
+
+    def __init__(self, capacity: Optional[int] = None, ttl_seconds: Optional[int] = None):
+        self._cache = LRUCache(
+            capacity if capacity is not None else settings.SCORE_MEMO_MAX_ENTRIES,
+            ttl_seconds if ttl_seconds is not None else settings.SCORE_MEMO_TTL_SECONDS,
+        )
+        # métricas
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, key: str) -> Optional[Any]:
+        value = self._cache.get(f"{kind}:{key}")
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def put(self, kind: str, key: str, value: Any) -> None:
+        self._cache.put(f"{kind}:{key}", value)
+
+    def get_or_compute(self, kind: str, key: str, compute: Callable[[], Any]) -> tuple[Any, bool]:
+        """(resultado, veio do memo?)"""
+        value = self.get(kind, key)
+        if value is not None:
+            return value, True
+        value = compute()
+        self.put(kind, key, value)
+        return value, False
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def metrics(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._cache),
+            "capacity": self._cache.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+
+_memo: Optional[ScoreMemo] = None
+
+
+def get_score_memo() -> ScoreMemo:
+    global _memo
+    if _memo is None:
+        _memo = ScoreMemo()
+    return _memo
@@ -12,43 +12,28 @@ Score final: 0–100 → Ruim (<40) | Regular (40–64) | Bom (65–79) | Excele
 """
 from __future__ import annotations
 
+import dataclasses
 from dataclasses import dataclass, field
 from typing import Optional
 import re
 
+import numpy as np
+
+from api.src.scoring.context import MarketContext, resolve_context
+from api.src.scoring.memo import digest
+from api.src.scoring.vectorized import BatchScores, labels_for, round_array
+from api.src.services.category_attributes import get_category_attribute_store, listing_attribute_ids
+from api.src.services.rulesets import BUILTIN_RULES, CompiledRuleset, RulesetService, get_ruleset_service
+from api.src.types.batch import ListingBatch
 from api.src.types.listing import ListingNormalized, Marketplace, ScoreBreakdown
+from api.src.utils.term_matcher import get_matcher
 
 
 # ── Regras por Marketplace ─────────────────────────────────────
+# Padrões embutidos; os valores efetivos (por plataforma e categoria) vêm do
+# RulesetService, que aplica a tabela marketplace_rulesets por cima deles.
 
-MARKETPLACE_RULES = {
-    Marketplace.MERCADO_LIVRE: {
-        "title_max": 60,
-        "title_min": 40,
-        "title_recommended": 55,
-        "bullets_max": 6,
-        "bullets_ideal": 5,
-        "description_min_chars": 300,
-        "attributes_required": [
-            "cor", "material", "largura_cm", "profundidade_cm", "altura_cm",
-        ],
-        "forbidden_terms": [
-            "grátis", "promoção", "oferta", "melhor preço", "barato",
-            "frete grátis",  # não pode no título no ML
-            "!", "?", "$",
-        ],
-    },
-    Marketplace.MAGALU: {
-        "title_max": 100,
-        "title_min": 30,
-        "title_recommended": 70,
-        "bullets_max": 10,
-        "bullets_ideal": 6,
-        "description_min_chars": 200,
-        "attributes_required": ["cor", "material", "largura_cm", "altura_cm"],
-        "forbidden_terms": ["!", "?"],
-    },
-}
+MARKETPLACE_RULES = BUILTIN_RULES
 
 DEFAULT_RULES = MARKETPLACE_RULES[Marketplace.MERCADO_LIVRE]
 
@@ -76,19 +61,34 @@ class SEOScorer:
     para comparar termos.
     """
 
+    def __init__(self, rulesets: Optional[RulesetService] = None):
+        self._rulesets = rulesets
+
+    def _ruleset_for(self, listing: ListingNormalized) -> CompiledRuleset:
+        service = self._rulesets or get_ruleset_service()
+        return service.get(listing.marketplace, listing.category_id)
+
+    def rules_token(self, listing: ListingNormalized) -> str:
+        """Identifica as regras que pontuariam o anúncio (entra na chave do memo)."""
+        rules = self._ruleset_for(listing)
+        index = get_category_attribute_store().lookup(listing.marketplace.value, listing.category_id)
+        return digest(dataclasses.astuple(rules), index.to_dict() if index is not None else None)
+
     def score(
         self,
         listing: ListingNormalized,
-        competitors: Optional[list[ListingNormalized]] = None,
+        competitors: Optional[list[ListingNormalized] | ListingBatch] = None,
+        context: Optional[MarketContext] = None,
     ) -> SEOScoreResult:
-        rules = MARKETPLACE_RULES.get(listing.marketplace, DEFAULT_RULES)
-        competitors = competitors or []
+        rules = self._ruleset_for(listing)
+        context = resolve_context(competitors, context)
 
         s_title, t_suggestions = self._score_title(listing, rules)
         s_attrs, a_suggestions = self._score_attributes(listing, rules)
         s_content, c_suggestions = self._score_content(listing, rules)
-        s_keywords, k_suggestions = self._score_keywords(listing, competitors)
-        s_rules, r_suggestions = self._score_rules_compliance(listing, rules)
+        found_forbidden, matched_terms = self._title_terms(listing, rules, context)
+        s_keywords, k_suggestions = self._score_keywords(context, matched_terms)
+        s_rules, r_suggestions = self._score_rules_compliance(found_forbidden)
 
         # Pesos: título (35%) + atributos (20%) + conteúdo (15%) + keywords (20%) + compliance (10%)
         total = (
@@ -117,15 +117,15 @@ class SEOScorer:
 
     # ── Título ────────────────────────────────────────────────
 
-    def _score_title(self, listing: ListingNormalized, rules: dict) -> tuple[float, list[str]]:
+    def _score_title(self, listing: ListingNormalized, rules: CompiledRuleset) -> tuple[float, list[str]]:
         title = listing.title
         length = len(title)
         suggestions: list[str] = []
         score = 100.0
 
-        max_len = rules["title_max"]
-        min_len = rules["title_min"]
-        recommended = rules["title_recommended"]
+        max_len = rules.title_max
+        min_len = rules.title_min
+        recommended = rules.title_recommended
 
         if length > max_len:
             excess = length - max_len
@@ -169,18 +169,24 @@ class SEOScorer:
 
     # ── Atributos ─────────────────────────────────────────────
 
-    def _score_attributes(self, listing: ListingNormalized, rules: dict) -> tuple[float, list[str]]:
-        required = rules.get("attributes_required", [])
-        suggestions: list[str] = []
+    @staticmethod
+    def _missing_attributes(listing: ListingNormalized, rules: CompiledRuleset) -> tuple[list[str], int]:
+        """
+        (atributos obrigatórios ausentes, total de obrigatórios). Usa o índice
+        da categoria quando já está em memória; senão, os do ruleset.
+        """
+        index = get_category_attribute_store().lookup(listing.marketplace.value, listing.category_id)
+        if index is not None and index.required:
+            return index.missing(listing_attribute_ids(listing)), len(index.required)
         attrs = listing.attributes
+        required = rules.attributes_required
+        return [attr for attr in required if getattr(attrs, attr, None) is None], len(required)
 
-        missing = []
-        for attr in required:
-            val = getattr(attrs, attr, None)
-            if val is None:
-                missing.append(attr)
+    def _score_attributes(self, listing: ListingNormalized, rules: CompiledRuleset) -> tuple[float, list[str]]:
+        suggestions: list[str] = []
+        missing, required_count = self._missing_attributes(listing, rules)
 
-        pct_missing = len(missing) / max(len(required), 1)
+        pct_missing = len(missing) / max(required_count, 1)
         score = round((1 - pct_missing) * 100, 1)
 
         if missing:
@@ -202,14 +208,14 @@ class SEOScorer:
 
     # ── Conteúdo textual ──────────────────────────────────────
 
-    def _score_content(self, listing: ListingNormalized, rules: dict) -> tuple[float, list[str]]:
+    def _score_content(self, listing: ListingNormalized, rules: CompiledRuleset) -> tuple[float, list[str]]:
         suggestions: list[str] = []
         score = 100.0
 
         bullets = listing.text_blocks.bullets
         descricao = listing.text_blocks.descricao or ""
-        ideal_bullets = rules.get("bullets_ideal", 5)
-        desc_min = rules.get("description_min_chars", 300)
+        ideal_bullets = rules.bullets_ideal
+        desc_min = rules.description_min_chars
 
         if not bullets:
             score -= 35
@@ -243,26 +249,21 @@ class SEOScorer:
 
     def _score_keywords(
         self,
-        listing: ListingNormalized,
-        competitors: list[ListingNormalized],
+        context: MarketContext,
+        matched_terms: list[str],
     ) -> tuple[float, list[str]]:
         suggestions: list[str] = []
 
-        if not competitors:
+        if context.empty:
             return 70.0, []  # sem benchmark, score neutro
 
         # Termos mais frequentes nos top concorrentes
-        from collections import Counter
-        all_terms: list[str] = []
-        for c in competitors[:20]:
-            all_terms.extend(c.seo_terms)
-        top_terms = {t for t, _ in Counter(all_terms).most_common(15)}
+        top_terms = context.top_terms
 
-        my_title_lower = listing.title.lower()
-        matched = sum(1 for t in top_terms if t in my_title_lower)
-        score = round(matched / max(len(top_terms), 1) * 100, 1)
+        matched = set(matched_terms)
+        score = round(len(matched) / max(len(top_terms), 1) * 100, 1)
 
-        missing_kw = [t for t in top_terms if t not in my_title_lower]
+        missing_kw = [t for t in top_terms if t not in matched]
         if missing_kw:
             suggestions.append(
                 f"Termos frequentes nos concorrentes ausentes no seu título: "
@@ -271,15 +272,32 @@ class SEOScorer:
 
         return min(100.0, score), suggestions
 
+    # ── Termos no título ──────────────────────────────────────
+
+    @staticmethod
+    def _title_terms(
+        listing: ListingNormalized,
+        rules: CompiledRuleset,
+        context: MarketContext,
+    ) -> tuple[list[str], list[str]]:
+        """
+        (termos proibidos, keywords do mercado) presentes no título, numa
+        passada só do autômato que junta as duas listas.
+        """
+        forbidden = rules.forbidden_terms
+        matcher = get_matcher(forbidden + context.top_terms)
+        hits = matcher.hits(listing.title)
+        split = len(forbidden)
+        return (
+            [matcher.terms[i] for i in hits if i < split],
+            [matcher.terms[i] for i in hits if i >= split],
+        )
+
     # ── Compliance (regras do marketplace) ────────────────────
 
-    def _score_rules_compliance(self, listing: ListingNormalized, rules: dict) -> tuple[float, list[str]]:
+    def _score_rules_compliance(self, found_forbidden: list[str]) -> tuple[float, list[str]]:
         suggestions: list[str] = []
         score = 100.0
-        forbidden = rules.get("forbidden_terms", [])
-        title_lower = listing.title.lower()
-
-        found_forbidden = [f for f in forbidden if f in title_lower]
         if found_forbidden:
             score -= len(found_forbidden) * 20
             suggestions.append(
@@ -289,6 +307,117 @@ class SEOScorer:
 
         return max(0.0, score), suggestions
 
+    # ── Lote ──────────────────────────────────────────────────
+
+    def score_many(
+        self,
+        listings: list[ListingNormalized] | ListingBatch,
+        competitors: Optional[list[ListingNormalized] | ListingBatch] = None,
+        context: Optional[MarketContext] = None,
+    ) -> BatchScores:
+        """
+        Mesmos scores do `score()` para um catálogo inteiro. Uma passada em
+        Python extrai as contagens de texto (comprimento, artigos, CAPS,
+        atributos, termos); as faixas e pesos são aplicados em arrays.
+        """
+        listings = listings.listings if isinstance(listings, ListingBatch) else list(listings)
+        context = resolve_context(competitors, context)
+        n = len(listings)
+        top_terms = context.top_terms
+
+        # rulesets distintos do lote (plataforma/categoria), indexados por código
+        rule_sets: list[CompiledRuleset] = []
+        rule_code: dict[int, int] = {}
+        codes, length, article, caps, missing, required = [], [], [], [], [], []
+        bullets, desc_len, matched, forbidden = [], [], [], []
+        articles = ("o", "a", "os", "as", "um", "uma")
+        for listing in listings:
+            rules = self._ruleset_for(listing)
+            code = rule_code.get(id(rules))
+            if code is None:
+                code = rule_code[id(rules)] = len(rule_sets)
+                rule_sets.append(rules)
+            title = listing.title
+            words = title.split()
+            codes.append(code)
+            length.append(len(title))
+            article.append(bool(words) and words[0].lower() in articles)
+            caps.append(sum(1 for w in words if w.isupper() and len(w) > 2))
+            missing_attrs, required_count = self._missing_attributes(listing, rules)
+            missing.append(len(missing_attrs))
+            required.append(required_count)
+            bullets.append(len(listing.text_blocks.bullets))
+            desc_len.append(len(listing.text_blocks.descricao or ""))
+            found_forbidden, matched_terms = self._title_terms(listing, rules, context)
+            matched.append(len(set(matched_terms)))
+            forbidden.append(len(found_forbidden))
+
+        codes = np.array(codes, dtype=np.int64)
+
+        def rule_column(key: str) -> np.ndarray:
+            return np.array([getattr(r, key) for r in rule_sets], dtype=np.float64)[codes]
+
+        cols = {
+            "length": np.array(length, dtype=np.float64),
+            "title_max": rule_column("title_max"),
+            "title_min": rule_column("title_min"),
+            "title_rec": rule_column("title_recommended"),
+            "article": np.array(article, dtype=np.float64),
+            "caps": np.array(caps, dtype=np.float64),
+            "missing": np.array(missing, dtype=np.float64),
+            "required": np.array(required, dtype=np.float64),
+            "bullets": np.array(bullets, dtype=np.float64),
+            "bullets_ideal": rule_column("bullets_ideal"),
+            "desc_len": np.array(desc_len, dtype=np.float64),
+            "desc_min": rule_column("description_min_chars"),
+            "matched": np.array(matched, dtype=np.float64),
+            "forbidden": np.array(forbidden, dtype=np.float64),
+        }
+
+        length = cols["length"]
+        s_title = 100.0 - np.select(
+            [length > cols["title_max"], length < cols["title_min"], length < cols["title_rec"]],
+            [np.minimum(40, (length - cols["title_max"]) * 2), 25, 10],
+            0,
+        )
+        s_title = np.maximum(
+            0.0, s_title - np.where(cols["article"] > 0, 10, 0) - np.where(cols["caps"] > 2, 10, 0)
+        )
+
+        s_attrs = np.maximum(0.0, round_array((1 - cols["missing"] / np.maximum(cols["required"], 1)) * 100))
+
+        bullets, desc_len = cols["bullets"], cols["desc_len"]
+        s_content = 100.0 - np.select(
+            [bullets == 0, bullets < cols["bullets_ideal"]],
+            [35, (cols["bullets_ideal"] - bullets) * 7],
+            0,
+        )
+        s_content = np.maximum(
+            0.0, s_content - np.select([desc_len == 0, desc_len < cols["desc_min"]], [30, 15], 0)
+        )
+
+        if context.empty:
+            s_keywords = np.full(n, 70.0)
+        else:
+            s_keywords = np.minimum(100.0, round_array(cols["matched"] / max(len(top_terms), 1) * 100))
+
+        s_rules = np.maximum(0.0, 100.0 - cols["forbidden"] * 20)
+
+        total = round_array(
+            s_title * 0.35 + s_attrs * 0.20 + s_content * 0.15 + s_keywords * 0.20 + s_rules * 0.10
+        )
+        return BatchScores(
+            score=total,
+            label=labels_for(total, [(80, "Excelente"), (65, "Bom"), (40, "Regular")], "Ruim"),
+            details={
+                "titulo": round_array(s_title),
+                "atributos": round_array(s_attrs),
+                "conteudo": round_array(s_content),
+                "keywords": round_array(s_keywords),
+                "compliance": round_array(s_rules),
+            },
+        )
+
     # ── Label ─────────────────────────────────────────────────
 
     @staticmethod
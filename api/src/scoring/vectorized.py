@@ -0,0 +1,66 @@
+"""
+Apoio ao scoring em lote (`score_many`) dos scorers.
+
+As escadas de faixas dos scorers ("if rev >= 100 … elif rev >= 50 …") viram
+`np.select` sobre colunas do ListingBatch. O arredondamento final reproduz
+o `round()` do Python para que o resultado seja idêntico ao caminho escalar.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Sequence
+
+import numpy as np
+
+from api.src.types.listing import ScoreBreakdown
+
+
+def tiers_at_least(values: np.ndarray, steps: Sequence[tuple[float, float]], default: float) -> np.ndarray:
+    """Primeiro `(limite, pontos)` com `values >= limite`; senão `default`."""
+    return np.select([values >= limit for limit, _ in steps], [points for _, points in steps], default)
+
+
+def tiers_below(values: np.ndarray, steps: Sequence[tuple[float, float]], default: float) -> np.ndarray:
+    """Primeiro `(limite, pontos)` com `values < limite`; senão `default`."""
+    return np.select([values < limit for limit, _ in steps], [points for _, points in steps], default)
+
+
+def round_array(values: np.ndarray, ndigits: int = 1) -> np.ndarray:
+    """
+    `round(v, ndigits)` elemento a elemento. `np.round` só pode divergir do
+    Python perto de um empate (…5 na casa seguinte); esses poucos valores são
+    refeitos com `round()`.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10 ** ndigits
+    near_tie = np.flatnonzero(np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6)
+    for i in near_tie.tolist():
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def labels_for(scores: np.ndarray, steps: Sequence[tuple[float, str]], default: str) -> np.ndarray:
+    return np.select([scores >= limit for limit, _ in steps], [label for _, label in steps], default)
+
+
+@dataclass
+class BatchScores:
+    """
+    Resultado de `score_many`: arrays alinhados com a entrada. Só os números
+    e labels — sugestões em texto continuam no `score()` de um anúncio.
+    """
+    score: np.ndarray
+    label: np.ndarray
+    details: dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.score)
+
+    def breakdown(self, index: int) -> ScoreBreakdown:
+        return ScoreBreakdown(
+            score=float(self.score[index]),
+            label=str(self.label[index]),
+            details={name: float(column[index]) for name, column in self.details.items()},
+            suggestions=[],
+        )
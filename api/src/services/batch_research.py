@@ -0,0 +1,291 @@
+"""
+Pesquisa de mercado em lote — dezenas/centenas de keywords num job.
+
+  - keywords equivalentes (mesma chave do cache de pesquisas: sem acento,
+    minúsculas, tokens ordenados) são pesquisadas uma vez só;
+  - no máximo BATCH_RESEARCH_CONCURRENCY keywords em voo; o ritmo das
+    requisições continua com o rate limiter por host dos conectores, então
+    o lote nunca passa do orçamento do marketplace;
+  - o job roda num request_memo_scope limitado (LRU de
+    BATCH_RESEARCH_MEMO_MAX_ENTRIES): corpos HTTP, normalizações e lookups
+    repetidos entre keywords com resultados sobrepostos são reaproveitados
+    sem crescer com o tamanho do lote; cada keyword também passa pelo cache
+    de pesquisas;
+  - ao final, matriz de sobreposição (Jaccard dos anúncios) entre keywords.
+
+O job roda em background no processo; o progresso fica em memória e é
+espelhado na tabela `jobs` (type "market_research_batch") quando o
+Supabase está configurado.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Optional
+
+import numpy as np
+import structlog
+
+from api.src.caching.request_memo import request_memo_scope
+from api.src.config import get_settings
+from api.src.services.research_cache import research_key
+from api.src.types.listing import MarketResearchResult
+
+log = structlog.get_logger()
+settings = get_settings()
+
+JOB_TYPE = "market_research_batch"
+# intervalo mínimo entre gravações de progresso na tabela jobs
+_PERSIST_INTERVAL_SECONDS = 2.0
+
+
+def unique_keywords(keywords: list[str], marketplace: str) -> list[str]:
+    """Remove vazias e equivalentes, preservando a primeira grafia."""
+    seen: dict[str, str] = {}
+    for keyword in keywords:
+        keyword = (keyword or "").strip()
+        if keyword:
+            seen.setdefault(research_key(keyword, marketplace), keyword)
+    return list(seen.values())
+
+
+def overlap_matrix(results: dict[str, MarketResearchResult]) -> dict[str, Any]:
+    """Jaccard dos conjuntos de anúncios (marketplace + id) entre cada par de keywords."""
+    keywords = list(results)
+    if not keywords:
+        return {"keywords": [], "matrix": []}
+    index: dict[tuple[str, str], int] = {}
+    rows = []
+    for keyword in keywords:
+        ids = {index.setdefault((l.marketplace.value, l.listing_id), len(index)) for l in results[keyword].listings}
+        rows.append(list(ids))
+
+    incidence = np.zeros((len(keywords), max(len(index), 1)), dtype=np.float32)
+    for row, ids in enumerate(rows):
+        incidence[row, ids] = 1.0
+    inter = (incidence @ incidence.T).astype(np.float64)   # contagens inteiras, exatas em float32
+    sizes = np.diag(inter)
+    union = sizes[:, None] + sizes[None, :] - inter
+    jaccard = np.divide(inter, union, out=np.zeros_like(inter), where=union > 0)
+    return {"keywords": keywords, "matrix": np.round(jaccard, 3).tolist()}
+
+
+@dataclass
+class BatchResearchJob:
+    id: str
+    workspace_id: str
+    marketplace: str
+    limit: int
+    keywords: list[str]
+    status: str = "pending"   # job_status: pending | processing | completed | failed
+    results: dict[str, MarketResearchResult] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+    overlap: dict[str, Any] = field(default_factory=dict)
+    reused: dict[str, Any] = field(default_factory=dict)
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    finished_at: Optional[datetime] = None
+    persisted: bool = False
+
+    @property
+    def progress(self) -> dict[str, Any]:
+        total = len(self.keywords)
+        done = len(self.results) + len(self.errors)
+        return {
+            "total": total,
+            "done": done,
+            "failed": len(self.errors),
+            "pct": round(done / total * 100, 1) if total else 100.0,
+        }
+
+    def summary(self) -> dict[str, Any]:
+        """Estado sem os anúncios (vai para jobs.result_summary)."""
+        return {
+            "marketplace": self.marketplace,
+            "limit": self.limit,
+            "progress": self.progress,
+            "keywords": {
+                keyword: {
+                    "total_collected": r.total_collected,
+                    "price_range": r.price_range,
+                    "top_seo_terms": r.top_seo_terms[:10],
+                    "served_from_cache": r.served_from_cache,
+                }
+                for keyword, r in self.results.items()
+            },
+            "errors": self.errors,
+            "overlap": self.overlap,
+            "reused": self.reused,
+        }
+
+    def to_dict(self, include_results: bool = False) -> dict[str, Any]:
+        data = {
+            "job_id": self.id,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "finished_at": self.finished_at.isoformat() if self.finished_at else None,
+            **self.summary(),
+        }
+        if include_results:
+            data["results"] = {keyword: r.model_dump() for keyword, r in self.results.items()}
+        return data
+
+
+def _persist_create(job: BatchResearchJob, supabase_jwt: Optional[str]) -> Optional[str]:
+    from api.src.db import repository
+
+    return repository.create_job(
+        workspace_id=job.workspace_id,
+        job_type=JOB_TYPE,
+        status=job.status,
+        result_summary=job.summary(),
+        supabase_jwt=supabase_jwt,
+    )
+
+
+def _persist_update(job: BatchResearchJob, supabase_jwt: Optional[str]) -> None:
+    from api.src.db import repository
+
+    repository.update_job(
+        workspace_id=job.workspace_id,
+        job_id=job.id,
+        status=job.status,
+        result_summary=job.summary(),
+        supabase_jwt=supabase_jwt,
+    )
+
+
+class BatchResearchService:
+    def __init__(self, concurrency: Optional[int] = None, max_jobs: Optional[int] = None, persist: bool = True):
+        self.concurrency = concurrency if concurrency is not None else settings.BATCH_RESEARCH_CONCURRENCY
+        self.max_jobs = max_jobs if max_jobs is not None else settings.BATCH_RESEARCH_MAX_JOBS
+        self.persist = persist
+        self._jobs: dict[str, BatchResearchJob] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    def get(self, job_id: str) -> Optional[BatchResearchJob]:
+        return self._jobs.get(job_id)
+
+    async def submit(
+        self,
+        agent,
+        workspace_id: str,
+        keywords: list[str],
+        marketplace: str = "mercado_livre",
+        limit: int = 30,
+        supabase_jwt: Optional[str] = None,
+    ) -> BatchResearchJob:
+        job = BatchResearchJob(
+            id="",
+            workspace_id=workspace_id,
+            marketplace=marketplace,
+            limit=limit,
+            keywords=unique_keywords(keywords, marketplace),
+        )
+        job_id = await asyncio.to_thread(_persist_create, job, supabase_jwt) if self.persist else None
+        job.id = job_id or str(uuid.uuid4())
+        job.persisted = job_id is not None
+        self._remember(job)
+
+        # contexto vazio: o job não herda o memo do request que o criou
+        task = asyncio.get_running_loop().create_task(
+            self._run(job, agent, supabase_jwt), context=contextvars.Context()
+        )
+        self._tasks[job.id] = task
+        task.add_done_callback(lambda _t, k=job.id: self._tasks.pop(k, None))
+        log.info("batch_research_submitted", job_id=job.id, keywords=len(job.keywords), marketplace=marketplace)
+        return job
+
+    def _remember(self, job: BatchResearchJob) -> None:
+        self._jobs[job.id] = job
+        while len(self._jobs) > self.max_jobs:
+            oldest = next(iter(self._jobs))
+            if oldest in self._tasks:
+                break   # não descarta job em andamento
+            del self._jobs[oldest]
+
+    async def _run(self, job: BatchResearchJob, agent, supabase_jwt: Optional[str]) -> None:
+        semaphore = asyncio.Semaphore(max(self.concurrency, 1))
+        last_persist = 0.0
+        job.status = "processing"
+
+        async def save(force: bool = False) -> None:
+            nonlocal last_persist
+            if not job.persisted:
+                return
+            now = time.monotonic()
+            if force or now - last_persist >= _PERSIST_INTERVAL_SECONDS:
+                last_persist = now
+                await asyncio.to_thread(_persist_update, job, supabase_jwt)
+
+        async def one(keyword: str) -> None:
+            async with semaphore:
+                try:
+                    job.results[keyword] = await agent.research_market(keyword, job.marketplace, limit=job.limit)
+                except Exception as exc:
+                    job.errors[keyword] = f"{type(exc).__name__}: {exc}"
+                    log.warning("batch_research_keyword_failed", job_id=job.id, keyword=keyword, error=str(exc))
+            await save()
+
+        started = time.perf_counter()
+        try:
+            await save(force=True)
+            with request_memo_scope(settings.BATCH_RESEARCH_MEMO_MAX_ENTRIES) as memo:
+                await asyncio.gather(*(one(keyword) for keyword in job.keywords))
+            # resultados na ordem pedida, não na de chegada
+            job.results = {k: job.results[k] for k in job.keywords if k in job.results}
+            job.overlap = overlap_matrix(job.results)
+            job.reused = memo.report()
+            job.status = "failed" if job.keywords and not job.results else "completed"
+        except Exception as exc:
+            job.status = "failed"
+            job.errors["_job"] = f"{type(exc).__name__}: {exc}"
+            log.error("batch_research_failed", job_id=job.id, error=str(exc))
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.errors["_job"] = "CancelledError"
+            log.warning("batch_research_cancelled", job_id=job.id)
+            raise
+        finally:
+            job.finished_at = datetime.utcnow()
+            await save(force=True)
+            log.info(
+                "batch_research_done",
+                job_id=job.id,
+                status=job.status,
+                keywords=len(job.keywords),
+                failed=len(job.errors),
+                duration_s=round(time.perf_counter() - started, 2),
+                avoided_calls=job.reused.get("avoided_calls", 0),
+            )
+
+    async def wait(self, job_id: str) -> Optional[BatchResearchJob]:
+        task = self._tasks.get(job_id)
+        if task is not None:
+            await asyncio.gather(task, return_exceptions=True)
+        return self._jobs.get(job_id)
+
+    async def close(self) -> None:
+        """Shutdown: cancela os jobs em andamento (ficam "failed", persistidos)."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            log.info("batch_research_shutdown", cancelled=len(tasks))
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def metrics(self) -> dict:
+        return {"jobs": len(self._jobs), "running": len(self._tasks)}
+
+
+_service: Optional[BatchResearchService] = None
+
+
+def get_batch_research_service() -> BatchResearchService:
+    global _service
+    if _service is None:
+        _service = BatchResearchService()
+    return _service
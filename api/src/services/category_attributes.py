@@ -0,0 +1,187 @@
+"""
+Atributos por categoria — índice compacto de obrigatórios/recomendados.
+
+  - o conector busca o payload do marketplace (ML: /categories/{id}/attributes;
+    a resposta bruta já passa pelo cache HTTP, com tier em disco quando
+    HTTP_CACHE_PERSIST_PATH está configurado);
+  - `build_index` reduz o payload a dois frozensets de ids;
+  - o índice fica no namespace "category_attributes" do cache (Redis quando
+    habilitado, TTL longo) e num dict do processo, com o mesmo TTL
+    (CATEGORY_ATTRIBUTES_TTL_SECONDS);
+  - a auditoria aquece o índice da categoria do anúncio junto com a busca
+    do anúncio (MarketAgent.audit_listing).
+
+Validação e scoring usam só `lookup()` (memória, sem rede); o `get()`
+assíncrono é quem busca/aquece o índice. Categorias sem índice continuam
+usando o ruleset (services/rulesets.py).
+"""
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Iterable, Optional
+
+import structlog
+
+from api.src.caching import get_cache
+from api.src.config import get_settings
+from api.src.connectors.mercado_livre import ML_ATTRIBUTE_FIELDS
+from api.src.types.listing import ListingNormalized
+
+log = structlog.get_logger()
+settings = get_settings()
+
+# tags do ML para atributos que o seller não preenche
+_NOT_EDITABLE_TAGS = {"hidden", "read_only", "fixed", "inferred", "others"}
+_REQUIRED_TAGS = {"required", "catalog_required"}
+_RECOMMENDED_TAGS = {"conditional_required", "new_required", "recommended"}
+
+
+@dataclass(frozen=True)
+class CategoryAttributeIndex:
+    marketplace: str
+    category_id: str
+    required: frozenset[str]
+    recommended: frozenset[str]
+
+    def missing(self, present: Iterable[str]) -> list[str]:
+        return sorted(self.required.difference(present))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "marketplace": self.marketplace,
+            "category_id": self.category_id,
+            "required": sorted(self.required),
+            "recommended": sorted(self.recommended),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "CategoryAttributeIndex":
+        return cls(
+            marketplace=data["marketplace"],
+            category_id=data["category_id"],
+            required=frozenset(data.get("required") or ()),
+            recommended=frozenset(data.get("recommended") or ()),
+        )
+
+
+def _tags(attr: dict[str, Any]) -> set[str]:
+    tags = attr.get("tags") or {}
+    if isinstance(tags, dict):
+        return {str(name) for name, value in tags.items() if value}
+    if isinstance(tags, list):
+        return {str(name) for name in tags}
+    return set()
+
+
+def build_index(marketplace: str, category_id: str, payload: list[dict[str, Any]]) -> CategoryAttributeIndex:
+    """
+    Payload de atributos → índice. Formato do ML (tags dict ou lista,
+    `relevance` 1 = principal); entradas com `required: true` também contam
+    (formato genérico usado por outros marketplaces).
+    """
+    required: set[str] = set()
+    recommended: set[str] = set()
+    for attr in payload:
+        if not isinstance(attr, dict) or not attr.get("id"):
+            continue
+        attr_id = str(attr["id"])
+        tags = _tags(attr)
+        if tags & _NOT_EDITABLE_TAGS:
+            continue
+        if tags & _REQUIRED_TAGS or attr.get("required") is True:
+            required.add(attr_id)
+        elif tags & _RECOMMENDED_TAGS or attr.get("relevance") == 1:
+            recommended.add(attr_id)
+    return CategoryAttributeIndex(marketplace, category_id, frozenset(required), frozenset(recommended))
+
+
+def listing_attribute_ids(listing: ListingNormalized) -> set[str]:
+    """Ids de atributo preenchidos no anúncio (campos mapeados + extras)."""
+    attrs = listing.attributes
+    ids = {attr_id for attr_id, field in ML_ATTRIBUTE_FIELDS.items() if getattr(attrs, field, None) is not None}
+    ids.update(key for key, value in attrs.extras.items() if value not in (None, ""))
+    return ids
+
+
+class CategoryAttributeStore:
+    def __init__(self, ttl_seconds: Optional[int] = None, cache=None):
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.CATEGORY_ATTRIBUTES_TTL_SECONDS
+        self._cache = (cache or get_cache()).namespace("category_attributes", ttl_seconds=self.ttl_seconds)
+        # algumas centenas/milhares de categorias: cabe inteiro no processo
+        self._indexes: dict[tuple[str, str], tuple[CategoryAttributeIndex, float]] = {}
+        # métricas
+        self.memory_hits = 0
+        self.cache_hits = 0
+        self.fetches = 0
+        self.fetch_errors = 0
+
+    def _memory_get(self, key: tuple[str, str]) -> Optional[CategoryAttributeIndex]:
+        entry = self._indexes.get(key)
+        if entry is None:
+            return None
+        index, expires_at = entry
+        if time.monotonic() >= expires_at:
+            self._indexes.pop(key, None)
+            return None
+        return index
+
+    def _remember(self, index: CategoryAttributeIndex) -> None:
+        key = (index.marketplace, index.category_id)
+        self._indexes[key] = (index, time.monotonic() + self.ttl_seconds)
+
+    def lookup(self, marketplace: str, category_id: Optional[str]) -> Optional[CategoryAttributeIndex]:
+        """Só memória — seguro no caminho quente."""
+        if not category_id:
+            return None
+        return self._memory_get((str(marketplace), str(category_id)))
+
+    async def get(self, connector, category_id: Optional[str]) -> Optional[CategoryAttributeIndex]:
+        """Índice da categoria: memória → cache persistente → marketplace."""
+        if not category_id:
+            return None
+        marketplace = connector.marketplace_name
+        index = self._memory_get((marketplace, str(category_id)))
+        if index is not None:
+            self.memory_hits += 1
+            return index
+
+        cached = await self._cache.get(f"{marketplace}:{category_id}")
+        if cached is not None:
+            self.cache_hits += 1
+            index = CategoryAttributeIndex.from_dict(cached)
+            self._remember(index)
+            return index
+
+        try:
+            payload = await connector.get_category_attributes(str(category_id))
+        except Exception as exc:
+            self.fetch_errors += 1
+            log.warning("category_attributes_fetch_failed", marketplace=marketplace, category_id=category_id, error=str(exc))
+            return None
+        if not payload:
+            return None   # sem endpoint/categoria desconhecida: fica o ruleset
+        self.fetches += 1
+        index = build_index(marketplace, str(category_id), payload)
+        self._remember(index)
+        await self._cache.set(f"{marketplace}:{category_id}", index.to_dict())
+        return index
+
+    def metrics(self) -> dict:
+        return {
+            "categories": len(self._indexes),
+            "memory_hits": self.memory_hits,
+            "cache_hits": self.cache_hits,
+            "fetches": self.fetches,
+            "fetch_errors": self.fetch_errors,
+        }
+
+
+_store: Optional[CategoryAttributeStore] = None
+
+
+def get_category_attribute_store() -> CategoryAttributeStore:
+    global _store
+    if _store is None:
+        _store = CategoryAttributeStore()
+    return _store
@@ -1,13 +1,11 @@
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
 from fastapi import HTTPException
 
-from api.src.config import settings
 from api.src.connectors.base import BaseConnector
-from api.src.connectors.magalu import MagaluConnector
-from api.src.connectors.mercado_livre import MercadoLivreConnector
+from api.src.connectors.registry import get_shared_connectors
 from api.src.orchestrator.agent import MarketAgent
 
 
@@ -21,10 +19,7 @@ def marketplace_alias(value: str) -> str:
 
 
 def get_connectors() -> Dict[str, BaseConnector]:
-    return {
-        "mercado_livre": MercadoLivreConnector(settings.ml_seller_access_token),
-        "magalu": MagaluConnector(),
-    }
+    return get_shared_connectors()
 
 
 def get_connector(marketplace: str) -> BaseConnector:
@@ -35,5 +30,18 @@ def get_connector(marketplace: str) -> BaseConnector:
     return connectors[key]
 
 
+_agent: Optional[MarketAgent] = None
+
+
 def get_agent() -> MarketAgent:
-    return MarketAgent(get_connectors())
+    """MarketAgent do processo (dependency do FastAPI); criado no lifespan ou no primeiro uso."""
+    global _agent
+    if _agent is None:
+        _agent = MarketAgent()
+    return _agent
+
+
+def reset_agent() -> None:
+    """Descarta o agente compartilhado (testes e shutdown)."""
+    global _agent
+    _agent = None
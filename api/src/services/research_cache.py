@@ -0,0 +1,175 @@
+"""
+Cache de pesquisas de mercado (MarketAgent.research_market).
+
+  - chave: keyword normalizada (sem acento, minúsculas, tokens ordenados)
+    + marketplace + categoria — "Sofá Cinza" e "cinza sofa" são a mesma;
+  - uma pesquisa guardada com limit=50 atende pedidos com limit ≤ 50: a
+    lista é cortada pela posição na busca e os agregados são recalculados,
+    como se a coleta tivesse parado ali;
+  - dentro de RESEARCH_CACHE_FRESH_SECONDS a entrada é servida direto; até
+    RESEARCH_CACHE_STALE_SECONDS depois disso ela ainda é servida, mas
+    dispara um refresh em background (um por chave);
+  - a resposta traz `served_from_cache` e `data_age_seconds`.
+
+A entrada fica no namespace "market_research" do cache (Redis quando
+habilitado), então workers diferentes compartilham as pesquisas.
+"""
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import time
+from typing import Awaitable, Callable, Optional
+
+import structlog
+
+from api.src.caching import get_cache
+from api.src.config import get_settings
+from api.src.pipeline.streaming import MarketAccumulator
+from api.src.types.listing import MarketResearchResult
+from api.src.utils.term_matcher import fold
+
+log = structlog.get_logger()
+settings = get_settings()
+
+Fetch = Callable[[int], Awaitable[MarketResearchResult]]
+
+
+def research_key(keyword: str, marketplace: str, category_id: Optional[str] = None) -> str:
+    tokens = sorted(fold(keyword).split())
+    return f"{marketplace}:{category_id or '*'}:{' '.join(tokens)}"
+
+
+def narrow(result: MarketResearchResult, limit: int) -> MarketResearchResult:
+    """Recorte da pesquisa para os `limit` primeiros resultados da busca."""
+    listings = result.listings
+    if all(item.position_in_search is not None for item in listings):
+        kept = [item for item in listings if item.position_in_search <= limit]
+    else:
+        kept = listings[:limit]
+    if len(kept) == len(listings):
+        return result
+    acc = MarketAccumulator()
+    for item in kept:
+        acc.add(item)
+    return acc.result(result.keyword, result.marketplace).model_copy(
+        update={"research_at": result.research_at}
+    )
+
+
+class ResearchCache:
+    def __init__(
+        self,
+        fresh_seconds: Optional[int] = None,
+        stale_seconds: Optional[int] = None,
+        cache=None,
+    ):
+        self.fresh_seconds = fresh_seconds if fresh_seconds is not None else settings.RESEARCH_CACHE_FRESH_SECONDS
+        self.stale_seconds = stale_seconds if stale_seconds is not None else settings.RESEARCH_CACHE_STALE_SECONDS
+        self._cache = (cache or get_cache()).namespace(
+            "market_research", ttl_seconds=self.fresh_seconds + self.stale_seconds
+        )
+        self._refreshing: dict[str, asyncio.Task] = {}
+        # métricas
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+
+    async def get_or_fetch(
+        self,
+        keyword: str,
+        marketplace: str,
+        limit: int,
+        fetch: Fetch,
+        category_id: Optional[str] = None,
+    ) -> MarketResearchResult:
+        """Pesquisa do cache quando cobre `limit`; senão chama `fetch(limit)` e guarda."""
+        key = research_key(keyword, marketplace, category_id)
+        entry = await self._cache.get(key)
+        if entry is not None and entry["limit"] >= limit:
+            age = time.time() - entry["stored_at"]
+            if age <= self.fresh_seconds:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self._schedule_refresh(key, entry["limit"], fetch)
+            return self._serve(entry, keyword, limit, age)
+
+        self.misses += 1
+        result = await self._fetch_and_store(key, limit, fetch)
+        return result.model_copy(update={"keyword": keyword})
+
+    def _serve(self, entry: dict, keyword: str, limit: int, age: float) -> MarketResearchResult:
+        return narrow(entry["result"], limit).model_copy(
+            update={
+                "keyword": keyword,
+                "served_from_cache": True,
+                "data_age_seconds": round(max(age, 0.0), 1),
+            }
+        )
+
+    async def _fetch_and_store(self, key: str, limit: int, fetch: Fetch) -> MarketResearchResult:
+        result = await fetch(limit)
+        if result.total_collected:   # pesquisa vazia (busca falhou/sem itens) não vai ao cache
+            await self._cache.set(key, {"limit": limit, "stored_at": time.time(), "result": result})
+        return result
+
+    def _schedule_refresh(self, key: str, limit: int, fetch: Fetch) -> None:
+        if key in self._refreshing:
+            return
+        # contexto vazio: o refresh não herda o memo do request que o disparou
+        task = asyncio.get_running_loop().create_task(
+            self._refresh(key, limit, fetch), context=contextvars.Context()
+        )
+        self._refreshing[key] = task
+        task.add_done_callback(lambda _t, k=key: self._refreshing.pop(k, None))
+
+    async def _refresh(self, key: str, limit: int, fetch: Fetch) -> None:
+        try:
+            await self._fetch_and_store(key, limit, fetch)
+            self.refreshes += 1
+        except Exception as exc:
+            self.refresh_errors += 1
+            log.warning("research_refresh_failed", key=key, error=str(exc))
+
+    async def wait_refreshes(self) -> None:
+        """Aguarda os refreshes em andamento (testes/shutdown)."""
+        if self._refreshing:
+            await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+    async def close(self, timeout: float = 5.0) -> None:
+        """
+        Shutdown: dá `timeout` segundos aos refreshes em andamento e cancela
+        o resto, antes que o registry feche os clients que eles usam.
+        """
+        tasks = list(self._refreshing.values())
+        if not tasks:
+            return
+        _done, pending = await asyncio.wait(tasks, timeout=timeout)
+        for task in pending:
+            task.cancel()
+        if pending:
+            log.info("research_refresh_cancelled", pending=len(pending))
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def metrics(self) -> dict:
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "refreshing": len(self._refreshing),
+        }
+
+
+_research_cache: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> ResearchCache:
+    global _research_cache
+    if _research_cache is None:
+        _research_cache = ResearchCache()
+    return _research_cache
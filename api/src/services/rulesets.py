@@ -0,0 +1,271 @@
+"""
+Rulesets de marketplace — regras de título/conteúdo/atributos por plataforma
+e categoria, vindas da tabela `marketplace_rulesets`.
+
+  - BUILTIN_RULES são o padrão (e o fallback quando o banco não responde);
+  - cada linha (platform, category_id, rules jsonb, version) sobrescreve as
+    chaves que trouxer: primeiro a linha da plataforma (category_id nulo),
+    depois a da categoria. Vale a maior `version` de cada par;
+  - o resultado é compilado em CompiledRuleset imutáveis, com os autômatos
+    de termos já montados, e guardado em memória. Scoring só lê o dict em
+    memória — nunca consulta o banco;
+  - `refresh()` compara um token de versão barato (total de linhas + último
+    updated_at) e só recarrega quando muda. O lifespan roda `run_reloader`,
+    então ops altera regras na tabela sem redeploy.
+
+Chaves aceitas em `rules`: title_max, title_min, title_recommended,
+bullets_max, bullets_ideal, description_min_chars, attributes_required,
+forbidden_terms, prohibited_title_terms, mandatory_attributes.
+"""
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional, Union
+
+import structlog
+
+from api.src.config import get_settings
+from api.src.types.listing import Marketplace
+from api.src.utils.term_matcher import TermMatcher, get_matcher
+
+log = structlog.get_logger()
+settings = get_settings()
+
+BUILTIN_RULES: dict[Marketplace, dict[str, Any]] = {
+    Marketplace.MERCADO_LIVRE: {
+        "title_max": 60,
+        "title_min": 40,
+        "title_recommended": 55,
+        "bullets_max": 6,
+        "bullets_ideal": 5,
+        "description_min_chars": 300,
+        "attributes_required": [
+            "cor", "material", "largura_cm", "profundidade_cm", "altura_cm",
+        ],
+        "forbidden_terms": [
+            "grátis", "promoção", "oferta", "melhor preço", "barato",
+            "frete grátis",  # não pode no título no ML
+            "!", "?", "$",
+        ],
+        # validação de publicação (MercadoLivreRules)
+        "prohibited_title_terms": [
+            "promoção", "oferta", "envio grátis", "frete grátis", "compra garantida", "brinde",
+        ],
+        "mandatory_attributes": ["BRAND", "MODEL", "ITEM_CONDITION"],
+    },
+    Marketplace.MAGALU: {
+        "title_max": 100,
+        "title_min": 30,
+        "title_recommended": 70,
+        "bullets_max": 10,
+        "bullets_ideal": 6,
+        "description_min_chars": 200,
+        "attributes_required": ["cor", "material", "largura_cm", "altura_cm"],
+        "forbidden_terms": ["!", "?"],
+        "prohibited_title_terms": [],
+        "mandatory_attributes": [],
+    },
+}
+
+_PLATFORMS = {
+    "meli": Marketplace.MERCADO_LIVRE,
+    "mercado_livre": Marketplace.MERCADO_LIVRE,
+    "mercadolivre": Marketplace.MERCADO_LIVRE,
+    "magalu": Marketplace.MAGALU,
+}
+
+_INT_FIELDS = (
+    "title_max", "title_min", "title_recommended",
+    "bullets_max", "bullets_ideal", "description_min_chars",
+)
+_TERM_FIELDS = (
+    "attributes_required", "forbidden_terms", "prohibited_title_terms", "mandatory_attributes",
+)
+
+
+@dataclass(frozen=True)
+class CompiledRuleset:
+    marketplace: Marketplace
+    category_id: Optional[str]
+    version: int
+    title_max: int
+    title_min: int
+    title_recommended: int
+    bullets_max: int
+    bullets_ideal: int
+    description_min_chars: int
+    attributes_required: tuple[str, ...]
+    forbidden_terms: tuple[str, ...]
+    prohibited_title_terms: tuple[str, ...]
+    mandatory_attributes: tuple[str, ...]
+
+    def __post_init__(self) -> None:
+        # compila os autômatos agora, fora do caminho quente
+        get_matcher(self.forbidden_terms)
+        get_matcher(self.prohibited_title_terms)
+
+    @property
+    def forbidden_matcher(self) -> TermMatcher:
+        return get_matcher(self.forbidden_terms)
+
+    @property
+    def prohibited_matcher(self) -> TermMatcher:
+        return get_matcher(self.prohibited_title_terms)
+
+    def with_rules(self, rules: dict[str, Any], category_id: Optional[str], version: int) -> "CompiledRuleset":
+        changes: dict[str, Any] = {"category_id": category_id, "version": version}
+        for name in _INT_FIELDS:
+            if name in rules:
+                changes[name] = int(rules[name])
+        for name in _TERM_FIELDS:
+            if name in rules:
+                changes[name] = tuple(str(term) for term in rules[name] or ())
+        return dataclasses.replace(self, **changes)
+
+
+def _builtin(marketplace: Marketplace) -> CompiledRuleset:
+    rules = BUILTIN_RULES[marketplace]
+    return CompiledRuleset(
+        marketplace=marketplace,
+        category_id=None,
+        version=0,
+        **{name: int(rules[name]) for name in _INT_FIELDS},
+        **{name: tuple(rules.get(name, ())) for name in _TERM_FIELDS},
+    )
+
+
+RulesetKey = tuple[Marketplace, Optional[str]]
+
+
+def compile_rulesets(rows: Iterable[dict[str, Any]]) -> dict[RulesetKey, CompiledRuleset]:
+    """Linhas de marketplace_rulesets → rulesets compilados por (marketplace, category_id)."""
+    latest: dict[RulesetKey, tuple[int, dict[str, Any]]] = {}
+    for row in rows:
+        marketplace = _PLATFORMS.get(str(row.get("platform") or "").lower())
+        rules = row.get("rules")
+        if marketplace is None or not isinstance(rules, dict):
+            log.warning("ruleset_row_skipped", platform=row.get("platform"), category_id=row.get("category_id"))
+            continue
+        key = (marketplace, row.get("category_id") or None)
+        version = int(row.get("version") or 1)
+        if key not in latest or version > latest[key][0]:
+            latest[key] = (version, rules)
+
+    compiled: dict[RulesetKey, CompiledRuleset] = {}
+    for marketplace in Marketplace:
+        base = _builtin(marketplace)
+        if (marketplace, None) in latest:
+            version, rules = latest[(marketplace, None)]
+            base = base.with_rules(rules, None, version)
+        compiled[(marketplace, None)] = base
+
+    for (marketplace, category_id), (version, rules) in latest.items():
+        if category_id is not None:
+            compiled[(marketplace, category_id)] = compiled[(marketplace, None)].with_rules(
+                rules, category_id, version
+            )
+    return compiled
+
+
+def _load_rows_from_db() -> Optional[list[dict[str, Any]]]:
+    from api.src.db import repository
+
+    return repository.list_marketplace_rulesets()
+
+
+def _load_version_from_db() -> Optional[str]:
+    from api.src.db import repository
+
+    return repository.get_marketplace_rulesets_version()
+
+
+class RulesetService:
+    def __init__(
+        self,
+        load_rows: Optional[Callable[[], Optional[list[dict[str, Any]]]]] = None,
+        load_version: Optional[Callable[[], Optional[str]]] = None,
+    ):
+        self._load_rows = load_rows or _load_rows_from_db
+        self._load_version = load_version or _load_version_from_db
+        self._rulesets = compile_rulesets([])
+        self._version: Optional[str] = None
+        # métricas
+        self.reloads = 0
+        self.checks = 0
+        self.last_error: Optional[str] = None
+
+    @property
+    def version(self) -> Optional[str]:
+        return self._version
+
+    def get(
+        self,
+        marketplace: Union[Marketplace, str],
+        category_id: Optional[str] = None,
+    ) -> CompiledRuleset:
+        """Ruleset da categoria, senão o da plataforma (só memória)."""
+        rulesets = self._rulesets   # o refresh troca o dict inteiro
+        try:
+            marketplace = Marketplace(marketplace)
+        except ValueError:
+            marketplace = _PLATFORMS.get(str(marketplace).lower(), Marketplace.MERCADO_LIVRE)
+        if category_id:
+            ruleset = rulesets.get((marketplace, category_id))
+            if ruleset is not None:
+                return ruleset
+        return rulesets[(marketplace, None)]
+
+    def refresh(self, force: bool = False) -> bool:
+        """Recarrega do banco se o token de versão mudou. True se recarregou."""
+        self.checks += 1
+        version = self._load_version()
+        if version is None:
+            return False   # banco fora/desligado: mantém o que está em memória
+        if version == self._version and not force:
+            return False
+        rows = self._load_rows()
+        if rows is None:
+            # versão lida, linhas não: mantém regras e versão para tentar de novo
+            log.warning("rulesets_rows_unavailable", version=version)
+            return False
+        rulesets = compile_rulesets(rows)
+        self._rulesets = rulesets
+        self._version = version
+        self.reloads += 1
+        log.info("rulesets_reloaded", version=version, rulesets=len(rulesets))
+        return True
+
+    async def run_reloader(self, stop_event: asyncio.Event, interval: Optional[float] = None) -> None:
+        interval = interval if interval is not None else settings.RULESETS_RELOAD_SECONDS
+        while not stop_event.is_set():
+            try:
+                await asyncio.to_thread(self.refresh)
+                self.last_error = None
+            except Exception as exc:
+                self.last_error = str(exc)
+                log.warning("rulesets_reload_failed", error=str(exc))
+            try:
+                await asyncio.wait_for(stop_event.wait(), timeout=max(interval, 1.0))
+            except asyncio.TimeoutError:
+                continue
+
+    def metrics(self) -> dict:
+        return {
+            "version": self._version,
+            "rulesets": len(self._rulesets),
+            "reloads": self.reloads,
+            "checks": self.checks,
+            "last_error": self.last_error,
+        }
+
+
+_service: Optional[RulesetService] = None
+
+
+def get_ruleset_service() -> RulesetService:
+    global _service
+    if _service is None:
+        _service = RulesetService()
+    return _service
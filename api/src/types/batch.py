@@ -0,0 +1,143 @@
+"""
+ListingBatch — representação colunar de uma lista de ListingNormalized.
+
+Montado uma vez (uma passada sobre os objetos Pydantic) e usado por
+MarketAggregator e pelos scorers: estatísticas de mercado viram reduções
+NumPy sobre arrays em vez de loops Python atributo por atributo.
+
+Colunas:
+  - numéricas (NumPy): price, final_price, media_count, bullets_count,
+    reviews, rating, sales;
+  - badges: bitmask uint8 por anúncio (BADGE_*);
+  - reputação do seller: código int8 na ordem de REPUTATION_ORDER;
+  - strings internadas: listing_ids, titles, seller_ids;
+  - seo_terms: tupla de listas (contagem de termos continua em Python).
+"""
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from itertools import chain
+from typing import Iterable, Optional, Sequence, Union
+
+import numpy as np
+
+from api.src.types.listing import ListingNormalized, SellerReputation
+
+BADGE_FRETE_GRATIS = 1 << 0
+BADGE_FULL = 1 << 1
+BADGE_PREMIUM = 1 << 2
+BADGE_OFICIAL = 1 << 3
+BADGE_MELHOREI_PRECO = 1 << 4
+BADGE_PATROCINADO = 1 << 5
+BADGE_PARCELAMENTO = 1 << 6
+
+_BADGE_FIELDS = (
+    ("frete_gratis", BADGE_FRETE_GRATIS),
+    ("full", BADGE_FULL),
+    ("premium", BADGE_PREMIUM),
+    ("oficial", BADGE_OFICIAL),
+    ("melhorei_preco", BADGE_MELHOREI_PRECO),
+    ("anuncio_patrocinado", BADGE_PATROCINADO),
+    ("parcelamento_sem_juros", BADGE_PARCELAMENTO),
+)
+
+REPUTATION_ORDER = tuple(SellerReputation)
+_REPUTATION_CODE = {rep: code for code, rep in enumerate(REPUTATION_ORDER)}
+
+
+def _intern(value: Optional[str]) -> str:
+    return sys.intern(value or "")
+
+
+def _badge_mask(listing: ListingNormalized) -> int:
+    badges = listing.badges
+    mask = 0
+    for name, bit in _BADGE_FIELDS:
+        if getattr(badges, name):
+            mask |= bit
+    return mask
+
+
+class ListingBatch:
+    __slots__ = (
+        "listings", "price", "final_price", "media_count", "bullets_count",
+        "reviews", "rating", "sales", "badges", "reputation",
+        "listing_ids", "titles", "seller_ids", "seo_terms",
+    )
+
+    def __init__(self, listings: Sequence[ListingNormalized]):
+        self.listings = list(listings)
+        price, final_price, media, bullets = [], [], [], []
+        reviews, rating, sales, badges, reputation = [], [], [], [], []
+        listing_ids, titles, seller_ids, seo_terms = [], [], [], []
+
+        for l in self.listings:
+            sp = l.social_proof
+            price.append(l.price)
+            final_price.append(l.final_price_estimate)
+            media.append(l.media_count)
+            bullets.append(len(l.text_blocks.bullets))
+            reviews.append(sp.avaliacoes_total)
+            rating.append(sp.nota_media)
+            sales.append(sp.vendas_estimadas or 0)
+            badges.append(_badge_mask(l))
+            reputation.append(_REPUTATION_CODE.get(l.seller.reputacao, _REPUTATION_CODE[SellerReputation.UNKNOWN]))
+            listing_ids.append(_intern(l.listing_id))
+            titles.append(_intern(l.title))
+            seller_ids.append(_intern(l.seller.seller_id))
+            seo_terms.append(l.seo_terms)
+
+        self.price = np.array(price, dtype=np.float64)
+        self.final_price = np.array(final_price, dtype=np.float64)
+        self.media_count = np.array(media, dtype=np.int64)
+        self.bullets_count = np.array(bullets, dtype=np.int64)
+        self.reviews = np.array(reviews, dtype=np.int64)
+        self.rating = np.array(rating, dtype=np.float64)
+        self.sales = np.array(sales, dtype=np.int64)
+        self.badges = np.array(badges, dtype=np.uint8)
+        self.reputation = np.array(reputation, dtype=np.int8)
+        self.listing_ids = tuple(listing_ids)
+        self.titles = tuple(titles)
+        self.seller_ids = tuple(seller_ids)
+        self.seo_terms = tuple(seo_terms)
+
+    @classmethod
+    def from_listings(cls, listings: Union["ListingBatch", Iterable[ListingNormalized], None]) -> "ListingBatch":
+        """Aceita lista ou batch pronto (não reconstrói)."""
+        if isinstance(listings, ListingBatch):
+            return listings
+        return cls(list(listings or []))
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    # ── Seleção ───────────────────────────────────────────────
+
+    def head(self, n: int) -> "ListingBatch":
+        if n >= len(self):
+            return self
+        return ListingBatch(self.listings[:n])
+
+    # ── Reduções ──────────────────────────────────────────────
+
+    def has_badge(self, bit: int) -> np.ndarray:
+        return (self.badges & bit) != 0
+
+    def badge_count(self, bit: int) -> int:
+        return int(np.count_nonzero(self.badges & bit))
+
+    def reputation_count(self, reputation: SellerReputation) -> int:
+        return int(np.count_nonzero(self.reputation == _REPUTATION_CODE[reputation]))
+
+    def positive_prices(self) -> np.ndarray:
+        return self.price[self.price > 0]
+
+    def positive_final_prices(self) -> np.ndarray:
+        return self.final_price[self.final_price > 0]
+
+    def mean(self, column: np.ndarray) -> float:
+        return float(column.mean()) if column.size else 0.0
+
+    def term_counter(self) -> Counter:
+        return Counter(chain.from_iterable(self.seo_terms))
@@ -234,6 +234,7 @@ class ListingAuditResult(BaseModel):
     generated_titles: List[str] = Field(default_factory=list)
     generated_description: Optional[str] = None
     audit_at: datetime = Field(default_factory=datetime.utcnow)
+    metadata: dict = Field(default_factory=dict)   # ex.: {"score_cache": "hit", "fingerprint": ...}
 
 
 class MarketResearchResult(BaseModel):
@@ -246,3 +247,23 @@ class MarketResearchResult(BaseModel):
     competitor_summary: dict
     gaps: List[dict]
     research_at: datetime = Field(default_factory=datetime.utcnow)
+    served_from_cache: bool = False
+    data_age_seconds: float = 0.0   # idade da coleta quando veio do cache de pesquisas
+
+
+class MergedMarketView(BaseModel):
+    """Visão combinada de vários marketplaces para a mesma keyword."""
+    total_collected: int
+    price_range: dict          # {min, max, avg, median} de todos os anúncios
+    top_seo_terms: List[dict]  # [{term, freq}] somando os marketplaces
+    shared_terms: List[str]    # termos no top de todos os marketplaces com resultado
+    competitor_summary: dict
+    gaps: List[dict]           # diferenças entre marketplaces
+
+
+class MultiMarketResearchResult(BaseModel):
+    keyword: str
+    marketplaces: dict[str, MarketResearchResult]   # por Marketplace.value
+    merged: MergedMarketView
+    errors: dict[str, str] = Field(default_factory=dict)   # marketplace → erro da coleta
+    research_at: datetime = Field(default_factory=datetime.utcnow)
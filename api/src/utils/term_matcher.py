@@ -0,0 +1,107 @@
+"""
+TermMatcher — busca de vários termos num título em uma passada (Aho-Corasick).
+
+Usado pelas validações de título (termos proibidos) e pela cobertura de
+keywords do SEOScorer. O autômato é compilado uma vez por lista de termos
+(`get_matcher` guarda os compilados) e cada título é percorrido uma vez só,
+independente de quantos termos existam.
+
+  - acentos e caixa são ignorados dos dois lados: "Frete Gratis" casa com
+    "frete grátis";
+  - limites de palavra: um termo que começa/termina com letra ou dígito só
+    casa se o caractere vizinho no título não for letra/dígito ("oferta" não
+    casa em "ofertas"); termos de pontuação ("!", "$") casam em qualquer lugar.
+"""
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Iterable
+
+from api.src.utils.text import fold_accents
+
+
+def fold(text: str) -> str:
+    """Forma comparável: minúsculas e sem acento."""
+    text = text or ""
+    if text.isascii():
+        return text.lower()
+    return fold_accents(text).lower()
+
+
+class TermMatcher:
+    __slots__ = ("terms", "_goto", "_fail", "_out", "_bounded")
+
+    def __init__(self, terms: Iterable[str]):
+        self.terms: tuple[str, ...] = tuple(terms)
+        # estado 0 é a raiz; _goto[s] mapeia caractere → próximo estado
+        self._goto: list[dict[str, int]] = [{}]
+        self._out: list[list[int]] = [[]]
+        # por termo: (tamanho, exige limite à esquerda, exige limite à direita)
+        self._bounded: list[tuple[int, bool, bool]] = []
+
+        for index, term in enumerate(self.terms):
+            pattern = fold(term).strip()
+            self._bounded.append((len(pattern), pattern[:1].isalnum(), pattern[-1:].isalnum()))
+            if not pattern:
+                continue
+            state = 0
+            for ch in pattern:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._out.append([])
+                state = nxt
+            self._out[state].append(index)
+
+        # links de falha em largura; saídas herdadas do sufixo mais longo
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def hits(self, text: str) -> list[int]:
+        """Índices (em `terms`, ordenados) dos termos presentes em `text`."""
+        folded = fold(text)
+        goto, fail, out, bounded = self._goto, self._fail, self._out, self._bounded
+        last = len(folded) - 1
+        found: set[int] = set()
+        state = 0
+        for pos, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for index in out[state]:
+                if index in found:
+                    continue
+                size, left, right = bounded[index]
+                start = pos - size + 1
+                if left and start > 0 and folded[start - 1].isalnum():
+                    continue
+                if right and pos < last and folded[pos + 1].isalnum():
+                    continue
+                found.add(index)
+        return sorted(found)
+
+    def found(self, text: str) -> list[str]:
+        """Termos presentes em `text`, na ordem em que foram declarados."""
+        return [self.terms[i] for i in self.hits(text)]
+
+    def count(self, text: str) -> int:
+        return len(self.hits(text))
+
+
+@lru_cache(maxsize=256)
+def get_matcher(terms: tuple[str, ...]) -> TermMatcher:
+    """Autômato compilado para a tupla de termos (compartilhado no processo)."""
+    return TermMatcher(terms)
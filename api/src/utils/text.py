@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def fold_accents(text: str) -> str:
+    """Remove acentos/diacríticos: "Retrátil Colchão" → "Retratil Colchao"."""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+
+
+def normalize_text(text: str) -> str:
+    """Minúsculas, sem acento, só letras/dígitos separados por um espaço."""
+    return _NON_ALNUM.sub(" ", fold_accents(text).lower()).strip()
+
+
+def tokenize(text: str) -> list[str]:
+    normalized = normalize_text(text)
+    return normalized.split() if normalized else []
@@ -0,0 +1,37 @@
+import asyncio
+
+from api.src.connectors.registry import close_registry, get_registry
+from api.src.orchestrator.agent import MarketAgent
+from api.src.services.marketplace import get_agent, reset_agent
+
+
+def test_get_agent_returns_process_wide_instance():
+    reset_agent()
+    try:
+        agent = get_agent()
+        assert get_agent() is agent
+        reset_agent()
+        assert get_agent() is not agent
+    finally:
+        reset_agent()
+
+
+def test_shared_agent_follows_registry_connectors():
+    agent = MarketAgent()
+
+    async def _connectors():
+        return agent.connectors
+
+    first = asyncio.run(_connectors())
+    asyncio.run(close_registry())
+    # o registry recriou os conectores; o agente não guarda os antigos
+    second = asyncio.run(_connectors())
+    assert set(second) == {"mercado_livre", "magalu"}
+    assert second["mercado_livre"] is not first["mercado_livre"]
+    assert second is get_registry().connectors
+    asyncio.run(close_registry())
+
+
+def test_injected_connectors_are_kept():
+    connectors = {"mercado_livre": object()}
+    assert MarketAgent(connectors=connectors).connectors is connectors
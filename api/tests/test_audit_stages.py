@@ -0,0 +1,128 @@
+import asyncio
+import time
+
+from api.src.orchestrator import agent as agent_module
+from api.src.orchestrator.agent import MarketAgent
+from api.src.scoring.memo import ScoreMemo
+from api.src.types.listing import (
+    ListingNormalized,
+    Marketplace,
+    MarketResearchResult,
+    Seller,
+    TextBlocks,
+)
+
+_DELAY = 0.15
+
+
+def _listing(listing_id: str, title: str = "Sofa Retratil Reclinavel 3 Lugares Suede Cinza", price: float = 1999.9):
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=listing_id,
+        url=f"https://example.com/{listing_id}",
+        title=title,
+        price=price,
+        final_price_estimate=price,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        text_blocks=TextBlocks(bullets=["a", "b"], descricao="d" * 400),
+        media_count=6,
+    )
+
+
+class _SlowConnector:
+    async def get_normalized_listing(self, listing_id):
+        await asyncio.sleep(_DELAY)
+        return _listing(listing_id)
+
+
+def _agent(monkeypatch, events):
+    competitors = [_listing(f"C{i}", price=1500.0 + i * 10) for i in range(10)]
+    research = MarketResearchResult(
+        keyword="sofa",
+        marketplace=Marketplace.MERCADO_LIVRE,
+        total_collected=len(competitors),
+        listings=competitors,
+        price_range={},
+        top_seo_terms=[{"term": "sofa", "freq": 10}],
+        competitor_summary={},
+        gaps=[],
+    )
+
+    async def fake_research(self, keyword, marketplace="mercado_livre", limit=50):
+        events.append(("research", keyword))
+        await asyncio.sleep(_DELAY)
+        return research
+
+    async def fake_titles(**kwargs):
+        await asyncio.sleep(_DELAY)
+        return ["Sofa Retratil"]
+
+    async def fake_recommendations(**kwargs):
+        await asyncio.sleep(_DELAY)
+        return {"acoes": [{"acao": "Adicionar fotos"}]}
+
+    monkeypatch.setattr(MarketAgent, "research_market", fake_research)
+    monkeypatch.setattr(agent_module, "generate_titles", fake_titles)
+    monkeypatch.setattr(agent_module, "generate_audit_recommendations", fake_recommendations)
+    monkeypatch.setattr(type(agent_module.settings), "check_ai_configured", lambda self: True)
+
+    agent = MarketAgent(connectors={"mercado_livre": _SlowConnector()})
+    agent.score_memo = ScoreMemo(capacity=100, ttl_seconds=60)
+    return agent
+
+
+def test_audit_listing_runs_independent_stages_concurrently(monkeypatch):
+    agent = _agent(monkeypatch, [])
+
+    started = time.perf_counter()
+    result = asyncio.run(agent.audit_listing("MLB1", keyword="sofa retratil"))
+    elapsed = time.perf_counter() - started
+
+    # caminho mais longo: detalhes|pesquisa → scores → títulos|recomendações
+    assert elapsed < _DELAY * 3.5   # em sequência seriam 4 × _DELAY
+    stages = result.metadata["stages_ms"]
+    assert {"listing", "research", "scoring", "titles", "recommendations", "total"} <= set(stages)
+    assert result.top_actions == ["Adicionar fotos"]
+    assert result.seo_score.score > 0
+
+
+def test_audit_listing_without_keyword_researches_title_terms(monkeypatch):
+    events = []
+    agent = _agent(monkeypatch, events)
+
+    result = asyncio.run(agent.audit_listing("MLB1"))
+
+    assert events == [("research", "Sofa Retratil Reclinavel 3")]
+    assert result.metadata["score_cache"] == "miss"
+    assert result.metadata["stages_ms"]["total"] >= result.metadata["stages_ms"]["research"]
+
+
+def test_audit_listing_warms_category_attribute_index(monkeypatch):
+    from api.src.caching import TieredCache
+    from api.src.services.category_attributes import CategoryAttributeStore
+
+    class _CategoryConnector(_SlowConnector):
+        marketplace_name = "mercado_livre"
+
+        def __init__(self):
+            self.category_calls = []
+
+        async def get_normalized_listing(self, listing_id):
+            return _listing(listing_id).model_copy(update={"category_id": "MLB1"})
+
+        async def get_category_attributes(self, category_id):
+            self.category_calls.append(category_id)
+            return [{"id": "BRAND", "tags": {"required": True}}]
+
+    agent = _agent(monkeypatch, [])
+    connector = _CategoryConnector()
+    agent._connectors = {"mercado_livre": connector}
+    agent.category_attributes = CategoryAttributeStore(cache=TieredCache())
+
+    result = asyncio.run(agent.audit_listing("MLB1", keyword="sofa"))
+
+    assert connector.category_calls == ["MLB1"]
+    assert agent.category_attributes.lookup("mercado_livre", "MLB1").required == {"BRAND"}
+    assert "category_attributes" in result.metadata["stages_ms"]
+    # único obrigatório da categoria (BRAND) ausente: o índice entrou no score SEO
+    assert result.seo_score.details["atributos"] == 0.0
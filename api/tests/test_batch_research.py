@@ -0,0 +1,154 @@
+import asyncio
+
+import httpx
+
+from api.src.caching import TieredCache
+from api.src.connectors.base import BaseConnector
+from api.src.orchestrator.agent import MarketAgent
+from api.src.services.batch_research import BatchResearchService, overlap_matrix, unique_keywords
+from api.src.services.research_cache import ResearchCache
+from api.src.types.listing import ListingNormalized, Marketplace, MarketResearchResult, Seller
+
+# itens por keyword: "sofa" e "sofa retratil" dividem MLB2..MLB4
+_SEARCH = {
+    "sofa": ["MLB1", "MLB2", "MLB3", "MLB4"],
+    "sofa retratil": ["MLB2", "MLB3", "MLB4", "MLB5"],
+    "poltrona": ["MLB9"],
+}
+
+
+class _CatalogConnector(BaseConnector):
+    marketplace_name = "mercado_livre"
+
+    def __init__(self):
+        super().__init__(client=httpx.AsyncClient())
+        self.searches: list[str] = []
+        self.normalized: list[str] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search(self, query, category_id=None, limit=50, offset=0):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            self.searches.append(query)
+            if query == "quebra":
+                raise RuntimeError("search blocked")
+            return [{"id": item_id, "price": 100.0} for item_id in _SEARCH.get(query, [])][offset:offset + limit]
+        finally:
+            self.in_flight -= 1
+
+    async def get_listing_details(self, listing_id):
+        return {"id": listing_id, "price": 100.0}
+
+    async def normalize(self, raw_data):
+        self.normalized.append(raw_data["id"])
+        return ListingNormalized(
+            marketplace=Marketplace.MERCADO_LIVRE,
+            listing_id=raw_data["id"],
+            url=f"https://example.com/{raw_data['id']}",
+            title=f"Sofa {raw_data['id']}",
+            price=raw_data["price"],
+            final_price_estimate=raw_data["price"],
+            seller=Seller(seller_id="S1", nome="Loja"),
+        )
+
+
+def _agent():
+    connector = _CatalogConnector()
+    agent = MarketAgent(connectors={"mercado_livre": connector})
+    agent.research_cache = ResearchCache(cache=TieredCache())
+    return agent, connector
+
+
+def _result(keyword, ids):
+    return MarketResearchResult(
+        keyword=keyword,
+        marketplace=Marketplace.MERCADO_LIVRE,
+        total_collected=len(ids),
+        listings=[
+            ListingNormalized(
+                marketplace=Marketplace.MERCADO_LIVRE,
+                listing_id=i,
+                url=f"https://example.com/{i}",
+                title=i,
+                price=1.0,
+                final_price_estimate=1.0,
+                seller=Seller(),
+            )
+            for i in ids
+        ],
+        price_range={},
+        top_seo_terms=[],
+        competitor_summary={},
+        gaps=[],
+    )
+
+
+def test_unique_keywords_drops_equivalent_spellings():
+    keywords = ["Sofá Retrátil", "retratil sofa", " ", "Poltrona", "poltrona"]
+    assert unique_keywords(keywords, "mercado_livre") == ["Sofá Retrátil", "Poltrona"]
+
+
+def test_overlap_matrix_is_jaccard_of_listing_ids():
+    overlap = overlap_matrix({
+        "a": _result("a", ["1", "2", "3", "4"]),
+        "b": _result("b", ["2", "3", "4", "5"]),
+        "c": _result("c", []),
+    })
+    assert overlap["keywords"] == ["a", "b", "c"]
+    assert overlap["matrix"] == [[1.0, 0.6, 0.0], [0.6, 1.0, 0.0], [0.0, 0.0, 0.0]]
+
+
+def test_batch_job_shares_fetches_and_reports_progress():
+    agent, connector = _agent()
+    service = BatchResearchService(concurrency=2, persist=False)
+
+    async def _run():
+        job = await service.submit(
+            agent,
+            workspace_id="ws",
+            keywords=["sofa", "Sofa", "sofa retratil", "poltrona", "quebra"],
+            limit=10,
+        )
+        assert job.status in {"pending", "processing"}
+        return await service.wait(job.id)
+
+    job = asyncio.run(_run())
+
+    assert job.status == "completed"
+    assert job.keywords == ["sofa", "sofa retratil", "poltrona", "quebra"]
+    assert list(job.results) == ["sofa", "sofa retratil", "poltrona"]
+    assert "RuntimeError" in job.errors["quebra"]
+    assert job.progress == {"total": 4, "done": 4, "failed": 1, "pct": 100.0}
+    assert connector.max_in_flight <= 2
+    # MLB2..MLB4 aparecem nas duas buscas e são normalizados uma vez só
+    assert sorted(connector.normalized) == ["MLB1", "MLB2", "MLB3", "MLB4", "MLB5", "MLB9"]
+    assert job.reused["reused"]["normalize"] == 3
+    assert job.overlap["matrix"][0][1] == 0.6
+    summary = job.to_dict()
+    assert summary["keywords"]["sofa"]["total_collected"] == 4
+    assert "results" not in summary
+    assert job.to_dict(include_results=True)["results"]["poltrona"]["total_collected"] == 1
+
+
+def test_shutdown_cancels_running_jobs_and_marks_them_failed():
+    class _SlowAgent:
+        async def research_market(self, keyword, marketplace, limit=30):
+            await asyncio.sleep(60)
+
+    service = BatchResearchService(concurrency=2, persist=False)
+
+    async def _run():
+        job = await service.submit(_SlowAgent(), workspace_id="ws", keywords=["sofa", "poltrona"])
+        await asyncio.sleep(0.01)
+        await service.close()
+        return job
+
+    job = asyncio.run(_run())
+
+    assert job.status == "failed"
+    assert job.errors["_job"] == "CancelledError"
+    assert job.finished_at is not None
+    assert service.metrics()["running"] == 0
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+
+from api.src.caching import TieredCache
+from api.src.connectors.http_cache import ResponseCache, endpoint_policy
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+from api.src.db.mercado_livre import MercadoLivreRules
+from api.src.scoring.seo import SEOScorer
+from api.src.services import category_attributes as store_module
+from api.src.services.category_attributes import CategoryAttributeStore, build_index
+from api.src.types.listing import ListingAttributes, ListingNormalized, Marketplace, Seller
+
+ML_PAYLOAD = [
+    {"id": "BRAND", "tags": {"required": True}},
+    {"id": "MODEL", "tags": {"catalog_required": True}},
+    {"id": "COR", "tags": {}, "relevance": 1},
+    {"id": "GTIN", "tags": ["conditional_required"]},
+    {"id": "ITEM_CONDITION", "tags": {"required": True, "hidden": True}},
+    {"id": "SELLER_SKU", "tags": {}},
+]
+
+
+def _connector(handler) -> MercadoLivreConnector:
+    connector = MercadoLivreConnector(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    connector._response_cache = ResponseCache(ttl_policies={"categories": 3600})
+    return connector
+
+
+def test_build_index_reads_ml_tags():
+    index = build_index("mercado_livre", "MLB1", ML_PAYLOAD)
+    assert index.required == {"BRAND", "MODEL"}
+    assert index.recommended == {"COR", "GTIN"}
+    assert index.missing(["BRAND"]) == ["MODEL"]
+    assert endpoint_policy("https://api.mercadolibre.com/categories/MLB1/attributes") == "categories"
+
+
+def test_store_fetches_once_and_serves_from_memory_and_cache():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=ML_PAYLOAD)
+
+    shared = TieredCache()
+
+    async def _run():
+        connector = _connector(handler)
+        store = CategoryAttributeStore(cache=shared)
+        first = await store.get(connector, "MLB1")
+        second = await store.get(connector, "MLB1")
+        # outro processo com o mesmo cache persistente não vai à rede
+        other = CategoryAttributeStore(cache=shared)
+        third = await other.get(connector, "MLB1")
+        await connector.close()
+        return store, other, first, second, third
+
+    store, other, first, second, third = asyncio.run(_run())
+    assert calls == ["/categories/MLB1/attributes"]
+    assert first == second == third
+    assert store.metrics()["fetches"] == 1 and store.metrics()["memory_hits"] == 1
+    assert other.metrics()["cache_hits"] == 1
+    assert store.lookup("mercado_livre", "MLB1") == first
+    assert store.lookup("mercado_livre", "MLB2") is None
+
+
+def test_memory_index_expires_with_ttl(monkeypatch):
+    class _Clock:
+        now = 1000.0
+
+        def monotonic(self):
+            return self.now
+
+    clock = _Clock()
+    monkeypatch.setattr(store_module, "time", clock)
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json=ML_PAYLOAD)
+
+    async def _run():
+        connector = _connector(handler)
+        connector._response_cache = None
+        store = CategoryAttributeStore(ttl_seconds=60, cache=TieredCache())
+        await store.get(connector, "MLB1")
+        clock.now += 61
+        assert store.lookup("mercado_livre", "MLB1") is None
+        store._cache = TieredCache().namespace("category_attributes", ttl_seconds=60)   # Redis também venceu
+        assert await store.get(connector, "MLB1") is not None
+        await connector.close()
+        return store
+
+    store = asyncio.run(_run())
+    assert len(calls) == 2
+    assert store.metrics()["fetches"] == 2
+
+
+def test_validation_and_seo_use_loaded_index(monkeypatch):
+    store = CategoryAttributeStore(cache=TieredCache())
+    index = build_index("mercado_livre", "MLB1", ML_PAYLOAD)
+    store._remember(index)
+    monkeypatch.setattr(store_module, "_store", store)
+
+    assert MercadoLivreRules().get_mandatory_attributes("MLB1") == ["BRAND", "MODEL"]
+    assert MercadoLivreRules().get_mandatory_attributes("OUTRA") == ["BRAND", "MODEL", "ITEM_CONDITION"]
+
+    listing = ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id="MLB9",
+        url="https://example.com/9",
+        title="Sofa Retratil Cinza",
+        price=100.0,
+        shipping_cost=0.0,
+        final_price_estimate=100.0,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        category_id="MLB1",
+        attributes=ListingAttributes(extras={"BRAND": "Acme"}),
+    )
+    assert SEOScorer().score(listing).breakdown["atributos"] == 50.0
+    assert SEOScorer().score_many([listing]).details["atributos"].tolist() == [50.0]
@@ -0,0 +1,109 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.src.connectors.circuit_breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    HostCircuitBreakers,
+)
+from api.src.connectors.http_cache import ResponseCache
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+from api.src.connectors.rate_limit import HostRateLimiter
+
+ITEM_URL = "https://api.mercadolibre.com/items/MLB1"
+
+
+def _connector(handler, cache=None, failure_threshold=5) -> MercadoLivreConnector:
+    connector = MercadoLivreConnector(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    connector._response_cache = cache
+    connector._rate_limiter = HostRateLimiter()
+    connector._circuit_breakers = HostCircuitBreakers(failure_threshold=failure_threshold, recovery_seconds=60)
+    return connector
+
+
+def test_breaker_opens_then_half_opens_and_closes():
+    breaker = CircuitBreaker("api.test", failure_threshold=2, recovery_seconds=0.0)
+    breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure(retry_after=30)
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError) as err:
+        breaker.before_request()
+    assert err.value.retry_after > 29  # Retry-After maior que recovery_seconds vence
+
+    breaker._open_until = 0.0
+    breaker.before_request()
+    assert breaker.state == HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()  # só uma chamada de teste por vez
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_late_success_does_not_close_an_open_breaker():
+    breaker = CircuitBreaker("api.test", failure_threshold=2, recovery_seconds=60)
+    breaker.before_request()
+    breaker.before_request()   # dois requests em voo
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    breaker.record_success()   # o request lento termina depois de abrir
+    assert breaker.state == OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+
+def test_429_is_retried_after_retry_after_and_slows_the_host():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"id": "MLB1"}),
+    ]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return responses.pop(0)
+
+    async def _run():
+        connector = _connector(handler)
+        result = await connector._get(ITEM_URL)
+        await connector.close()
+        return result, connector._rate_limiter.metrics()["api.mercadolibre.com"]
+
+    result, bucket = asyncio.run(_run())
+    assert result == {"id": "MLB1"}
+    assert responses == []
+    assert bucket["penalties"] == 1
+    assert bucket["rate_per_second"] < bucket["base_rate_per_second"]
+
+
+def test_degraded_upstream_serves_stale_cache_and_fails_fast():
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(200, json={"id": "MLB1", "price": 10}, headers={"ETag": '"v1"'})
+        return httpx.Response(503)
+
+    cache = ResponseCache(ttl_policies={"items": 0})
+
+    async def _run():
+        connector = _connector(handler, cache=cache, failure_threshold=1)
+        await connector._get(ITEM_URL)
+        stale = await connector._get(ITEM_URL)        # 503 → abre o circuito
+        fail_fast = await connector._get(ITEM_URL)     # circuito aberto: nem vai ao upstream
+        with pytest.raises(CircuitOpenError):
+            await connector._get("https://api.mercadolibre.com/items/MLB2")
+        await connector.close()
+        return stale, fail_fast
+
+    stale, fail_fast = asyncio.run(_run())
+    assert stale == fail_fast == {"id": "MLB1", "price": 10}
+    assert calls == 2
+    assert cache.metrics()["stale_served"] == 2
@@ -0,0 +1,53 @@
+import asyncio
+
+from api.src.connectors.registry import ConnectorRegistry
+
+
+def test_registry_shares_connectors_and_clients():
+    async def _run():
+        registry = ConnectorRegistry()
+        first = registry.get("mercado_livre")
+        second = registry.get("mercado_livre")
+        assert first is second
+        assert registry.get("magalu")._client is not first._client
+        client = first._client
+        await first.close()  # cliente compartilhado não é fechado pelo conector
+        assert not client.is_closed
+        await registry.aclose()
+        assert client.is_closed
+
+    asyncio.run(_run())
+
+
+def test_loop_change_closes_previous_clients():
+    registry = ConnectorRegistry()
+
+    async def _client():
+        return registry.get("mercado_livre")._client
+
+    async def _client_after_loop_change():
+        client = registry.get("mercado_livre")._client
+        await asyncio.sleep(0)   # deixa o fechamento agendado rodar
+        return client
+
+    old = asyncio.run(_client())
+    new = asyncio.run(_client_after_loop_change())
+    assert new is not old
+    assert old.is_closed
+    assert not new.is_closed
+    asyncio.run(registry.aclose())
+    assert new.is_closed
+    assert registry.metrics() == {}
+
+
+def test_connector_metrics_are_public():
+    async def _run():
+        registry = ConnectorRegistry()
+        registry.get("magalu")
+        metrics = registry.metrics()
+        assert set(metrics) == {"mercado_livre", "magalu"}
+        assert metrics["magalu"]["normalize"] == {"ok": 0, "failed": 0}
+        assert "upstream_calls" in metrics["magalu"]["singleflight"]
+        await registry.aclose()
+
+    asyncio.run(_run())
@@ -74,3 +74,33 @@ def test_expensive_call_trail_images_and_reports(monkeypatch):
     assert any(item["feature"] == "reports_generate" for item in captured)
     assert all(item["workspace_id"] == _DummyCtx.workspace_id for item in captured)
     assert all(item["user_id"] == _DummyCtx.user_id for item in captured)
+
+
+def test_competitor_pricing_reports_items_that_failed_to_normalize(monkeypatch):
+    from api.src.connectors.base import BulkDetails
+    from api.src.connectors.mercado_livre import MercadoLivreConnector
+    from api.src.routers import market_research
+
+    class _Connector(MercadoLivreConnector):
+        async def get_listings_details_bulk(self, listing_ids, include_descriptions=True):
+            return BulkDetails(
+                items={"MLB1": {"id": "MLB1", "price": 10.0}, "MLB2": {"id": "MLB2", "price": "x"}},
+                missing=["MLB3"],
+            )
+
+        async def prepare_batch(self, raw_items):
+            return None
+
+    monkeypatch.setattr(market_research, "get_connector", lambda marketplace: _Connector(access_token=""))
+    app.dependency_overrides[require_auth_context] = _override_auth
+    client = TestClient(app)
+    response = client.post(
+        "/api/market-research/competitor-pricing",
+        json={"marketplace": "mercado_livre", "product_ids": ["MLB1", "MLB2", "MLB3"]},
+    )
+    app.dependency_overrides.clear()
+    assert response.status_code == 200
+    body = response.json()
+    assert [item["listing_id"] for item in body["items"]] == ["MLB1"]
+    assert body["not_found"] == ["MLB3"]
+    assert body["failed"] == ["MLB2"]
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+
+from api.src.connectors import http_cache
+from api.src.connectors.http_cache import CachedResponse, ResponseCache, _DiskTier, endpoint_policy
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+
+ITEM_URL = "https://api.mercadolibre.com/items/MLB1"
+
+
+def _connector(handler, cache: ResponseCache) -> MercadoLivreConnector:
+    connector = MercadoLivreConnector(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+    connector._response_cache = cache
+    return connector
+
+
+def test_endpoint_policies():
+    assert endpoint_policy("https://api.mercadolibre.com/sites/MLB/search") == "search"
+    assert endpoint_policy("https://api.mercadolibre.com/items/MLB1/description") == "descriptions"
+    assert endpoint_policy("https://api.mercadolibre.com/items?ids=MLB1") == "items"
+    assert endpoint_policy("https://api.mercadolibre.com/users/123") == "users"
+    assert endpoint_policy("https://api.mercadolibre.com/users/me") == "default"
+
+
+def test_stale_entry_is_revalidated_with_etag():
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304, headers={"ETag": '"v1"'})
+        return httpx.Response(200, json={"id": "MLB1", "price": 10}, headers={"ETag": '"v1"'})
+
+    cache = ResponseCache(ttl_policies={"items": 0})
+
+    async def _run():
+        connector = _connector(handler, cache)
+        first = await connector._get(ITEM_URL)
+        second = await connector._get(ITEM_URL)
+        await connector.close()
+        return first, second
+
+    first, second = asyncio.run(_run())
+    assert first == second == {"id": "MLB1", "price": 10}
+    assert seen_headers == [None, '"v1"']
+    assert cache.metrics()["revalidated_304"] == 1
+
+
+def test_fresh_entry_skips_upstream_and_no_store_is_not_cached():
+    calls = {"items": 0, "users": 0}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "/users/" in request.url.path:
+            calls["users"] += 1
+            return httpx.Response(200, json={"id": 1}, headers={"Cache-Control": "no-store"})
+        calls["items"] += 1
+        return httpx.Response(200, json={"id": "MLB1"}, headers={"Cache-Control": "max-age=60"})
+
+    cache = ResponseCache(ttl_policies={"items": 120, "users": 3600})
+
+    async def _run():
+        connector = _connector(handler, cache)
+        for _ in range(3):
+            await connector._get(ITEM_URL)
+            await connector._get("https://api.mercadolibre.com/users/1")
+        await connector.close()
+
+    asyncio.run(_run())
+    assert calls == {"items": 1, "users": 3}
+    assert cache.metrics()["hits"] == 2
+
+
+def test_disk_tier_warms_a_new_cache(tmp_path):
+    path = str(tmp_path / "http_cache.sqlite")
+    calls = 0
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"id": "MLB1"})
+
+    async def _run():
+        for _ in range(2):
+            connector = _connector(handler, ResponseCache(ttl_policies={"items": 120}, persist_path=path))
+            assert await connector._get(ITEM_URL) == {"id": "MLB1"}
+            await connector.close()
+
+    asyncio.run(_run())
+    assert calls == 1
+
+
+def test_disk_tier_prunes_expired_rows_and_caps_size(tmp_path, monkeypatch):
+    monkeypatch.setattr(http_cache, "_DISK_PRUNE_EVERY", 5)
+    disk = _DiskTier(str(tmp_path / "http_cache.sqlite"), max_rows=3)
+    entry = CachedResponse(body="{}", etag=None, last_modified=None, stored_at=0.0, fresh_until=0.0, policy="items")
+    now = http_cache.time.time()
+
+    disk.put("expired-1", entry, now - 10)
+    disk.put("expired-2", entry, now - 10)
+    for i in range(3):
+        disk.put(f"live-{i}", entry, now + 100 + i)   # 5ª gravação dispara a limpeza
+    assert len(disk) == 3
+    assert disk.pruned == 2
+
+    disk.put("live-3", entry, now + 200)
+    assert disk.prune() == 1   # acima do teto: sai a que vence primeiro
+    assert disk.get("live-0") is None
+    assert disk.get("live-3") is not None
+    disk.close()
@@ -0,0 +1,49 @@
+import asyncio
+
+from api.src.connectors.base import BaseConnector
+
+
+class _PagedConnector(BaseConnector):
+    search_page_size = 50
+
+    def __init__(self, total: int):
+        super().__init__()
+        self.total = total
+        self.calls: list[tuple[int, int]] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def search(self, query, category_id=None, limit=50, offset=0):
+        self.calls.append((offset, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return [{"id": i} for i in range(offset, min(offset + limit, self.total))]
+
+    async def get_listing_details(self, listing_id):
+        return {}
+
+    async def normalize(self, raw_data):
+        return raw_data
+
+
+def test_iter_search_paginates_with_prefetch():
+    connector = _PagedConnector(total=1000)
+
+    async def _run():
+        return [item["id"] async for item in connector.iter_search("sofa", limit=120, prefetch=3)]
+
+    ids = asyncio.run(_run())
+    assert ids == list(range(120))
+    assert connector.calls == [(0, 50), (50, 50), (100, 20)]
+    assert connector.max_in_flight == 3
+
+
+def test_iter_search_stops_on_short_page():
+    connector = _PagedConnector(total=70)
+
+    async def _run():
+        return [item["id"] async for item in connector.iter_search("sofa", limit=300, prefetch=2)]
+
+    assert asyncio.run(_run()) == list(range(70))
@@ -0,0 +1,105 @@
+import random
+import time
+
+from api.src.pipeline.pipeline import MarketAggregator
+from api.src.scoring.context import MarketContext
+from api.src.scoring.conversion import CompetitivenessScorer, ConversionScorer
+from api.src.scoring.seo import SEOScorer
+from api.src.types.batch import BADGE_FRETE_GRATIS, BADGE_FULL, ListingBatch
+from api.src.types.listing import (
+    Badges,
+    ListingNormalized,
+    Marketplace,
+    Seller,
+    SellerReputation,
+    SocialProof,
+    TextBlocks,
+)
+
+
+def _mk(i: int, rng: random.Random) -> ListingNormalized:
+    price = rng.choice([0.0, round(rng.uniform(300, 3000), 2)])
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=f"MLB{i}",
+        url=f"https://example.com/{i}",
+        title=f"Sofa Retratil {rng.choice(['Cinza', 'Azul', 'Bege'])} {rng.randint(2, 4)} Lugares",
+        price=price,
+        shipping_cost=0.0,
+        final_price_estimate=price,
+        seller=Seller(seller_id=f"S{i % 7}", nome="Loja", reputacao=rng.choice(list(SellerReputation))),
+        badges=Badges(frete_gratis=rng.random() < 0.4, full=rng.random() < 0.2),
+        social_proof=SocialProof(
+            avaliacoes_total=rng.randint(0, 500),
+            nota_media=round(rng.uniform(3, 5), 1),
+            vendas_estimadas=rng.choice([None, rng.randint(0, 900)]),
+        ),
+        media_count=rng.randint(1, 10),
+        text_blocks=TextBlocks(bullets=["x"] * rng.randint(0, 6)),
+        seo_terms=rng.sample(["sofa", "retratil", "cinza", "suede", "3 lugares", "reclinavel"], 3),
+    )
+
+
+def test_columns_and_badge_bitmask():
+    rng = random.Random(5)
+    listings = [_mk(i, rng) for i in range(50)]
+    batch = ListingBatch(listings)
+
+    assert len(batch) == 50
+    assert batch.price.tolist() == [l.price for l in listings]
+    assert batch.sales.tolist() == [l.social_proof.vendas_estimadas or 0 for l in listings]
+    assert batch.badge_count(BADGE_FRETE_GRATIS) == sum(l.badges.frete_gratis for l in listings)
+    assert batch.has_badge(BADGE_FULL).tolist() == [l.badges.full for l in listings]
+    assert batch.reputation_count(SellerReputation.PLATINUM) == sum(
+        l.seller.reputacao == SellerReputation.PLATINUM for l in listings
+    )
+    assert ListingBatch.from_listings(batch) is batch
+    assert len(ListingBatch.from_listings(None)) == 0
+
+
+def test_scorers_give_same_result_for_list_and_batch():
+    rng = random.Random(9)
+    competitors = [_mk(i, rng) for i in range(20)]
+    batch = ListingBatch.from_listings(competitors)
+    for i in range(10):
+        mine = _mk(100 + i, rng)
+        assert ConversionScorer().score(mine, competitors) == ConversionScorer().score(mine, batch)
+        assert CompetitivenessScorer().score(mine, competitors) == CompetitivenessScorer().score(mine, batch)
+        assert SEOScorer().score(mine, competitors).score == SEOScorer().score(mine, batch).score
+
+
+def test_aggregate_large_batch():
+    rng = random.Random(11)
+    listings = [_mk(i, rng) for i in range(10_000)]
+    started = time.perf_counter()
+    result = MarketAggregator().aggregate(listings, "sofa", Marketplace.MERCADO_LIVRE)
+    elapsed = time.perf_counter() - started
+
+    prices = sorted(l.price for l in listings if l.price > 0)
+    assert result.total_collected == 10_000
+    assert result.price_range["min"] == round(prices[0], 2)
+    assert result.price_range["max"] == round(prices[-1], 2)
+    assert isinstance(result.competitor_summary["avg_media_count"], float)
+    assert elapsed < 5
+
+
+def test_market_context_matches_per_call_competitor_stats():
+    rng = random.Random(13)
+    competitors = [_mk(i, rng) for i in range(30)]
+    context = MarketAggregator.market_context(competitors, top_n=20)
+    top20 = competitors[:20]
+
+    assert context.total == 20
+    assert context.free_shipping_count == sum(l.badges.frete_gratis for l in top20)
+    for i in range(10):
+        mine = _mk(200 + i, rng)
+        assert ConversionScorer().score(mine, context=context) == ConversionScorer().score(mine, top20)
+        assert CompetitivenessScorer().score(mine, context=context) == CompetitivenessScorer().score(mine, top20)
+        assert SEOScorer().score(mine, context=context).breakdown == SEOScorer().score(mine, top20).breakdown
+
+
+def test_empty_context_is_neutral():
+    mine = _mk(1, random.Random(1))
+    assert MarketContext().empty
+    assert CompetitivenessScorer().score(mine, context=MarketContext()).score == 50.0
+    assert ConversionScorer().score(mine) == ConversionScorer().score(mine, context=MarketContext())
@@ -0,0 +1,72 @@
+import asyncio
+
+import httpx
+
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+
+
+def _fake_items_get(calls):
+    async def _fake_get(self, url, params=None, headers=None):
+        calls.append(url)
+        if url.endswith("/items"):
+            ids = params["ids"].split(",")
+            return [
+                {"code": 200, "body": {"id": i, "title": f"Item {i}", "price": 10.0}}
+                if i != "MLB404" else {"code": 404, "body": {"message": "not found"}}
+                for i in ids
+            ]
+        if url.endswith("/descriptions"):
+            return [{"plain_text": "descricao"}]
+        raise AssertionError(f"unexpected call {url}")
+
+    return _fake_get
+
+
+def test_bulk_details_uses_chunked_multiget(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(MercadoLivreConnector, "_get", _fake_items_get(calls))
+    connector = MercadoLivreConnector(access_token="")
+    ids = [f"MLB{i}" for i in range(45)] + ["MLB404"]
+
+    result = asyncio.run(connector.get_listings_details_bulk(ids, include_descriptions=False))
+
+    assert list(result.items.keys()) == ids[:-1]
+    assert result.missing == ["MLB404"]
+    assert result.errors == {}
+    assert calls.count(f"{MercadoLivreConnector.BASE}/items") == 3
+    assert not any(c.endswith("/descriptions") for c in calls)
+
+
+def test_bulk_details_fetches_descriptions_on_request(monkeypatch):
+    calls: list[str] = []
+    monkeypatch.setattr(MercadoLivreConnector, "_get", _fake_items_get(calls))
+    connector = MercadoLivreConnector(access_token="")
+
+    result = asyncio.run(connector.get_listings_details_bulk(["MLB1", "MLB2"]))
+
+    assert result.items["MLB1"]["_descriptions"] == [{"plain_text": "descricao"}]
+    assert sum(1 for c in calls if c.endswith("/descriptions")) == 2
+
+
+def test_bulk_details_keeps_errors_apart_from_missing_ids(monkeypatch):
+    async def _fake_get(self, url, params=None, headers=None):
+        ids = params["ids"].split(",")
+        if "MLB0" in ids:
+            raise httpx.ConnectTimeout("timeout")
+        # o multiget devolve o id canônico, não o pedido
+        return [
+            {"code": 500, "body": {"message": "boom"}} if i == "MLB21"
+            else {"code": 200, "body": {"id": i.upper(), "title": i, "price": 10.0}}
+            for i in ids
+        ]
+
+    monkeypatch.setattr(MercadoLivreConnector, "_get", _fake_get)
+    connector = MercadoLivreConnector(access_token="")
+    ids = [f"MLB{i}" for i in range(20)] + ["mlb20", "MLB21"]
+
+    result = asyncio.run(connector.get_listings_details_bulk(ids, include_descriptions=False))
+
+    assert list(result.items) == ["mlb20"]
+    assert result.missing == []
+    assert set(result.errors) == set(ids[:20]) | {"MLB21"}
+    assert isinstance(result.errors["MLB0"], httpx.ConnectTimeout)
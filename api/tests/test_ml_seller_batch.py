@@ -0,0 +1,37 @@
+import asyncio
+
+from api.src.connectors import mercado_livre
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+
+
+def test_search_resolves_sellers_with_one_multiget(monkeypatch):
+    mercado_livre._seller_cache.clear()
+    calls: list[tuple[str, dict]] = []
+
+    async def _fake_get(self, url, params=None, headers=None):
+        calls.append((url, params or {}))
+        if url.endswith("/sites/MLB/search"):
+            return {
+                "results": [
+                    {"id": f"MLB{i}", "title": f"Sofa {i}", "price": 100 + i, "seller": {"id": seller}}
+                    for i, seller in enumerate([11, 11, 22, 33, 22])
+                ]
+            }
+        if url.endswith("/users"):
+            ids = params["ids"].split(",")
+            return [{"code": 200, "body": {"id": int(i), "seller_reputation": {}}} for i in ids]
+        raise AssertionError(f"unexpected call {url}")
+
+    monkeypatch.setattr(MercadoLivreConnector, "_get", _fake_get)
+    connector = MercadoLivreConnector(access_token="token")
+    listings = asyncio.run(connector.search_and_normalize("sofa", limit=5))
+
+    assert len(listings) == 5
+    user_calls = [c for c in calls if "/users" in c[0]]
+    assert len(user_calls) == 1
+    assert sorted(user_calls[0][1]["ids"].split(",")) == ["11", "22", "33"]
+
+    # segunda busca usa só o cache de sellers
+    calls.clear()
+    asyncio.run(connector.search_and_normalize("sofa", limit=5))
+    assert [c for c in calls if "/users" in c[0]] == []
@@ -0,0 +1,122 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from api.src.orchestrator.agent import MarketAgent
+from api.src.pipeline.streaming import merge_streams
+from api.src.types.listing import Badges, ListingNormalized, Marketplace, Seller
+
+_DELAY = 0.1
+
+
+def _mk(marketplace: Marketplace, i: int, price: float, color: str, frete: bool) -> ListingNormalized:
+    return ListingNormalized(
+        marketplace=marketplace,
+        listing_id=f"{marketplace.value}-{i}",
+        url=f"https://example.com/{marketplace.value}/{i}",
+        title=f"Sofa Retratil {color} Modelo{i}",
+        price=price,
+        final_price_estimate=price,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        badges=Badges(frete_gratis=frete),
+        media_count=6,
+    )
+
+
+class _FakeConnector:
+    def __init__(self, listings, fail=False):
+        self.listings = listings
+        self.fail = fail
+
+    async def iter_search_and_normalize(self, query, category_id=None, limit=50, offset=0):
+        for listing in self.listings[:limit]:
+            await asyncio.sleep(_DELAY / len(self.listings))
+            yield listing
+        if self.fail:
+            raise RuntimeError("search blocked")
+
+
+def _agent(magalu_fail=False):
+    ml = [_mk(Marketplace.MERCADO_LIVRE, i, 1000.0 + i, "Cinza", frete=True) for i in range(25)]
+    magalu = [_mk(Marketplace.MAGALU, i, 1500.0 + i, "Veludo", frete=False) for i in range(4)]
+    return MarketAgent(connectors={
+        "mercado_livre": _FakeConnector(ml),
+        "magalu": _FakeConnector(magalu, fail=magalu_fail),
+    })
+
+
+def test_merge_streams_interleaves_and_propagates_errors():
+    async def numbers(prefix, n, fail=False):
+        for i in range(n):
+            await asyncio.sleep(0)
+            yield f"{prefix}{i}"
+        if fail:
+            raise ValueError("boom")
+
+    async def _collect(streams):
+        return [item async for item in merge_streams(streams)]
+
+    items = asyncio.run(_collect({"a": numbers("a", 3), "b": numbers("b", 2)}))
+    assert sorted(value for _, value in items) == ["a0", "a1", "a2", "b0", "b1"]
+    assert {key for key, _ in items} == {"a", "b"}
+
+    with pytest.raises(ValueError):
+        asyncio.run(_collect({"a": numbers("a", 50), "b": numbers("b", 1, fail=True)}))
+
+
+def test_research_markets_runs_marketplaces_concurrently():
+    agent = _agent()
+
+    started = time.perf_counter()
+    result = asyncio.run(agent.research_markets("sofa retratil", limit=50))
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < _DELAY * 1.8   # em sequência seriam 2 × _DELAY
+    assert result.marketplaces["mercado_livre"].total_collected == 25
+    assert result.marketplaces["magalu"].total_collected == 4
+    assert result.merged.total_collected == 29
+    assert result.merged.price_range["min"] == 1000.0
+    assert result.merged.price_range["max"] == 1503.0
+    assert {"sofa", "retratil"} <= set(result.merged.shared_terms)
+    assert "cinza" not in result.merged.shared_terms
+
+    gaps = {gap["type"]: gap for gap in result.merged.gaps}
+    assert gaps["cross_supply_gap"]["marketplace"] == "magalu"
+    assert gaps["cross_price_gap"]["marketplaces"] == ["mercado_livre", "magalu"]
+    assert gaps["cross_shipping_gap"]["marketplace"] == "magalu"
+    assert "cross_terms_gap" in gaps
+    assert result.errors == {}
+
+
+def test_research_markets_keeps_results_when_one_marketplace_fails():
+    agent = _agent(magalu_fail=True)
+
+    result = asyncio.run(agent.research_markets("sofa retratil", marketplaces=["mercado_livre", "magalu"]))
+
+    assert "RuntimeError" in result.errors["magalu"]
+    assert result.marketplaces["mercado_livre"].total_collected == 25
+    # o que o marketplace entregou antes de falhar continua contando
+    assert result.marketplaces["magalu"].total_collected == 4
+    assert not any(gap["type"] == "cross_supply_gap" for gap in result.merged.gaps)
+
+
+def test_marketplace_outage_is_an_error_not_a_supply_gap():
+    from api.src.connectors.circuit_breaker import CircuitOpenError
+    from api.src.connectors.magalu import MagaluConnector
+
+    magalu = MagaluConnector(client=httpx.AsyncClient())
+
+    async def _blocked(url):
+        raise CircuitOpenError("www.magazineluiza.com.br", 30.0)
+
+    magalu._get_html = _blocked
+    ml = [_mk(Marketplace.MERCADO_LIVRE, i, 1000.0 + i, "Cinza", frete=True) for i in range(25)]
+    agent = MarketAgent(connectors={"mercado_livre": _FakeConnector(ml), "magalu": magalu})
+
+    result = asyncio.run(agent.research_markets("sofa retratil"))
+
+    assert "CircuitOpenError" in result.errors["magalu"]
+    assert result.marketplaces["mercado_livre"].total_collected == 25
+    assert not any(gap["type"] == "cross_supply_gap" for gap in result.merged.gaps)
@@ -0,0 +1,67 @@
+import random
+import time
+
+from api.src.pipeline.near_duplicates import NearDuplicateDetector
+from api.src.pipeline.pipeline import Deduplicator
+from api.src.types.listing import ListingNormalized, Marketplace, Seller
+from api.src.utils.text import normalize_text
+
+
+def _mk(listing_id: str, title: str, price: float = 1000.0) -> ListingNormalized:
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=listing_id,
+        url=f"https://example.com/{listing_id}",
+        title=title,
+        price=price,
+        shipping_cost=0.0,
+        final_price_estimate=price,
+        seller=Seller(seller_id="S1", nome="Loja A"),
+    )
+
+
+def test_normalize_text_folds_accents_and_punctuation():
+    assert normalize_text("Sofá Retrátil, 3 Lugares - Cinza!") == "sofa retratil 3 lugares cinza"
+
+
+def test_cloned_titles_share_a_cluster():
+    listings = [
+        _mk("A1", "Sofá Retrátil Reclinável 3 Lugares Cinza Suede"),
+        _mk("A2", "Sofa Retratil Reclinavel 3 Lugares Cinza Suede!!"),
+        _mk("A3", "Sofa Retratil e Reclinavel 3 Lugares Cinza Suede", price=1050.0),
+        _mk("B1", "Sofa Retratil Reclinavel 2 Lugares Cinza Suede"),   # outro produto
+        _mk("C1", "Mesa de Jantar 6 Cadeiras Madeira"),
+        _mk("A1", "Sofá Retrátil Reclinável 3 Lugares Cinza Suede"),   # mesmo id
+    ]
+    result = Deduplicator.cluster(listings, near_duplicates=True, price_tolerance=0.15)
+
+    assert [l.listing_id for l in result.representatives] == ["A1", "B1", "C1"]
+    assert result.cluster_ids == [0, 0, 0, 1, 2, 0]
+    assert result.clusters[0] == ["A1", "A2", "A3", "A1"]
+    assert result.removed == 3
+
+
+def test_price_tolerance_keeps_far_apart_prices():
+    listings = [
+        _mk("A1", "Sofa Retratil Reclinavel 3 Lugares Cinza", price=1000.0),
+        _mk("A2", "Sofa Retratil Reclinavel 3 Lugares Cinza.", price=2500.0),
+    ]
+    assert len(Deduplicator.run(listings, near_duplicates=True, price_tolerance=0.15)) == 2
+    assert len(Deduplicator.run(listings, near_duplicates=True, price_tolerance=0)) == 1
+    assert len(Deduplicator.run(listings, near_duplicates=False)) == 2
+
+
+def test_lsh_stays_sub_quadratic():
+    rng = random.Random(3)
+    words = ["sofa", "mesa", "cadeira", "poltrona", "rack", "painel", "cama", "armario",
+             "cinza", "azul", "bege", "madeira", "veludo", "suede", "linho", "retratil"]
+    detector = NearDuplicateDetector(threshold=0.8)
+    n = 2000
+    started = time.perf_counter()
+    for i in range(n):
+        title = " ".join(rng.sample(words, 6)) + f" {i}"
+        detector.match_or_add(title, 0.0, cluster_id=i)
+    elapsed = time.perf_counter() - started
+
+    assert detector.candidates_checked < n * n / 20
+    assert elapsed < 10
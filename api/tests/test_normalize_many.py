@@ -0,0 +1,23 @@
+import asyncio
+
+from api.src.connectors.magalu import MagaluConnector
+
+
+def test_normalize_many_keeps_order_and_counts_failures(monkeypatch):
+    original = MagaluConnector.normalize
+
+    async def _flaky_normalize(self, raw):
+        if raw.get("sku") == "bad":
+            raise ValueError("broken payload")
+        await asyncio.sleep(0.01 if raw["sku"] == "1" else 0)
+        return await original(self, raw)
+
+    monkeypatch.setattr(MagaluConnector, "normalize", _flaky_normalize)
+    connector = MagaluConnector()
+    raws = [{"sku": "1", "title": "A", "price": 10}, {"sku": "bad"}, {"sku": "3", "title": "C", "price": 30}]
+
+    listings = asyncio.run(connector.normalize_many(raws, start_position=11))
+
+    assert [l.listing_id for l in listings] == ["1", "3"]
+    assert [l.position_in_search for l in listings] == [11, 13]
+    assert connector.normalize_stats == {"ok": 2, "failed": 1}
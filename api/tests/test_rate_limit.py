@@ -0,0 +1,30 @@
+import asyncio
+
+from api.src.connectors.rate_limit import HostRateLimiter, TokenBucket
+
+
+def test_token_bucket_allows_burst_then_throttles():
+    bucket = TokenBucket(rate=10.0, burst=2)
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.1
+    metrics = bucket.metrics()
+    assert metrics["acquired"] == 3
+    assert metrics["throttled"] == 1
+
+
+def test_host_rate_limiter_keeps_one_bucket_per_host():
+    limiter = HostRateLimiter()
+
+    async def _run():
+        await limiter.acquire("https://api.mercadolibre.com/items/1", rate=100.0, burst=5)
+        await limiter.acquire("https://api.mercadolibre.com/users/2", rate=100.0, burst=5)
+        await limiter.acquire("https://www.magazineluiza.com.br/busca/x/", rate=100.0, burst=1)
+
+    asyncio.run(_run())
+    limiter.record_upstream("https://api.mercadolibre.com/items/1", 0.25)
+    metrics = limiter.metrics()
+    assert metrics["api.mercadolibre.com"]["acquired"] == 2
+    assert metrics["api.mercadolibre.com"]["upstream_requests"] == 1
+    assert metrics["www.magazineluiza.com.br"]["acquired"] == 1
@@ -0,0 +1,210 @@
+import asyncio
+
+import httpx
+import pytest
+
+from api.src.caching.request_memo import RequestMemo, memoize, request_memo_scope
+from api.src.connectors.base import BaseConnector
+from api.src.connectors.mercado_livre import MercadoLivreConnector
+
+ITEM_URL = "https://api.mercadolibre.com/items/MLB1"
+
+
+def test_request_memo_runs_each_key_once():
+    memo = RequestMemo()
+    runs = 0
+
+    async def _fetch():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.01)
+        return {"id": "MLB1", "tags": []}
+
+    async def _run():
+        results = await asyncio.gather(*(memo.do("http", "k", _fetch) for _ in range(3)))
+        results.append(await memo.do("http", "k", _fetch))
+        return results
+
+    results = asyncio.run(_run())
+    assert runs == 1
+    assert memo.report() == {"calls": {"http": 1}, "reused": {"http": 3}, "avoided_calls": 3}
+    results[1]["tags"].append("mutated")
+    assert results[2]["tags"] == []   # quem reaproveita recebe cópia
+
+
+def test_bounded_memo_evicts_least_recently_used_results():
+    memo = RequestMemo(max_entries=2)
+    runs: list[str] = []
+
+    def _fetch(key):
+        async def _run():
+            runs.append(key)
+            return key
+        return _run
+
+    async def _run():
+        for key in ["a", "b", "a", "c", "a", "b"]:
+            await memo.do("http", key, _fetch(key))
+            await asyncio.sleep(0)   # deixa o done callback rodar
+
+    asyncio.run(_run())
+    # "b" saiu quando "c" entrou ("a" tinha sido usado depois)
+    assert runs == ["a", "b", "c", "b"]
+    assert memo.report()["evicted"] == 2
+    assert len(memo._entries) == 2
+
+
+def test_request_memo_does_not_keep_failures():
+    memo = RequestMemo()
+    attempts = 0
+
+    async def _flaky():
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("upstream 500")
+        return "ok"
+
+    async def _run():
+        with pytest.raises(RuntimeError):
+            await memo.do("http", "k", _flaky)
+        return await memo.do("http", "k", _flaky)
+
+    assert asyncio.run(_run()) == "ok"
+    assert attempts == 2
+
+
+def test_cancelling_first_caller_does_not_cancel_other_waiters():
+    memo = RequestMemo()
+    runs = 0
+
+    async def _fetch():
+        nonlocal runs
+        runs += 1
+        await asyncio.sleep(0.02)
+        return {"id": "MLB1"}
+
+    async def _run():
+        first = asyncio.ensure_future(memo.do("http", "k", _fetch))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(memo.do("http", "k", _fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        result = await second
+        assert first.cancelled()
+        # o resultado continua memorizado para quem vier depois
+        assert await memo.do("http", "k", _fetch) == {"id": "MLB1"}
+        return result
+
+    assert asyncio.run(_run()) == {"id": "MLB1"}
+    assert runs == 1
+
+
+def test_work_is_cancelled_when_every_caller_leaves():
+    memo = RequestMemo()
+    cancelled = []
+
+    async def _fetch():
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+
+    async def _run():
+        caller = asyncio.ensure_future(memo.do("http", "k", _fetch))
+        await asyncio.sleep(0.01)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        await asyncio.sleep(0)
+        # a chave foi liberada: nova chamada executa de novo
+
+        async def _ok():
+            return 1
+
+        return await memo.do("http", "k", _ok)
+
+    assert asyncio.run(_run()) == 1
+    assert cancelled == [True]
+
+
+def test_memoize_is_passthrough_outside_a_request():
+    runs = 0
+
+    async def _fetch():
+        nonlocal runs
+        runs += 1
+        return runs
+
+    async def _run():
+        first = await memoize("research", "k", _fetch)
+        second = await memoize("research", "k", _fetch)
+        with request_memo_scope():
+            third = await memoize("research", "k", _fetch)
+            fourth = await memoize("research", "k", _fetch)
+        return first, second, third, fourth
+
+    assert asyncio.run(_run()) == (1, 2, 3, 3)
+
+
+def test_connector_http_calls_are_reused_within_request():
+    requests = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(str(request.url))
+        return httpx.Response(200, json={"id": "MLB1", "price": 10})
+
+    async def _run():
+        connector = MercadoLivreConnector(client=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        connector._response_cache = None
+        with request_memo_scope() as memo:
+            first = await connector._get(ITEM_URL)
+            second = await connector._get(ITEM_URL)
+        await connector._get(ITEM_URL)   # outro request
+        await connector.close()
+        return first, second, memo
+
+    first, second, memo = asyncio.run(_run())
+    assert first == second == {"id": "MLB1", "price": 10}
+    assert len(requests) == 2
+    assert memo.report()["reused"] == {"http": 1}
+
+
+class _CountingConnector(BaseConnector):
+    marketplace_name = "fake"
+
+    def __init__(self):
+        super().__init__(client=httpx.AsyncClient())
+        self.details = 0
+        self.normalized = 0
+
+    async def search(self, query, category_id=None, limit=50, offset=0):
+        return [{"id": f"X{i}"} for i in range(limit)]
+
+    async def get_listing_details(self, listing_id):
+        self.details += 1
+        return {"id": listing_id}
+
+    async def normalize(self, raw_data):
+        self.normalized += 1
+        return dict(raw_data, normalized=True)
+
+
+def test_listing_details_and_normalization_are_reused_within_request():
+    async def _run():
+        connector = _CountingConnector()
+        with request_memo_scope() as memo:
+            a = await connector.get_normalized_listing("X1")
+            b = await connector.get_normalized_listing("X1")
+            # busca que devolve o mesmo item bruto não normaliza de novo
+            items = await connector.search_and_normalize("sofa", limit=3)
+        await connector.close()
+        return connector, memo, a, b, items
+
+    connector, memo, a, b, items = asyncio.run(_run())
+    assert a == b == {"id": "X1", "normalized": True}
+    assert connector.details == 1
+    assert connector.normalized == 3   # X1 (detalhe) + X0, X2 (busca)
+    assert len(items) == 3
+    assert memo.report()["reused"] == {"listing": 1, "normalize": 1}
@@ -0,0 +1,137 @@
+import asyncio
+
+from api.src.caching import TieredCache
+from api.src.pipeline.streaming import MarketAccumulator
+from api.src.services import research_cache as research_cache_module
+from api.src.services.research_cache import ResearchCache, narrow, research_key
+from api.src.types.listing import ListingNormalized, Marketplace, Seller
+
+
+def _listing(position: int) -> ListingNormalized:
+    price = 100.0 + position * 10
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=f"MLB{position}",
+        url=f"https://example.com/{position}",
+        title=f"Sofa Retratil {position}",
+        price=price,
+        final_price_estimate=price,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        seo_terms=["sofa", "retratil"] + (["cinza"] if position % 2 else []),
+        position_in_search=position,
+    )
+
+
+def _research(limit: int, keyword: str = "sofa retratil"):
+    acc = MarketAccumulator()
+    # posição 3 removida pelo dedup: o recorte usa a posição, não o índice
+    for position in range(1, limit + 1):
+        if position != 3:
+            acc.add(_listing(position))
+    return acc.result(keyword, Marketplace.MERCADO_LIVRE)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+
+def _cache(monkeypatch, **kwargs):
+    clock = _Clock()
+    monkeypatch.setattr(research_cache_module, "time", clock)
+    return ResearchCache(cache=TieredCache(), **kwargs), clock
+
+
+def test_research_key_folds_accents_case_and_token_order():
+    assert research_key("Sofá Retrátil  Cinza", "mercado_livre") == research_key("cinza sofa RETRATIL", "mercado_livre")
+    assert research_key("sofa", "mercado_livre") != research_key("sofa", "magalu")
+    assert research_key("sofa", "mercado_livre", "MLB1234") != research_key("sofa", "mercado_livre")
+
+
+def test_narrow_matches_a_shorter_collection():
+    full = _research(50)
+    narrowed = narrow(full, 30)
+    expected = _research(30)
+    assert [item.listing_id for item in narrowed.listings] == [item.listing_id for item in expected.listings]
+    assert narrowed.price_range == expected.price_range
+    assert narrowed.top_seo_terms == expected.top_seo_terms
+    assert narrowed.competitor_summary == expected.competitor_summary
+    assert narrow(full, 50) is full
+
+
+def test_larger_cached_limit_serves_smaller_request(monkeypatch):
+    cache, clock = _cache(monkeypatch, fresh_seconds=600, stale_seconds=3600)
+    fetched = []
+
+    async def fetch(limit):
+        fetched.append(limit)
+        return _research(limit)
+
+    async def _run():
+        first = await cache.get_or_fetch("Sofá Retrátil", "mercado_livre", 50, fetch)
+        clock.now += 120
+        second = await cache.get_or_fetch("retratil sofa", "mercado_livre", 30, fetch)
+        third = await cache.get_or_fetch("sofa retratil", "mercado_livre", 80, fetch)
+        return first, second, third
+
+    first, second, third = asyncio.run(_run())
+    assert fetched == [50, 80]
+    assert not first.served_from_cache and first.keyword == "Sofá Retrátil"
+    assert second.served_from_cache and second.data_age_seconds == 120.0
+    assert second.keyword == "retratil sofa"
+    assert second.total_collected == 29
+    assert not third.served_from_cache
+    assert cache.metrics()["hits"] == 1 and cache.metrics()["misses"] == 2
+
+
+def test_stale_entry_is_served_while_refreshing(monkeypatch):
+    cache, clock = _cache(monkeypatch, fresh_seconds=60, stale_seconds=600)
+    fetched = []
+
+    async def fetch(limit):
+        fetched.append(limit)
+        await asyncio.sleep(0.01)
+        return _research(limit)
+
+    async def _run():
+        await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)
+        clock.now += 300
+        stale = await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)
+        again = await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)   # refresh já em voo
+        await cache.wait_refreshes()
+        fresh = await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)
+        return stale, again, fresh
+
+    stale, again, fresh = asyncio.run(_run())
+    assert stale.served_from_cache and stale.data_age_seconds == 300.0
+    assert again.data_age_seconds == 300.0
+    assert fresh.served_from_cache and fresh.data_age_seconds == 0.0
+    assert fetched == [30, 30]
+    assert cache.metrics()["stale_hits"] == 2 and cache.metrics()["refreshes"] == 1
+
+
+def test_close_cancels_refreshes_still_running(monkeypatch):
+    cache, clock = _cache(monkeypatch, fresh_seconds=60, stale_seconds=600)
+    calls = []
+
+    async def fetch(limit):
+        calls.append(limit)
+        if len(calls) > 1:
+            await asyncio.sleep(60)   # refresh preso num marketplace lento
+        return _research(limit)
+
+    async def _run():
+        await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)
+        clock.now += 300
+        await cache.get_or_fetch("sofa", "mercado_livre", 30, fetch)
+        await asyncio.sleep(0)
+        refreshing = cache.metrics()["refreshing"]
+        await cache.close(timeout=0.01)
+        return refreshing
+
+    assert asyncio.run(_run()) == 1
+    assert cache.metrics()["refreshing"] == 0
+    assert cache.metrics()["refreshes"] == 0
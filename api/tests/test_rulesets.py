@@ -0,0 +1,135 @@
+import asyncio
+
+from api.src.db.mercado_livre import MercadoLivreRules
+from api.src.scoring.seo import SEOScorer
+from api.src.services import rulesets as rulesets_module
+from api.src.services.rulesets import RulesetService, compile_rulesets
+from api.src.types.listing import ListingNormalized, Marketplace, Seller
+
+
+def _listing(title: str, category_id=None) -> ListingNormalized:
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id="MLB1",
+        url="https://example.com/1",
+        title=title,
+        price=100.0,
+        shipping_cost=0.0,
+        final_price_estimate=100.0,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        category_id=category_id,
+    )
+
+
+class _FakeTable:
+    def __init__(self, rows):
+        self.rows = rows
+        self.version = "1:a"
+        self.row_loads = 0
+
+    def load_rows(self):
+        self.row_loads += 1
+        return list(self.rows)
+
+    def load_version(self):
+        return self.version
+
+
+def test_category_rows_layer_over_platform_and_builtin():
+    compiled = compile_rulesets([
+        {"platform": "meli", "category_id": None, "rules": {"title_max": 70}, "version": 1},
+        {"platform": "meli", "category_id": "MLB1644", "rules": {"forbidden_terms": ["top"]}, "version": 1},
+        {"platform": "meli", "category_id": "MLB1644", "rules": {"forbidden_terms": ["top", "oferta"]}, "version": 2},
+        {"platform": "desconhecida", "category_id": None, "rules": {}, "version": 1},
+    ])
+    platform = compiled[(Marketplace.MERCADO_LIVRE, None)]
+    category = compiled[(Marketplace.MERCADO_LIVRE, "MLB1644")]
+
+    assert platform.title_max == 70
+    assert platform.title_min == 40            # padrão embutido
+    assert category.title_max == 70            # herdado da plataforma
+    assert category.forbidden_terms == ("top", "oferta")
+    assert category.version == 2
+    assert compiled[(Marketplace.MAGALU, None)].title_max == 100
+
+
+def test_refresh_reloads_only_when_version_changes():
+    table = _FakeTable([{"platform": "meli", "category_id": None, "rules": {"title_max": 70}, "version": 1}])
+    service = RulesetService(load_rows=table.load_rows, load_version=table.load_version)
+
+    assert service.get(Marketplace.MERCADO_LIVRE).title_max == 60   # antes do primeiro load
+    assert service.refresh() is True
+    assert service.refresh() is False
+    assert table.row_loads == 1
+    assert service.get("mercado_livre", "qualquer").title_max == 70
+
+    table.rows = [{"platform": "meli", "category_id": None, "rules": {"title_max": 80}, "version": 2}]
+    table.version = "1:b"
+    assert service.refresh() is True
+    assert service.get(Marketplace.MERCADO_LIVRE).title_max == 80
+
+
+def test_failed_row_load_keeps_current_rules_and_version():
+    table = _FakeTable([{"platform": "meli", "category_id": None, "rules": {"title_max": 70}, "version": 1}])
+    rows_down = False
+    service = RulesetService(
+        load_rows=lambda: None if rows_down else table.load_rows(),
+        load_version=table.load_version,
+    )
+    assert service.refresh() is True
+
+    table.rows = [{"platform": "meli", "category_id": None, "rules": {"title_max": 80}, "version": 2}]
+    table.version = "2:b"
+    rows_down = True   # token mudou, consulta das linhas falhou
+    assert service.refresh() is False
+    assert service.version == "1:a"
+    assert service.get(Marketplace.MERCADO_LIVRE).title_max == 70
+
+    rows_down = False
+    assert service.refresh() is True
+    assert service.version == "2:b"
+    assert service.get(Marketplace.MERCADO_LIVRE).title_max == 80
+
+
+def test_db_unavailable_keeps_current_rules():
+    service = RulesetService(load_rows=lambda: [], load_version=lambda: None)
+    assert service.refresh() is False
+    assert service.get(Marketplace.MAGALU).title_max == 100
+
+
+def test_scorer_and_validator_use_category_rules(monkeypatch):
+    table = _FakeTable([
+        {"platform": "meli", "category_id": "MLB1", "rules": {
+            "forbidden_terms": ["premium"],
+            "prohibited_title_terms": ["premium"],
+            "mandatory_attributes": ["BRAND"],
+        }, "version": 1},
+    ])
+    service = RulesetService(load_rows=table.load_rows, load_version=table.load_version)
+    service.refresh()
+    monkeypatch.setattr(rulesets_module, "_service", service)
+
+    scorer = SEOScorer()
+    assert scorer.score(_listing("Sofa Premium Cinza", "MLB1")).breakdown["compliance"] == 80.0
+    assert scorer.score(_listing("Sofa Premium Cinza")).breakdown["compliance"] == 100.0
+
+    rules = MercadoLivreRules()
+    assert rules.get_mandatory_attributes("MLB1") == ["BRAND"]
+    assert rules.validate_title("Sofa Premium", "MLB1")["valid"] is False
+    assert rules.validate_title("Sofa Retratil Oferta Limitada")["valid"] is False
+
+
+def test_reloader_stops_on_event():
+    table = _FakeTable([])
+    service = RulesetService(load_rows=table.load_rows, load_version=table.load_version)
+
+    async def _run():
+        stop = asyncio.Event()
+        task = asyncio.create_task(service.run_reloader(stop, interval=0.01))
+        await asyncio.sleep(0.05)
+        stop.set()
+        await asyncio.wait_for(task, timeout=2)
+
+    asyncio.run(_run())
+    assert service.checks >= 1
+    assert service.version == "1:a"
@@ -0,0 +1,103 @@
+import random
+import time
+
+from api.src.scoring.context import MarketContext
+from api.src.scoring.conversion import CompetitivenessScorer, ConversionScorer
+from api.src.scoring.seo import SEOScorer
+from api.src.types.batch import ListingBatch
+from api.src.types.listing import (
+    Badges,
+    ListingAttributes,
+    ListingNormalized,
+    Marketplace,
+    Seller,
+    SellerReputation,
+    SocialProof,
+    TextBlocks,
+)
+
+_WORDS = ["Sofa", "SOFA", "Retratil", "RECLINAVEL", "Cinza", "Suede", "3", "Lugares",
+          "oferta", "Barato!", "Linho", "Veludo", "Bege", "Madeira"]
+
+
+def _mk(i: int, rng: random.Random) -> ListingNormalized:
+    price = rng.choice([0.0, round(rng.uniform(300, 3000), 2)])
+    words = rng.sample(_WORDS, rng.randint(1, 10))
+    if rng.random() < 0.1:
+        words.insert(0, "O")
+    return ListingNormalized(
+        marketplace=rng.choice([Marketplace.MERCADO_LIVRE, Marketplace.MAGALU]),
+        listing_id=f"MLB{i}",
+        url=f"https://example.com/{i}",
+        title=" ".join(words),
+        price=price,
+        shipping_cost=0.0,
+        final_price_estimate=rng.choice([0.0, price]),
+        seller=Seller(seller_id=f"S{i}", nome="Loja", reputacao=rng.choice(list(SellerReputation))),
+        badges=Badges(
+            frete_gratis=rng.random() < 0.4,
+            full=rng.random() < 0.2,
+            parcelamento_sem_juros=rng.random() < 0.5,
+        ),
+        social_proof=SocialProof(
+            reviews_count=rng.choice([0, 3, 5, 20, 49, 50, 100, rng.randint(0, 900)]),
+            rating=rng.choice([0.0, 3.8, 4.3, 4.7, round(rng.uniform(1, 5), 1)]),
+            vendas_estimadas=rng.choice([None, 0, rng.randint(0, 900)]),
+        ),
+        media_count=rng.randint(0, 12),
+        attributes=ListingAttributes(
+            cor=rng.choice([None, "cinza"]),
+            material=rng.choice([None, "suede"]),
+            altura_cm=rng.choice([None, 90.0]),
+        ),
+        text_blocks=TextBlocks(
+            bullets=["x"] * rng.randint(0, 8),
+            descricao=rng.choice([None, "d" * 100, "d" * 400]),
+        ),
+        seo_terms=rng.sample(["sofa", "retratil", "cinza", "suede", "lugares", "linho"], 3),
+    )
+
+
+def _assert_same(batch_scores, scalar_results):
+    assert len(batch_scores) == len(scalar_results)
+    for i, expected in enumerate(scalar_results):
+        got = batch_scores.breakdown(i)
+        assert got.score == expected.score
+        assert got.label == expected.label
+        assert got.details == expected.details
+
+
+def test_score_many_matches_scalar_path():
+    rng = random.Random(21)
+    competitors = [_mk(i, rng) for i in range(20)]
+    listings = [_mk(100 + i, rng) for i in range(500)]
+
+    for context in (MarketContext.from_listings(competitors), MarketContext()):
+        conv, comp, seo = ConversionScorer(), CompetitivenessScorer(), SEOScorer()
+        _assert_same(conv.score_many(listings, context=context),
+                     [conv.score(l, context=context) for l in listings])
+        _assert_same(comp.score_many(listings, context=context),
+                     [comp.score(l, context=context) for l in listings])
+        _assert_same(seo.score_many(listings, context=context),
+                     [seo.score(l, context=context).to_schema() for l in listings])
+
+
+def test_score_many_on_100k_listings_is_fast():
+    rng = random.Random(3)
+    base = [_mk(i, rng) for i in range(1000)]
+    batch = ListingBatch(base * 100)
+    context = MarketContext.from_listings(base[:20])
+
+    started = time.perf_counter()
+    conv = ConversionScorer().score_many(batch, context=context)
+    comp = CompetitivenessScorer().score_many(batch, context=context)
+    elapsed = time.perf_counter() - started
+
+    assert len(conv) == len(comp) == 100_000
+    assert elapsed < 1.0
+
+    # SEO depende de uma passada de texto por título; o resto é vetorizado
+    started = time.perf_counter()
+    seo = SEOScorer().score_many(batch, context=context)
+    assert len(seo) == 100_000
+    assert time.perf_counter() - started < 3.0
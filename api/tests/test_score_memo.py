@@ -0,0 +1,123 @@
+import asyncio
+from datetime import datetime
+
+from api.src.orchestrator import agent as agent_module
+from api.src.orchestrator.agent import MarketAgent
+from api.src.scoring.context import MarketContext
+from api.src.scoring.memo import ScoreMemo, context_fingerprint, listing_fingerprint, score_key
+from api.src.scoring.seo import SEOScorer
+from api.src.types.listing import (
+    ListingAttributes,
+    ListingNormalized,
+    Marketplace,
+    MarketResearchResult,
+    Seller,
+    TextBlocks,
+)
+
+
+def _listing(listing_id: str = "MLB1", title: str = "Sofa Retratil Reclinavel 3 Lugares Suede Cinza", price: float = 1999.9):
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=listing_id,
+        url=f"https://example.com/{listing_id}",
+        title=title,
+        price=price,
+        final_price_estimate=price,
+        seller=Seller(seller_id="S1", nome="Loja"),
+        attributes=ListingAttributes(cor="cinza", material="suede"),
+        text_blocks=TextBlocks(bullets=["a", "b"], descricao="d" * 400),
+        media_count=6,
+    )
+
+
+def test_listing_fingerprint_ignores_identity_and_tracks_content():
+    base = _listing()
+    same_content = _listing(listing_id="MLB2").model_copy(update={"scraped_at": datetime(2020, 1, 1)})
+    assert listing_fingerprint(base) == listing_fingerprint(same_content)
+    assert listing_fingerprint(base) != listing_fingerprint(_listing(price=1899.9))
+    assert listing_fingerprint(base) != listing_fingerprint(_listing(title="Sofa Retratil Cinza"))
+
+
+def test_context_fingerprint_changes_with_market():
+    competitors = [_listing(f"C{i}", price=1000.0 + i) for i in range(5)]
+    a = MarketContext.from_listings(competitors)
+    b = MarketContext.from_listings(competitors[:4])
+    assert context_fingerprint(a) == context_fingerprint(MarketContext.from_listings(competitors))
+    assert context_fingerprint(a) != context_fingerprint(b)
+    fp = listing_fingerprint(_listing())
+    assert score_key(fp, a, "r") != score_key(fp, b, "r")
+
+
+def test_score_memo_get_or_compute_and_capacity():
+    memo = ScoreMemo(capacity=2, ttl_seconds=60)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return {"score": 10}
+
+    assert memo.get_or_compute("seo", "k1", compute) == ({"score": 10}, False)
+    assert memo.get_or_compute("seo", "k1", compute) == ({"score": 10}, True)
+    assert len(calls) == 1
+    memo.put("seo", "k2", 1)
+    memo.put("seo", "k3", 2)
+    assert memo.get("seo", "k1") is None   # expulso pelo LRU
+    assert memo.metrics()["entries"] == 2
+
+
+class _CountingSEOScorer(SEOScorer):
+    def __init__(self):
+        super().__init__()
+        self.calls = 0
+
+    def score(self, *args, **kwargs):
+        self.calls += 1
+        return super().score(*args, **kwargs)
+
+
+def test_audit_listing_reuses_memo_for_unchanged_listing(monkeypatch):
+    competitors = [_listing(f"C{i}", price=1500.0 + i * 10) for i in range(10)]
+    research = MarketResearchResult(
+        keyword="sofa retratil",
+        marketplace=Marketplace.MERCADO_LIVRE,
+        total_collected=len(competitors),
+        listings=competitors,
+        price_range={},
+        top_seo_terms=[{"term": "sofa", "freq": 10}],
+        competitor_summary={},
+        gaps=[],
+    )
+    title_calls = []
+
+    async def fake_research(self, keyword, marketplace="mercado_livre", limit=50, **kwargs):
+        return research
+
+    async def fake_titles(**kwargs):
+        title_calls.append(kwargs)
+        return ["Sofa Retratil"]
+
+    monkeypatch.setattr(MarketAgent, "research_market", fake_research)
+    monkeypatch.setattr(agent_module, "generate_titles", fake_titles)
+    monkeypatch.setattr(type(agent_module.settings), "check_ai_configured", lambda self: False)
+
+    agent = MarketAgent(connectors={"mercado_livre": object()})
+    agent.score_memo = ScoreMemo(capacity=100, ttl_seconds=60)
+    agent.seo_scorer = _CountingSEOScorer()
+
+    async def run(listing):
+        return await agent.audit_listing("MLB1", keyword="sofa retratil", my_listing=listing)
+
+    first = asyncio.run(run(_listing()))
+    again = asyncio.run(run(_listing()))
+    changed = asyncio.run(run(_listing(price=999.0)))
+
+    assert first.metadata["score_cache"] == "miss"
+    assert again.metadata["score_cache"] == "hit"
+    assert again.metadata["fingerprint"] == first.metadata["fingerprint"]
+    assert again.overall_score == first.overall_score
+    assert changed.metadata["score_cache"] == "miss"
+    assert changed.metadata["fingerprint"] != first.metadata["fingerprint"]
+    assert agent.seo_scorer.calls == 2
+    # só os scores vêm do memo: o texto é gerado de novo a cada auditoria
+    assert len(title_calls) == 3
@@ -0,0 +1,46 @@
+import asyncio
+
+import pytest
+
+from api.src.connectors.singleflight import SingleFlight
+
+
+def test_identical_calls_share_one_upstream_call():
+    flight = SingleFlight()
+    upstream = 0
+
+    async def _fetch():
+        nonlocal upstream
+        upstream += 1
+        await asyncio.sleep(0.01)
+        return {"id": "MLB1", "tags": []}
+
+    async def _run():
+        key = SingleFlight.make_key("GET", "https://api/items/MLB1")
+        return await asyncio.gather(*(flight.do(key, _fetch) for _ in range(5)))
+
+    results = asyncio.run(_run())
+    assert upstream == 1
+    assert flight.metrics()["coalesced_calls"] == 4
+    results[0]["tags"].append("mutated")
+    assert results[1]["tags"] == []  # cada chamador recebe sua cópia
+
+
+def test_cancelled_caller_does_not_cancel_others():
+    flight = SingleFlight()
+
+    async def _fetch():
+        await asyncio.sleep(0.02)
+        return "ok"
+
+    async def _run():
+        key = SingleFlight.make_key("GET", "https://api/users/1")
+        first = asyncio.ensure_future(flight.do(key, _fetch))
+        second = asyncio.ensure_future(flight.do(key, _fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(_run()) == "ok"
@@ -0,0 +1,78 @@
+import asyncio
+import random
+
+from api.src.pipeline.pipeline import DataPipeline
+from api.src.pipeline.streaming import MarketAccumulator, StreamingMedian
+from api.src.types.listing import Badges, ListingNormalized, Marketplace, Seller, SocialProof
+
+
+def _mk(i: int, rng: random.Random) -> ListingNormalized:
+    return ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id=f"MLB{i % 45}",  # ids repetidos para exercitar o dedup
+        url=f"https://example.com/{i}",
+        title=f"Sofa Retratil {i % 45} Lugares {rng.choice(['Cinza', 'Azul', 'Bege'])}",
+        price=rng.choice([0.0, round(rng.uniform(300, 3000), 2)]),
+        shipping_cost=0.0,
+        final_price_estimate=0.0,
+        seller=Seller(seller_id="S1", nome="Loja A"),
+        badges=Badges(frete_gratis=rng.random() < 0.4, full=rng.random() < 0.2),
+        social_proof=SocialProof(avaliacoes_total=rng.randint(0, 500), nota_media=round(rng.uniform(3, 5), 1)),
+        media_count=rng.randint(1, 10),
+    )
+
+
+async def _aiter(items):
+    for item in items:
+        await asyncio.sleep(0)
+        yield item
+
+
+def test_streaming_median_matches_sorted_median():
+    rng = random.Random(7)
+    median = StreamingMedian()
+    values = []
+    for _ in range(101):
+        value = rng.uniform(0, 100)
+        values.append(value)
+        median.add(value)
+        s = sorted(values)
+        n = len(s)
+        expected = s[n // 2] if n % 2 else (s[n // 2 - 1] + s[n // 2]) / 2
+        assert abs(median.median() - expected) < 1e-9
+
+
+def test_run_stream_matches_batch_run():
+    rng = random.Random(42)
+    listings = [_mk(i, rng) for i in range(60)]
+    pipeline = DataPipeline()
+
+    batch = asyncio.run(
+        pipeline.run([l.model_copy(deep=True) for l in listings], "sofa", Marketplace.MERCADO_LIVRE)
+    )
+    streamed = asyncio.run(
+        pipeline.run_stream(_aiter([l.model_copy(deep=True) for l in listings]), "sofa", Marketplace.MERCADO_LIVRE)
+    )
+
+    assert streamed.total_collected == batch.total_collected == 45
+    assert [l.listing_id for l in streamed.listings] == [l.listing_id for l in batch.listings]
+    assert streamed.price_range == batch.price_range
+    assert streamed.top_seo_terms == batch.top_seo_terms
+    assert streamed.competitor_summary == batch.competitor_summary
+    assert streamed.gaps == batch.gaps
+
+
+def test_partial_aggregates_are_readable_mid_stream():
+    rng = random.Random(1)
+    listings = [_mk(i, rng) for i in range(10)]
+    acc = MarketAccumulator()
+    seen_totals = []
+
+    async def _observed():
+        for item in listings:
+            yield item
+            seen_totals.append(acc.snapshot()["total_collected"])
+
+    asyncio.run(DataPipeline().run_stream(_observed(), "sofa", Marketplace.MERCADO_LIVRE, accumulator=acc))
+    assert seen_totals == list(range(1, 11))
+    assert acc.snapshot()["competitor_summary"]["total_analyzed"] == 10
@@ -0,0 +1,65 @@
+import random
+
+from api.src.connectors.base import BASE_FORBIDDEN_TERMS
+from api.src.db.mercado_livre import MercadoLivreRules
+from api.src.scoring.context import MarketContext
+from api.src.scoring.seo import SEOScorer
+from api.src.types.listing import ListingNormalized, Marketplace, Seller
+from api.src.utils.term_matcher import TermMatcher, get_matcher
+
+
+def test_folds_accents_and_respects_word_boundaries():
+    matcher = TermMatcher(["frete grátis", "oferta", "!", "100%", "sofa", "sofa retratil"])
+
+    assert matcher.found("Sofá Retrátil FRETE GRATIS!") == ["frete grátis", "!", "sofa", "sofa retratil"]
+    assert matcher.found("Ofertas de sofás") == []
+    assert matcher.found("100% algodão") == ["100%"]
+    assert matcher.found("x100%") == []
+    assert matcher.count("") == 0
+
+
+def test_overlapping_patterns_all_reported():
+    matcher = TermMatcher(["he", "she", "his", "hers", "sofa", "sofa retratil", "retratil"])
+    assert matcher.found("she hers his") == ["she", "his", "hers"]
+    assert matcher.found("ushers") == []
+    assert matcher.found("sofa retratil") == ["sofa", "sofa retratil", "retratil"]
+
+
+def test_compiled_once_per_term_list():
+    assert get_matcher(BASE_FORBIDDEN_TERMS) is get_matcher(BASE_FORBIDDEN_TERMS)
+
+
+def test_ml_rules_flag_promotional_terms_without_accents():
+    result = MercadoLivreRules().validate_title("Sofa Retratil Promocao Frete Gratis")
+    assert result["valid"] is False
+    assert len(result["issues"]) == 2
+
+
+def test_seo_compliance_and_keywords_share_one_pass():
+    listing = ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id="MLB1",
+        url="https://example.com/1",
+        title="Sofá Retrátil Cinza Promoção",
+        price=1000.0,
+        shipping_cost=0.0,
+        final_price_estimate=1000.0,
+        seller=Seller(seller_id="S1", nome="Loja"),
+    )
+    context = MarketContext(total=1, top_terms=("sofa", "retratil", "suede"))
+    result = SEOScorer().score(listing, context=context)
+
+    assert result.breakdown["keywords"] == round(2 / 3 * 100, 1)
+    assert result.breakdown["compliance"] == 80.0
+
+
+def test_count_agrees_with_found_over_many_titles():
+    # o tempo fica em api/scripts/bench_term_matcher.py, fora da suíte
+    rng = random.Random(2)
+    words = ["sofa", "retratil", "reclinavel", "cinza", "oferta", "suede", "promoção", "linho", "3", "lugares"]
+    titles = [" ".join(rng.sample(words, 6)) for _ in range(2_000)]
+    matcher = get_matcher(("sofa retratil", "cinza", "oferta", "promoção", "frete grátis", "brinde"))
+
+    counts = [matcher.count(t) for t in titles]
+    assert sum(counts) > 0
+    assert counts == [len(matcher.found(t)) for t in titles]
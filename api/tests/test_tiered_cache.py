@@ -0,0 +1,187 @@
+import asyncio
+import fnmatch
+
+from api.src.caching import ByteLRU, LRUCache, RedisTier, TieredCache, async_cached, codec
+
+
+class FakeRedis:
+    """Subconjunto de redis.asyncio usado pelo RedisTier (sem expiração)."""
+
+    def __init__(self):
+        self.data: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def mget(self, keys):
+        return [self.data.get(k) for k in keys]
+
+    def pipeline(self, transaction=True):
+        redis = self
+
+        class _Pipe:
+            def __init__(self):
+                self.ops = []
+
+            def set(self, key, value, ex=None):
+                self.ops.append((key, value, ex))
+
+            async def execute(self):
+                for key, value, ex in self.ops:
+                    redis.data[key] = value
+                    redis.ttls[key] = ex
+
+        return _Pipe()
+
+    async def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    async def scan_iter(self, match="*", count=None):
+        for key in list(self.data):
+            if fnmatch.fnmatch(key, match):
+                yield key
+
+    async def aclose(self):
+        pass
+
+
+def test_byte_lru_evicts_by_bytes_in_lru_order():
+    lru = ByteLRU(max_bytes=3 * (100 + 1 + 96))
+    for key in "abc":
+        lru.set(key, b"x" * 100, expires_at=float("inf"))
+    assert lru.get("a") is not None  # "b" passa a ser o menos recente
+    lru.set("d", b"x" * 100, expires_at=float("inf"))
+    assert lru.get("b") is None
+    assert lru.get("a") is not None and lru.get("d") is not None
+    assert lru.stats()["evictions"] == 1
+
+
+def test_redis_tier_is_shared_between_processes():
+    redis = FakeRedis()
+
+    def _worker() -> TieredCache:
+        return TieredCache(redis=RedisTier(client=redis), compress_min_bytes=64)
+
+    async def _run():
+        first, second = _worker(), _worker()
+        payload = {"id": "123", "nickname": "LOJA" * 50}
+        await first.namespace("sellers", ttl_seconds=600).set_many({"123": payload})
+        assert list(redis.ttls.values()) == [600]
+        found = await second.namespace("sellers").get_many(["123", "999"])
+        assert found == {"123": payload}
+        assert second.stats()["namespaces"]["sellers"] == {
+            "ttl_seconds": 300, "hits_memory": 0, "hits_redis": 1, "misses": 1, "sets": 0, "unserializable": 0,
+        }
+        # repovoou a memória local: segunda leitura não vai ao Redis
+        redis.data.clear()
+        assert await second.get("sellers", "123") == payload
+
+    asyncio.run(_run())
+
+
+def test_redis_failure_degrades_to_memory():
+    class BrokenRedis(FakeRedis):
+        async def mget(self, keys):
+            raise ConnectionError("down")
+
+    async def _run():
+        cache = TieredCache(redis=RedisTier(client=BrokenRedis(), retry_seconds=60))
+        await cache.set("ns", "k", [1, 2, 3])
+        cache.clear_local()
+        assert await cache.get("ns", "k") is None
+        assert cache.redis.stats()["available"] is False
+        assert cache.redis.stats()["errors"] == 1
+
+    asyncio.run(_run())
+
+
+def test_async_cached_decorator_keeps_legacy_api():
+    calls = []
+    cache = TieredCache()
+
+    @async_cached(ttl_seconds=60, cache=cache)
+    async def lookup(query: str, request_id: str = ""):
+        calls.append(query)
+        return {"query": query}
+
+    async def _run():
+        assert await lookup("sofa", request_id="a") == {"query": "sofa"}
+        assert await lookup("sofa", request_id="b") == {"query": "sofa"}
+        lookup.cache_clear()
+        await lookup("sofa")
+
+    asyncio.run(_run())
+    assert calls == ["sofa", "sofa"]
+
+
+def test_legacy_lru_cache():
+    cache = LRUCache(capacity=2, ttl_seconds=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c"), len(cache)) == (1, 3, 2)
+
+
+def test_codec_round_trips_models_as_json():
+    from api.src.types.listing import ListingNormalized, Marketplace, MarketResearchResult, Seller
+
+    listing = ListingNormalized(
+        marketplace=Marketplace.MERCADO_LIVRE,
+        listing_id="MLB1",
+        url="https://example.com/1",
+        title="Sofa",
+        price=10.0,
+        final_price_estimate=10.0,
+        seller=Seller(seller_id="S1"),
+    )
+    result = MarketResearchResult(
+        keyword="sofa",
+        marketplace=Marketplace.MERCADO_LIVRE,
+        total_collected=1,
+        listings=[listing],
+        price_range={"min": 10.0},
+        top_seo_terms=[],
+        competitor_summary={},
+        gaps=[],
+    )
+    value = {"limit": 30, "stored_at": 1.5, "result": result}
+    blob = codec.encode(value, expires_at=99.0, compress_min_bytes=64)
+    decoded, expires_at = codec.decode(blob)
+    assert expires_at == 99.0
+    assert decoded["result"] == result
+    assert isinstance(decoded["result"].listings[0], ListingNormalized)
+
+
+def test_codec_never_unpickles_and_rejects_foreign_models():
+    import pickle
+    import struct
+
+    import pytest
+
+    header = struct.Struct(">dB").pack(99.0, 0)
+    with pytest.raises(ValueError):
+        codec.decode(header + pickle.dumps({"a": 1}))
+    foreign = b'{"__model__":"pydantic.main:BaseModel","data":{}}'
+    with pytest.raises(ValueError):
+        codec.decode(header + foreign)
+    with pytest.raises(TypeError):
+        codec.encode(object(), expires_at=99.0)
+
+
+def test_async_cached_method_key_ignores_instance():
+    cache = TieredCache()
+    calls = []
+
+    class Client:
+        @async_cached(ttl_seconds=60, cache=cache)
+        async def lookup(self, query: str):
+            calls.append(query)
+            return {"query": query}
+
+    async def _run():
+        await Client().lookup("sofa")
+        await Client().lookup("sofa")   # outra instância (outro worker): mesma chave
+
+    asyncio.run(_run())
+    assert calls == ["sofa"]